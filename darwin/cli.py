@@ -100,7 +100,13 @@ def _run(args: Namespace, parser: ArgumentParser) -> None:
         print(__version__)
 
     elif args.command == "convert":
-        f.convert(args.format, args.files, args.output_dir, legacy=args.legacy)
+        f.convert(
+            args.format,
+            args.files,
+            args.output_dir,
+            legacy=args.legacy,
+            workers=args.workers,
+        )
     elif args.command == "dataset":
         if args.action == "remote":
             f.list_remote_datasets(args.all, args.team)
@@ -126,6 +132,8 @@ def _run(args: Namespace, parser: ArgumentParser) -> None:
                 args.extract_views,
                 args.preserve_folders,
                 args.verbose,
+                args.resume,
+                args.pipelined,
             )
         # Remove a project (remotely)
         elif args.action == "remove":
@@ -159,6 +167,9 @@ def _run(args: Namespace, parser: ArgumentParser) -> None:
                 args.retry,
                 args.retry_timeout,
                 args.retry_interval,
+                args.engine,
+                args.incremental,
+                args.max_connections_per_host,
             )
         elif args.action == "import":
             f.dataset_import(
@@ -173,17 +184,40 @@ def _run(args: Namespace, parser: ArgumentParser) -> None:
                 args.overwrite,
                 legacy=args.legacy,
                 cpu_limit=args.cpu_limit,
+                batch_size=args.batch_size,
+                use_remote_index=args.remote_index,
             )
         elif args.action == "convert":
             f.dataset_convert(
-                args.dataset, args.format, args.output_dir, legacy=args.legacy
+                args.dataset,
+                args.format,
+                args.output_dir,
+                legacy=args.legacy,
+                workers=args.workers,
             )
         elif args.action == "set-file-status":
             f.set_file_status(args.dataset, args.status, args.files)
         elif args.action == "delete-files":
             f.delete_files(args.dataset, args.files, args.yes)
         elif args.action == "split":
-            f.split(args.dataset, args.val_percentage, args.test_percentage, args.seed)
+            f.split(
+                args.dataset,
+                args.val_percentage,
+                args.test_percentage,
+                args.seed,
+                strategy=args.strategy,
+            )
+        elif args.action == "pack":
+            f.pack(
+                args.dataset,
+                partition=args.partition,
+                split=args.split,
+                split_type=args.split_type,
+                annotation_type=args.annotation_type,
+                shard_size=args.shard_size,
+                output_dir=args.output_dir,
+                seed=args.seed,
+            )
         elif args.action == "help" or args.action is None:
             f.help(parser, "dataset")
         elif args.action == "comment":
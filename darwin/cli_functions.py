@@ -32,6 +32,7 @@ from darwin.config import Config
 from darwin.dataset import RemoteDataset
 from darwin.dataset.identifier import DatasetIdentifier
 from darwin.dataset.release import Release
+from darwin.dataset.shards import pack_dataset
 from darwin.dataset.split_manager import split_dataset
 from darwin.dataset.upload_manager import LocalFile
 from darwin.dataset.utils import get_release_path
@@ -415,6 +416,9 @@ def pull_dataset(
     retry: bool = False,
     retry_timeout: int = 600,
     retry_interval: int = 10,
+    engine: str = "multiprocessing",
+    incremental: bool = False,
+    max_connections_per_host: Optional[int] = None,
 ) -> None:
     """
     Downloads a remote dataset (images and annotations) in the datasets directory.
@@ -441,6 +445,12 @@ def pull_dataset(
         If retrying, total time to wait for the release to be ready for download
     retry_interval: int
         If retrying, time to wait between retries of checking if the release is ready for download.
+    engine: str
+        Download engine, either "multiprocessing" or "threads". Defaults to "multiprocessing".
+    incremental: bool
+        Only parses and downloads items that changed since the previous pull. Defaults to False.
+    max_connections_per_host: Optional[int]
+        Maximum number of connections the "threads" engine opens to the same host. Defaults to None.
     """
     version: str = DatasetIdentifier.parse(dataset_slug).version or "latest"
     client: Client = _load_client(offline=False, maybe_guest=True)
@@ -469,6 +479,9 @@ def pull_dataset(
             retry=retry,
             retry_timeout=retry_timeout,
             retry_interval=retry_interval,
+            engine=engine,
+            incremental=incremental,
+            max_connections_per_host=max_connections_per_host,
         )
         print_new_version_info(client)
     except NotFound:
@@ -488,7 +501,11 @@ def pull_dataset(
 
 
 def split(
-    dataset_slug: str, val_percentage: float, test_percentage: float, seed: int = 0
+    dataset_slug: str,
+    val_percentage: float,
+    test_percentage: float,
+    seed: int = 0,
+    strategy: str = "sklearn",
 ) -> None:
     """
     Splits a local version of a dataset into train, validation, and test partitions.
@@ -503,6 +520,9 @@ def split(
         Percentage in the test set.
     seed: int
         Random seed. Defaults to 0.
+    strategy: str
+        Algorithm of the stratified split, either ``"sklearn"`` or ``"iterative"``. Defaults to
+        ``"sklearn"``.
     """
     identifier: DatasetIdentifier = DatasetIdentifier.parse(dataset_slug)
     client: Client = _load_client(offline=True)
@@ -516,6 +536,7 @@ def split(
                     val_percentage=val_percentage,
                     test_percentage=test_percentage,
                     split_seed=seed,
+                    strategy=strategy,
                 )
                 print(f"Partition lists saved at {split_path}")
                 return
@@ -533,6 +554,71 @@ def split(
     )
 
 
+def pack(
+    dataset_slug: str,
+    partition: Optional[str] = None,
+    split: str = "default",
+    split_type: str = "random",
+    annotation_type: str = "polygon",
+    shard_size: int = 256,
+    output_dir: Optional[str] = None,
+    seed: int = 0,
+) -> None:
+    """
+    Packs the images and annotations of a local version of a dataset into tar shards, to be read
+    sequentially during training.
+
+    Parameters
+    ----------
+    dataset_slug: str
+        Slug of the dataset to which we perform the operation on.
+    partition: Optional[str]
+        Partition to pack, one of ``"train"``, ``"val"`` or ``"test"``. Packs every annotated image
+        if ``None``. Defaults to ``None``.
+    split: str
+        Split defining the partitions. Defaults to ``"default"``.
+    split_type: str
+        Type of the split, either ``"random"`` or ``"stratified"``. Defaults to ``"random"``.
+    annotation_type: str
+        Annotation type a stratified split was made on. Defaults to ``"polygon"``.
+    shard_size: int
+        Size of each shard, in megabytes. Defaults to 256.
+    output_dir: Optional[str]
+        Where to write the shards. Defaults to the ``shards`` directory of the release.
+    seed: int
+        Seed of the shuffle of the samples between shards. Defaults to 0.
+    """
+    identifier: DatasetIdentifier = DatasetIdentifier.parse(dataset_slug)
+    client: Client = _load_client(offline=True)
+
+    for p in client.list_local_datasets(team_slug=identifier.team_slug):
+        if identifier.dataset_slug == p.name:
+            try:
+                shards = pack_dataset(
+                    dataset_path=p,
+                    release_name=identifier.version,
+                    output_dir=output_dir,
+                    partition=partition,
+                    split=split,
+                    split_type=split_type,
+                    annotation_type=annotation_type,
+                    shard_size=shard_size * 1024 * 1024,
+                    seed=seed,
+                )
+                print(f"{len(shards)} shards saved at {shards[0].parent}")
+                return
+            except NotFound as e:
+                _error(e.name)
+            except (FileNotFoundError, ValueError) as e:
+                _error(str(e))
+
+    _error(
+        f"Dataset '{identifier.dataset_slug}' does not exist locally. "
+        f"Use 'darwin dataset remote' to see all the available datasets, "
+        f"and 'darwin dataset pull' to pull them."
+    )
+
+
 def list_remote_datasets(all_teams: bool, team: Optional[str] = None) -> None:
     """
     Lists remote datasets with its annotation progress.
@@ -656,6 +742,8 @@ def upload_data(
     extract_views: bool = False,
     preserve_folders: bool = False,
     verbose: bool = False,
+    resume: bool = False,
+    pipelined: bool = False,
 ) -> None:
     """
     Uploads the provided files to the remote dataset.
@@ -684,6 +772,10 @@ def upload_data(
         Specify whether or not to preserve folder paths when uploading.
     verbose : bool
         Specify whether to have full traces print when uploading files or not.
+    resume : bool
+        Specify whether to resume the unconfirmed uploads of a previous, interrupted push.
+    pipelined : bool
+        Specify whether to start uploading files while the rest are still being registered.
     """
     client: Client = _load_client()
     try:
@@ -773,6 +865,8 @@ def upload_data(
                 preserve_folders=preserve_folders,
                 progress_callback=progress_callback,
                 file_upload_callback=file_upload_callback,
+                resume=resume,
+                pipelined=pipelined,
             )
         console = Console(theme=_console_theme())
 
@@ -872,6 +966,8 @@ def dataset_import(
     legacy: bool = False,
     use_multi_cpu: bool = False,
     cpu_limit: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    use_remote_index: bool = False,
 ) -> None:
     """
     Imports annotation files to the given dataset.
@@ -910,6 +1006,10 @@ def dataset_import(
         If ``True`` it will use all multiple CPUs to speed up the import process.
     cpu_limit : Optional[int], default: Core count - 2
         The maximum number of CPUs to use for the import process.
+    batch_size : Optional[int], default: None
+        If given, the annotations are sent in batches of up to this many items.
+    use_remote_index : bool, default: False
+        If ``True``, files are resolved to items through a local index of the dataset.
     """
 
     client: Client = _load_client(dataset_identifier=dataset_slug)
@@ -940,6 +1040,8 @@ def dataset_import(
             use_multi_cpu,
             cpu_limit,
             no_legacy=False if legacy else True,
+            use_remote_index=use_remote_index,
+            batch_size=batch_size,
         )
 
     except ImporterNotFoundError:
@@ -1196,6 +1298,7 @@ def dataset_convert(
     format: str,
     output_dir: Optional[PathLike] = None,
     legacy: bool = False,
+    workers: Optional[int] = None,
 ) -> None:
     """
     Converts the annotations from the given dataset to the given format.
@@ -1215,6 +1318,8 @@ def dataset_convert(
         This flag is only for the nifti format.
         If True, it will not export the annotations using legacy calculations.
         If False, it will resize the annotations using the new calculation by dividing with pixdims.
+    workers : Optional[int], default: None
+        Number of processes parsing the annotation files. If None they are parsed in this process.
     """
     identifier: DatasetIdentifier = DatasetIdentifier.parse(dataset_identifier)
     client: Client = _load_client(team_slug=identifier.team_slug)
@@ -1242,7 +1347,7 @@ def dataset_convert(
             output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        export_annotations(parser, [annotations_path], output_dir)
+        export_annotations(parser, [annotations_path], output_dir, workers=workers)
     except ExporterNotFoundError:
         _error(
             f"Unsupported export format: {format}, currently supported: {export_formats}"
@@ -1256,7 +1361,11 @@ def dataset_convert(
 
 
 def convert(
-    format: str, files: List[PathLike], output_dir: Path, legacy: bool = False
+    format: str,
+    files: List[PathLike],
+    output_dir: Path,
+    legacy: bool = False,
+    workers: Optional[int] = None,
 ) -> None:
     """
     Converts the given files to the specified format.
@@ -1273,6 +1382,8 @@ def convert(
         This flag is only for the nifti format.
         If True, it will not export the annotations using legacy calculations.
         If False, it will resize the annotations using the new calculation by dividing with pixdims.
+    workers: Optional[int], default: None
+        Number of processes parsing the annotation files. If None they are parsed in this process.
     """
     try:
         parser: ExportParser = get_exporter(format)
@@ -1288,6 +1399,7 @@ def convert(
         files,
         output_dir,
         split_sequences=(format != "nifti"),
+        workers=workers,
     )
 
 
@@ -4,12 +4,14 @@ Holds helper functions that deal with downloading videos and images.
 
 import functools
 import os
+import threading
 import time
 import urllib
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import orjson as json
@@ -17,8 +19,17 @@ import requests
 from PIL import Image
 from requests.adapters import HTTPAdapter, Retry
 from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TransferSpeedColumn,
+)
 
 import darwin.datatypes as dt
+from darwin.dataset.pull_manifest import PullManifest
 from darwin.dataset.utils import sanitize_filename
 from darwin.datatypes import AnnotationFile
 from darwin.exceptions import MissingDependency
@@ -30,6 +41,18 @@ from darwin.utils import (
     parse_darwin_json,
 )
 
+DEFAULT_POOL_SIZE: int = 10
+DEFAULT_THREADED_CONCURRENCY: int = 128
+DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+MAX_RESUME_ATTEMPTS: int = 5
+PARALLEL_RANGE_MIN_SIZE: int = 64 * 1024 * 1024
+DOWNLOAD_ENGINES: List[str] = ["multiprocessing", "threads"]
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+# Receives the size of every chunk written to disk; only set by the threaded engine
+_bytes_callback: Optional[Callable[[int], None]] = None
+
 
 def download_all_images_from_annotations(
     api_key: str,
@@ -42,6 +65,7 @@ def download_all_images_from_annotations(
     video_frames: bool = False,
     force_slots: bool = False,
     ignore_slots: bool = False,
+    incremental: bool = False,
 ) -> Tuple[Callable[[], Iterable[Any]], int]:
     """
     Downloads the all images corresponding to a project.
@@ -66,6 +90,10 @@ def download_all_images_from_annotations(
         Pulls video frames images instead of video files
     force_slots: bool
         Pulls all slots of items into deeper file structure ({prefix}/{item_name}/{slot_name}/{file_name})
+    incremental : bool, default: False
+        Uses the local ``PullManifest`` of the dataset to skip annotations that did not change since
+        a previous pull, instead of parsing every annotation and scanning the whole image folder.
+        With ``remove_extra``, only the files recorded by previous pulls are removed.
 
     Returns
     -------
@@ -83,6 +111,20 @@ def download_all_images_from_annotations(
     if annotation_format not in ["json", "xml"]:
         raise ValueError(f"Annotation format {annotation_format} not supported")
 
+    if incremental:
+        return _download_changed_images_from_annotations(
+            api_key,
+            annotations_path,
+            images_path,
+            force_replace,
+            remove_extra,
+            annotation_format,
+            use_folders,
+            video_frames,
+            force_slots,
+            ignore_slots,
+        )
+
     # Verify that there is not already image in the images folder
     existing_images = {
         image
@@ -157,6 +199,91 @@ def download_all_images_from_annotations(
     return lambda: download_functions, len(download_functions)
 
 
+def _download_changed_images_from_annotations(
+    api_key: str,
+    annotations_path: Path,
+    images_path: Path,
+    force_replace: bool,
+    remove_extra: bool,
+    annotation_format: str,
+    use_folders: bool,
+    video_frames: bool,
+    force_slots: bool,
+    ignore_slots: bool,
+) -> Tuple[Callable[[], Iterable[Any]], int]:
+    """
+    Incremental counterpart of ``download_all_images_from_annotations``.
+
+    Annotations whose content and files match the ``PullManifest`` of the dataset are skipped
+    without being parsed; only the remaining ones are parsed, planned and recorded in the manifest.
+    They are recorded as plans before their files are downloaded; the manifest records the size of
+    each file once a later pull finds it on disk.
+    """
+    annotations_to_download_path = []
+    with PullManifest(images_path) as manifest:
+        for annotation_path in annotations_path.glob(f"*.{annotation_format}"):
+            annotation_hash = manifest.hash_annotation(annotation_path)
+            if not force_replace and manifest.is_downloaded(
+                annotation_hash, use_folders
+            ):
+                continue
+
+            annotation = parse_darwin_json(annotation_path, count=0)
+            if annotation is None:
+                continue
+
+            planned_image_paths = _get_planned_image_paths(
+                annotation, images_path, use_folders
+            )
+            manifest.add(
+                annotation_hash, use_folders, annotation.item_id, planned_image_paths
+            )
+            if not force_replace and all(
+                planned_image_path.exists()
+                for planned_image_path in planned_image_paths
+            ):
+                continue
+
+            annotations_to_download_path.append(annotation_path)
+            if len(annotation.slots) > 1:
+                force_slots = True
+
+            for slot in annotation.slots:
+                if len(slot.source_files) > 1:
+                    force_slots = True
+
+        if remove_extra:
+            # Only the files recorded by previous pulls are known to the manifest, so the images
+            # directory is not scanned for files that were never pulled
+            for stale_image in manifest.get_stale_paths():
+                if stale_image.is_file():
+                    print(f"Removing {stale_image} as it is not part of this release")
+                    stale_image.unlink()
+                    _remove_empty_parents(stale_image.parent, images_path)
+
+        manifest.prune()
+
+    download_functions: List = []
+    for annotation_path in annotations_to_download_path:
+        download_functions.extend(
+            lazy_download_image_from_annotation(
+                api_key,
+                annotation_path,
+                images_path,
+                annotation_format,
+                use_folders,
+                video_frames,
+                force_slots,
+                ignore_slots,
+            )
+        )
+
+    if not use_folders:
+        _check_for_duplicate_local_filepaths(download_functions)
+
+    return lambda: download_functions, len(download_functions)
+
+
 def lazy_download_image_from_annotation(
     api_key: str,
     annotation_path: Path,
@@ -408,13 +535,22 @@ def _download_image(
     transform_file_function = None
     if slot and slot.metadata and slot.metadata.get("colorspace") == "RG16":
         transform_file_function = _rg16_to_grayscale
+    session = _get_session()
+    headers = _auth_headers(url, api_key)
+    part_path = _part_path(path)
     while True:
-        if "token" in url:
-            response: requests.Response = requests.get(url, stream=True)
-        else:
-            response = requests.get(
-                url, headers={"Authorization": f"ApiKey {api_key}"}, stream=True
-            )
+        request_headers = dict(headers)
+        # Pick up where a previous, interrupted run stopped
+        if part_path.exists() and part_path.stat().st_size > 0:
+            request_headers["Range"] = f"bytes={part_path.stat().st_size}-"
+        response: requests.Response = session.get(
+            url, headers=request_headers, stream=True
+        )
+        # The partial file does not match the remote file anymore: start over
+        if response.status_code == 416 and "Range" in request_headers:
+            response.close()
+            part_path.unlink()
+            continue
         # Correct status: download image
         if response.ok and has_json_content_type(response):
             # this branch is a workaround for edge case in V1 when video file from external storage could be registered
@@ -422,13 +558,15 @@ def _download_image(
             _fetch_multiple_files(path, response, transform_file_function)
             return
         elif response.ok:
-            _write_file(path, response, transform_file_function)
+            _write_file(path, response, transform_file_function, url, headers)
             return
         # Fatal-error status: fail
         if 400 <= response.status_code <= 499:
             raise Exception(
                 f"Request to ({url}) failed. Status code: {response.status_code}, content:\n{get_response_content(response)}."
             )
+        # Release the connection back to the pool before retrying
+        response.close()
         # Timeout
         if time.time() - start > TIMEOUT:
             raise Exception(f"Timeout url request ({url}) after {TIMEOUT} seconds.")
@@ -455,9 +593,9 @@ def _fetch_multiple_files(
         # get filename which is last http path segment
         filename = urllib.parse.urlparse(url).path.rsplit("/", 1)[-1]
         path = dir_path / filename
-        response = requests.get(url, stream=True)
+        response = _get_session().get(url, stream=True)
         if response.ok:
-            _write_file(path, response, transform_file_function)
+            _write_file(path, response, transform_file_function, url)
         else:
             raise Exception(
                 f"Request to ({url}) failed. Status code: {response.status_code}, content:\n{get_response_content(response)}."
@@ -465,15 +603,188 @@ def _fetch_multiple_files(
 
 
 def _write_file(
-    path: Path, response: requests.Response, transform_file_function=None
+    path: Path,
+    response: requests.Response,
+    transform_file_function=None,
+    url: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
 ) -> None:
-    with open(str(path), "wb") as file:
-        for chunk in response:
-            file.write(chunk)
+    """
+    Streams the body of ``response`` into a ``.part`` file next to ``path``, and atomically
+    renames it to ``path`` once its size matches the size announced by the server.
+
+    A ``206 Partial Content`` response is appended to the existing ``.part`` file, and dropped
+    connections are resumed with HTTP ``Range`` requests instead of starting from byte zero.
+    Files of at least ``PARALLEL_RANGE_MIN_SIZE`` bytes are split into
+    ``DARWIN_DOWNLOAD_RANGE_CHUNKS`` ranges downloaded in parallel, if the server allows it.
+
+    Parameters
+    ----------
+    path : Path
+        Final location of the file.
+    response : requests.Response
+        Streamed response with the (remaining) content of the file.
+    transform_file_function : Optional[Callable[[Path], None]], default: None
+        Function applied to the file once it is complete.
+    url : Optional[str], default: None
+        URL to request missing ranges from. Defaults to the URL of ``response``.
+    headers : Optional[Dict[str, str]], default: None
+        Headers sent along with every range request.
+
+    Raises
+    ------
+    Exception
+        If the downloaded file does not have the expected size.
+    """
+    url = url or response.url
+    headers = headers or {}
+    part_path = _part_path(path)
+    start = _get_range_start(response)
+    expected_size = _get_expected_size(response)
+    range_chunks = _get_range_chunks()
+
+    if (
+        start == 0
+        and range_chunks > 1
+        and expected_size is not None
+        and expected_size >= PARALLEL_RANGE_MIN_SIZE
+        and response.headers.get("Accept-Ranges") == "bytes"
+    ):
+        response.close()
+        _download_ranges(url, headers, part_path, expected_size, range_chunks)
+    else:
+        with open(str(part_path), "ab") as file:
+            file.truncate(start)
+        with open(str(part_path), "r+b") as file:
+            _stream_range(url, headers, file, response, start)
+
+    size = part_path.stat().st_size
+    if expected_size is not None and size != expected_size:
+        part_path.unlink()
+        raise Exception(
+            f"Download of ({url}) is incomplete. Expected {expected_size} bytes, got {size}."
+        )
+    os.replace(part_path, path)
     if transform_file_function is not None:
         transform_file_function(path)
 
 
+def _stream_range(
+    url: str,
+    headers: Dict[str, str],
+    file: BinaryIO,
+    response: requests.Response,
+    start: int,
+    end: Optional[int] = None,
+) -> int:
+    """
+    Writes the body of ``response`` to ``file`` from offset ``start``, re-requesting the
+    missing bytes up to ``end`` (inclusive) if the connection drops.
+
+    Returns the offset right after the last byte written.
+    """
+    offset = start
+    attempts = 0
+    while True:
+        try:
+            file.seek(offset)
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+                offset += len(chunk)
+                _report_bytes(len(chunk))
+            return offset
+        except (
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.ConnectionError,
+        ):
+            response.close()
+            if attempts >= MAX_RESUME_ATTEMPTS:
+                raise
+            attempts += 1
+            time.sleep(1)
+            byte_range = f"bytes={offset}-{'' if end is None else end}"
+            response = _get_session().get(
+                url, headers={**headers, "Range": byte_range}, stream=True
+            )
+            if response.status_code != 206:
+                raise Exception(
+                    f"Unable to resume download of ({url}). Status code: {response.status_code}."
+                )
+
+
+def _download_ranges(
+    url: str, headers: Dict[str, str], part_path: Path, size: int, chunks: int
+) -> None:
+    """
+    Downloads a file of ``size`` bytes into ``part_path`` as ``chunks`` ranges fetched in
+    parallel, each written at its own offset.
+    """
+    with open(str(part_path), "wb") as file:
+        file.truncate(size)
+
+    def download_range(start: int, end: int) -> None:
+        response = _get_session().get(
+            url, headers={**headers, "Range": f"bytes={start}-{end}"}, stream=True
+        )
+        if response.status_code != 206:
+            raise Exception(
+                f"Range request to ({url}) failed. Status code: {response.status_code}."
+            )
+        with open(str(part_path), "r+b") as file:
+            written_until = _stream_range(url, headers, file, response, start, end)
+        if written_until != end + 1:
+            raise Exception(
+                f"Download of ({url}) is incomplete. Range {start}-{end} stopped at byte {written_until}."
+            )
+
+    chunk_size = -(-size // chunks)
+    with ThreadPoolExecutor(max_workers=chunks) as executor:
+        futures = [
+            executor.submit(download_range, start, min(start + chunk_size, size) - 1)
+            for start in range(0, size, chunk_size)
+        ]
+        for future in futures:
+            future.result()
+
+
+def _part_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.part")
+
+
+def _get_range_start(response: requests.Response) -> int:
+    # e.g. "Content-Range: bytes 200-1000/67589"
+    content_range = response.headers.get("Content-Range")
+    if response.status_code != 206 or not content_range:
+        return 0
+    return int(content_range.split(" ")[-1].split("-")[0])
+
+
+def _get_expected_size(response: requests.Response) -> Optional[int]:
+    """
+    Returns the full size of the file served by ``response``, if the server announced it.
+    """
+    # Encoded bodies are decoded on the fly, so their length says nothing about the file size
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    if response.status_code == 206:
+        total = response.headers.get("Content-Range", "").rsplit("/", 1)[-1]
+        return int(total) if total.isdigit() else None
+    content_length = response.headers.get("Content-Length")
+    return int(content_length) if content_length and content_length.isdigit() else None
+
+
+def _get_range_chunks() -> int:
+    """
+    Returns the number of parallel ranges large files are split into.
+
+    Can be set with the ``DARWIN_DOWNLOAD_RANGE_CHUNKS`` environment variable, defaults to 1.
+    """
+    env_chunks: Optional[str] = os.getenv("DARWIN_DOWNLOAD_RANGE_CHUNKS")
+    if env_chunks and int(env_chunks) > 1:
+        return int(env_chunks)
+    return 1
+
+
 def _rg16_to_grayscale(path):
     # Custom 16bit grayscale encoded on (RG)B channels
     # into regular 8bit grayscale
@@ -533,52 +844,214 @@ def _extract_frames_from_segment(path: Path, manifest: dt.SegmentManifest) -> No
 
 
 def _download_video_segment_file(url: str, api_key: str, path: Path) -> None:
-    with requests.Session() as session:
-        retries = Retry(
-            total=5, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504]
-        )
-        session.mount("https://", HTTPAdapter(max_retries=retries))
-        if "token" in url:
-            response = session.get(url)
-        else:
-            session.headers = {"Authorization": f"ApiKey {api_key}"}
-            response = session.get(url)
+    headers = _auth_headers(url, api_key)
+    response = _get_session().get(url, headers=headers, stream=True)
     if not response.ok or (400 <= response.status_code <= 499):
         raise Exception(
             f"Request to ({url}) failed. Status code: {response.status_code}, content:\n{get_response_content(response)}."
         )
     # create new filename for segment with .
-    with open(str(path), "wb") as file:
-        for chunk in response:
-            file.write(chunk)
+    _write_file(path, response, url=url, headers=headers)
 
 
 def download_manifest_txts(urls: List[str], api_key: str, folder: Path) -> List[Path]:
     paths = []
-    with requests.Session() as session:
-        retries = Retry(
-            total=5, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504]
-        )
-        session.mount("https://", HTTPAdapter(max_retries=retries))
-        for index, url in enumerate(urls):
-            if "token" in url:
-                response = session.get(url)
-            else:
-                session.headers = {"Authorization": f"ApiKey {api_key}"}
-                response = session.get(url)
-            if not response.ok or (400 <= response.status_code <= 499):
-                raise Exception(
-                    f"Request to ({url}) failed. Status code: {response.status_code}, content:\n{get_response_content(response)}."
-                )
-            if not response.content:
-                raise Exception(f"Manifest file ({url}) is empty.")
-            path = folder / f"manifest_{index + 1}.txt"
-            with open(str(path), "wb") as file:
-                file.write(response.content)
-            paths.append(path)
+    session = _get_session()
+    for index, url in enumerate(urls):
+        response = session.get(url, headers=_auth_headers(url, api_key))
+        if not response.ok or (400 <= response.status_code <= 499):
+            raise Exception(
+                f"Request to ({url}) failed. Status code: {response.status_code}, content:\n{get_response_content(response)}."
+            )
+        if not response.content:
+            raise Exception(f"Manifest file ({url}) is empty.")
+        path = folder / f"manifest_{index + 1}.txt"
+        with open(str(path), "wb") as file:
+            file.write(response.content)
+        paths.append(path)
     return paths
 
 
+def download_files_threaded(
+    download_functions: Iterable[Callable[[], Any]],
+    count: int,
+    max_concurrency: int = DEFAULT_THREADED_CONCURRENCY,
+    max_connections_per_host: Optional[int] = None,
+) -> Tuple[List[Any], List[Exception]]:
+    """
+    Runs the given download functions on a bounded pool of threads of a single process, as an
+    alternative to ``exhaust_generator`` for network bound pulls.
+
+    The ``max_concurrency`` threads all share one pooled download session. Up to
+    ``max_concurrency`` transfers are in flight at once, and the session blocks threads waiting
+    for a connection so that no more than ``max_connections_per_host`` connections are ever open
+    to the same host. Progress is reported both in files and in bytes written to disk.
+
+    Parameters
+    ----------
+    download_functions : Iterable[Callable[[], Any]]
+        The download functions, as planned by ``download_all_images_from_annotations``.
+    count : int
+        The number of download functions.
+    max_concurrency : int, default: DEFAULT_THREADED_CONCURRENCY
+        Number of threads, and so maximum number of transfers in flight at the same time.
+    max_connections_per_host : Optional[int], default: None
+        Maximum number of open connections per host. Defaults to the value of the
+        ``DARWIN_DOWNLOAD_POOL_SIZE`` environment variable or ``max_concurrency``.
+
+    Returns
+    -------
+    Tuple[List[Any], List[Exception]]
+        The results of the successful downloads and the errors of the failed ones.
+    """
+    global _bytes_callback, _session, _session_pid
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be a positive integer")
+    if max_connections_per_host is None:
+        max_connections_per_host = _get_pool_size(default=max_concurrency)
+
+    progress = Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+    )
+    files_task = progress.add_task("Files", total=count)
+    bytes_task = progress.add_task("Bytes", total=None)
+    progress_lock = threading.Lock()
+
+    def on_bytes(size: int) -> None:
+        with progress_lock:
+            progress.advance(bytes_task, size)
+
+    previous_session, previous_pid = _session, _session_pid
+    # Blocking pool: threads wait for a free connection instead of opening extra ones
+    _session = _build_session(max_connections_per_host, pool_block=True)
+    _session_pid = os.getpid()
+    _bytes_callback = on_bytes
+    try:
+        with progress:
+            return _run_download_functions(
+                download_functions,
+                max_concurrency,
+                lambda: progress.advance(files_task),
+            )
+    finally:
+        _bytes_callback = None
+        _session.close()
+        _session, _session_pid = previous_session, previous_pid
+
+
+def _run_download_functions(
+    download_functions: Iterable[Callable[[], Any]],
+    max_concurrency: int,
+    on_done: Callable[[], None],
+) -> Tuple[List[Any], List[Exception]]:
+    successes: List[Any] = []
+    errors: List[Exception] = []
+    # A shared iterator keeps memory flat: each thread takes the next function once it is free
+    pending = iter(download_functions)
+    pending_lock = threading.Lock()
+
+    def next_download_function() -> Optional[Callable[[], Any]]:
+        with pending_lock:
+            return next(pending, None)
+
+    def worker() -> None:
+        while True:
+            download_function = next_download_function()
+            if download_function is None:
+                return
+            try:
+                successes.append(download_function())
+            except Exception as e:
+                errors.append(e)
+            on_done()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        workers = [executor.submit(worker) for _ in range(max_concurrency)]
+    for future in workers:
+        future.result()
+    return successes, errors
+
+
+def _report_bytes(size: int) -> None:
+    callback = _bytes_callback
+    if callback is not None:
+        callback(size)
+
+
+def _get_pool_size(default: int = DEFAULT_POOL_SIZE) -> int:
+    """
+    Returns the number of keep-alive connections each download session keeps per host.
+
+    Can be overridden with the ``DARWIN_DOWNLOAD_POOL_SIZE`` environment variable.
+    """
+    env_pool_size: Optional[str] = os.getenv("DARWIN_DOWNLOAD_POOL_SIZE")
+    if env_pool_size and int(env_pool_size) > 0:
+        return int(env_pool_size)
+    return default
+
+
+def _build_session(pool_size: int, pool_block: bool = False) -> requests.Session:
+    """
+    Creates a ``requests.Session`` with a connection pool of the given size and the download
+    retry policy mounted on both ``http://`` and ``https://``.
+
+    Parameters
+    ----------
+    pool_size : int
+        Maximum number of connections kept alive per host.
+    pool_block : bool, default: False
+        If True, no more than ``pool_size`` connections are ever opened to the same host.
+
+    Returns
+    -------
+    requests.Session
+        The configured session.
+    """
+    session = requests.Session()
+    # Exhausted retries hand the last response back so callers keep their own status handling
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retries,
+        pool_block=pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_session() -> requests.Session:
+    """
+    Returns the pooled session shared by every download made from the current process.
+
+    The session is created lazily and re-created after a fork, so each ``mp.Pool`` worker
+    keeps its own keep-alive connections instead of sharing sockets with its parent.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        _session = _build_session(_get_pool_size())
+        _session_pid = pid
+    return _session
+
+
+def _auth_headers(url: str, api_key: str) -> Dict[str, str]:
+    # Signed URLs carry their own token and must not receive the API key
+    if "token" in url:
+        return {}
+    return {"Authorization": f"ApiKey {api_key}"}
+
+
 def get_segment_manifests(
     slot: dt.Slot, parent_path: Path, api_key: str
 ) -> List[dt.SegmentManifest]:
@@ -714,6 +1187,27 @@ def _remove_empty_directories(images_path: Path) -> bool:
         print(f"Removed empty directory: {images_path}")
 
 
+def _remove_empty_parents(directory: Path, images_path: Path) -> None:
+    """
+    Removes the given directory and then its parents for as long as they are empty, stopping at
+    ``images_path``.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory a file was removed from.
+    images_path : Path
+        The root of the images, which is never removed.
+    """
+    while directory != images_path and images_path in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        print(f"Removed empty directory: {directory}")
+        directory = directory.parent
+
+
 def _check_for_duplicate_local_filepaths(
     download_functions: List[Callable[[], None]]
 ) -> None:
@@ -0,0 +1,155 @@
+"""
+Holds the cache of decoded images used by ``LocalDataset`` to avoid decoding an image on every
+access.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from darwin.datatypes import PathLike
+
+
+class DecodedImageCache:
+    """
+    Least recently used cache of decoded images, as ``uint8`` arrays, bounded by their total size.
+
+    Images are kept in RAM by default. If a ``directory`` is given, they are saved there as
+    ``.npy`` files and memory-mapped when read instead, so that every process using the same
+    directory (e.g. the workers of a ``DataLoader``) shares them and they outlive the processes.
+    A directory in ``/dev/shm`` keeps them in shared memory.
+
+    In RAM, every process has its own copy of the cache, which is not pickled: the workers of a
+    ``DataLoader`` start empty and only keep their images across epochs with
+    ``persistent_workers=True``. On disk, the size bound is enforced by each process over the
+    images it has written or read, so it is approximate when several processes share the
+    directory.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Maximum total size of the cached images. Images bigger than it are never cached.
+    directory : Optional[PathLike], default: None
+        Where to save the images. If ``None``, they are kept in RAM.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Maximum total size of the cached images.
+    directory : Optional[Path]
+        Where the images are saved, or ``None`` if they are kept in RAM.
+    nbytes : int
+        Total size of the images currently cached by this process.
+    """
+
+    def __init__(self, max_bytes: int, directory: Optional[PathLike] = None):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.max_bytes: int = max_bytes
+        self.directory: Optional[Path] = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.nbytes: int = 0
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sizes or (
+            self.directory is not None and self._path(key).exists()
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"max_bytes": self.max_bytes, "directory": self.directory}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["max_bytes"], state["directory"])
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Returns the cached image with the given key, marking it as the most recently used.
+
+        Parameters
+        ----------
+        key : str
+            Key of the image.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The image, read-only if it is memory-mapped, or ``None`` if it is not cached.
+        """
+        if self.directory is None:
+            if key not in self._sizes:
+                return None
+            self._sizes.move_to_end(key)
+            return self._arrays[key]
+
+        try:
+            array = np.load(self._path(key), mmap_mode="r")
+        except (OSError, ValueError):
+            # Not cached, or evicted by another process
+            self._forget(key)
+            return None
+        if key in self._sizes:
+            self._sizes.move_to_end(key)
+        else:
+            self._remember(key, array.nbytes)
+        return array
+
+    def put(self, key: str, array: np.ndarray) -> None:
+        """
+        Caches the given image, evicting the least recently used ones if needed.
+
+        Parameters
+        ----------
+        key : str
+            Key of the image.
+        array : np.ndarray
+            The decoded image.
+        """
+        if array.nbytes > self.max_bytes or key in self._sizes:
+            return
+        self._remember(key, array.nbytes)
+        if self.directory is None:
+            self._arrays[key] = array
+            return
+
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            self._forget(key)
+
+    def _remember(self, key: str, nbytes: int) -> None:
+        while self._sizes and self.nbytes + nbytes > self.max_bytes:
+            self._evict(next(iter(self._sizes)))
+        self._sizes[key] = nbytes
+        self.nbytes += nbytes
+
+    def _forget(self, key: str) -> None:
+        self.nbytes -= self._sizes.pop(key, 0)
+        self._arrays.pop(key, None)
+
+    def _evict(self, key: str) -> None:
+        self._forget(key)
+        if self.directory is not None:
+            try:
+                self._path(key).unlink(missing_ok=True)
+            except OSError:
+                # Still mapped by another process on some platforms
+                pass
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()[:20]}.npy"
@@ -1,10 +1,16 @@
+import hashlib
+import json
 import multiprocessing as mp
+import os
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 from PIL import Image as PILImage
 
+from darwin.dataset.image_cache import DecodedImageCache
 from darwin.dataset.utils import get_classes, get_release_path, load_pil_image
 from darwin.utils import (
     SUPPORTED_IMAGE_EXTENSIONS,
@@ -15,6 +21,45 @@ from darwin.utils import (
     stream_darwin_json,
 )
 
+# Directory, inside a release, where the cached indexes of its ``LocalDataset``s are stored
+INDEX_CACHE_DIR_NAME: str = ".local_dataset_index"
+
+# Bumped whenever the content of the cached indexes changes
+INDEX_CACHE_VERSION: int = 2
+
+# Directory, inside a release, where the cached label statistics of its datasets are stored
+LABEL_STATISTICS_DIR_NAME: str = ".label_statistics"
+
+# Bumped whenever the content of the cached label statistics changes
+LABEL_STATISTICS_VERSION: int = 1
+
+# Number of pixels converted to float at once when measuring the moments of an image
+_MOMENTS_BLOCK_SIZE: int = 1 << 20
+
+
+@dataclass
+class LabelStatistics:
+    """
+    Labels of every sample of a ``LocalDataset``, as found by
+    ``LocalDataset.get_label_statistics``.
+
+    Attributes
+    ----------
+    class_ids : List[List[int]]
+        Indexes in the dataset classes of the labels of each sample, in annotation order.
+    class_counts : np.ndarray
+        Number of labels of each class across all samples.
+    weights : np.ndarray
+        Inverse frequency of each class with at least one label, normalized to sum up to 1.
+    is_multi_label : bool
+        Whether at least one sample has more than one label.
+    """
+
+    class_ids: List[List[int]]
+    class_counts: np.ndarray
+    weights: np.ndarray
+    is_multi_label: bool
+
 
 class LocalDataset:
     """
@@ -35,6 +80,22 @@ class LocalDataset:
         Heuristic used to do the split ``["random", "stratified"]``.
     release_name : Optional[str], default: None
         Version of the dataset.
+    keep_empty_annotations : bool, default: False
+        If ``True``, images whose annotation file has no annotations are kept.
+    cache_index : bool, default: False
+        If ``True``, the image paths, annotation paths and image sizes found for this release,
+        split and partition are saved to an index inside the release and loaded from it by later
+        instantiations, instead of scanning every annotation file again. The index is rebuilt
+        whenever the modification time of the annotations directory, the images directory or the
+        split file changes, the modification time or size of an annotation file changes, or the
+        list of classes differs.
+    image_cache : Optional[DecodedImageCache], default: None
+        If given, images are decoded once and read from this cache afterwards, e.g. in later
+        epochs.
+    image_draft_size : Optional[Tuple[int, int]], default: None
+        If given, JPEG images are decoded at a reduced scale that is still at least this
+        ``(width, height)``, for pipelines that resize them down anyway. Only available for
+        ``tag`` annotations, whose targets do not depend on the size of the images.
 
     Attributes
     ----------
@@ -50,12 +111,23 @@ class LocalDataset:
         Heuristic used to do the split ``["random", "stratified"]``.
     release_name : Optional[str], default: None
         Version of the dataset.
+    release_path : Path
+        Path to the release of the dataset on the file system.
+    image_heights : Optional[List[Optional[int]]]
+        Height of each image, only available when ``cache_index`` is ``True``.
+    image_widths : Optional[List[Optional[int]]]
+        Width of each image, only available when ``cache_index`` is ``True``.
+    image_cache : Optional[DecodedImageCache]
+        Cache of the decoded images, if any.
+    image_draft_size : Optional[Tuple[int, int]]
+        Minimum size at which JPEG images are decoded, if any.
 
     Raises
     ------
     ValueError
 
         - If ``partition``, ``split_type`` or ``annotation_type`` have an invalid value.
+        - If ``image_draft_size`` is given for annotations other than ``tag``.
         - If an annotation has no corresponding image
         - If an image has multiple extensions (meaning it is present in multiple formats)
         - If no images are found
@@ -70,7 +142,15 @@ class LocalDataset:
         split_type: str = "random",
         release_name: Optional[str] = None,
         keep_empty_annotations: bool = False,
+        cache_index: bool = False,
+        image_cache: Optional[DecodedImageCache] = None,
+        image_draft_size: Optional[Tuple[int, int]] = None,
     ):
+        if image_draft_size is not None and annotation_type != "tag":
+            raise ValueError(
+                "image_draft_size can only be used with 'tag' annotations, as the coordinates "
+                "of other annotations refer to the full size images"
+            )
         self.dataset_path = dataset_path
         self.annotation_type = annotation_type
         self.images_path: List[Path] = []
@@ -79,10 +159,15 @@ class LocalDataset:
         self.original_images_path: Optional[List[Path]] = None
         self.original_annotations_path: Optional[List[Path]] = None
         self.keep_empty_annotations = keep_empty_annotations
+        self.image_heights: Optional[List[Optional[int]]] = None
+        self.image_widths: Optional[List[Optional[int]]] = None
+        self.image_cache: Optional[DecodedImageCache] = image_cache
+        self.image_draft_size: Optional[Tuple[int, int]] = image_draft_size
 
         release_path, annotations_dir, images_dir = self._initial_setup(
             dataset_path, release_name
         )
+        self.release_path: Path = release_path
         self._validate_inputs(partition, split_type, annotation_type)
         # Get the list of classes
 
@@ -97,16 +182,28 @@ class LocalDataset:
             remove_background=True,
         )
         self.num_classes = len(self.classes)
-        self._setup_annotations_and_images(
-            release_path,
-            annotations_dir,
-            images_dir,
-            annotation_type,
-            split,
-            partition,
-            split_type,
-            keep_empty_annotations,
-        )
+        if cache_index:
+            self._setup_from_index(
+                release_path,
+                annotations_dir,
+                images_dir,
+                annotation_type,
+                split,
+                partition,
+                split_type,
+                keep_empty_annotations,
+            )
+        else:
+            self._setup_annotations_and_images(
+                release_path,
+                annotations_dir,
+                images_dir,
+                annotation_type,
+                split,
+                partition,
+                split_type,
+                keep_empty_annotations,
+            )
 
         if len(self.images_path) == 0:
             raise ValueError(
@@ -136,12 +233,15 @@ class LocalDataset:
         partition,
         split_type,
         keep_empty_annotations: bool = False,
+        collect_index: bool = False,
     ):
         # Find all the annotations and their corresponding images
         with_folders = any(item.is_dir() for item in images_dir.iterdir())
         annotation_filepaths = get_annotation_filepaths(
             release_path, annotations_dir, annotation_type, split, partition, split_type
         )
+        if collect_index:
+            self.image_heights, self.image_widths = [], []
 
         for annotation_filepath in annotation_filepaths:
             annotation_filepath = Path(annotation_filepath)
@@ -156,12 +256,122 @@ class LocalDataset:
                     continue
                 self.images_path.append(image_path)
                 self.annotations_path.append(annotation_filepath)
+                if collect_index:
+                    height, width = _get_size_from_stream(darwin_json)
+                    self.image_heights.append(height)
+                    self.image_widths.append(width)
                 continue
             else:
                 raise ValueError(
                     f"Annotation ({annotation_filepath}) does not have a corresponding image, looking for image path: {image_path}"
                 )
 
+    def _setup_from_index(
+        self,
+        release_path,
+        annotations_dir,
+        images_dir,
+        annotation_type,
+        split,
+        partition,
+        split_type,
+        keep_empty_annotations: bool = False,
+    ):
+        index_name = "_".join(
+            [split, split_type, annotation_type, partition or "all"]
+            + (["keep_empty"] if keep_empty_annotations else [])
+        )
+        index_path = release_path / INDEX_CACHE_DIR_NAME / f"{index_name}.npz"
+        stat_paths = [annotations_dir, images_dir]
+        if partition is not None:
+            split_filename = (
+                f"{split_type}_{partition}.txt"
+                if split_type == "random"
+                else f"{split_type}_{annotation_type}_{partition}.txt"
+            )
+            stat_paths.append(release_path / "lists" / split / split_filename)
+        annotation_stats = hashlib.sha1()
+        _update_with_file_stats(
+            annotation_stats, map(Path, get_annotation_files_from_dir(annotations_dir))
+        )
+        fingerprint = json.dumps(
+            {
+                "version": INDEX_CACHE_VERSION,
+                "mtimes": [
+                    path.stat().st_mtime_ns if path.exists() else None
+                    for path in stat_paths
+                ],
+                "annotations": annotation_stats.hexdigest(),
+                "classes": self.classes,
+            }
+        )
+
+        if self._load_index(index_path, fingerprint):
+            return
+
+        self._setup_annotations_and_images(
+            release_path,
+            annotations_dir,
+            images_dir,
+            annotation_type,
+            split,
+            partition,
+            split_type,
+            keep_empty_annotations,
+            collect_index=True,
+        )
+        self._save_index(index_path, fingerprint)
+
+    def _load_index(self, index_path: Path, fingerprint: str) -> bool:
+        try:
+            with np.load(index_path) as index:
+                if str(index["fingerprint"]) != fingerprint:
+                    return False
+                images = index["images"].tolist()
+                annotations = index["annotations"].tolist()
+                heights = index["heights"].tolist()
+                widths = index["widths"].tolist()
+        except (OSError, KeyError, ValueError):
+            return False
+
+        self.images_path = [self.dataset_path / image for image in images]
+        self.annotations_path = [self.dataset_path / path for path in annotations]
+        self.image_heights = [height if height >= 0 else None for height in heights]
+        self.image_widths = [width if width >= 0 else None for width in widths]
+        return True
+
+    def _save_index(self, index_path: Path, fingerprint: str) -> None:
+        def relative(path: Path) -> str:
+            try:
+                return path.relative_to(self.dataset_path).as_posix()
+            except ValueError:
+                return str(path)
+
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            index_path.parent.mkdir(exist_ok=True)
+            with tmp_path.open("wb") as f:
+                np.savez(
+                    f,
+                    fingerprint=np.array(fingerprint),
+                    images=np.array([relative(p) for p in self.images_path], dtype=str),
+                    annotations=np.array(
+                        [relative(p) for p in self.annotations_path], dtype=str
+                    ),
+                    heights=np.array(
+                        [-1 if h is None else h for h in self.image_heights or []],
+                        dtype=np.int64,
+                    ),
+                    widths=np.array(
+                        [-1 if w is None else w for w in self.image_widths or []],
+                        dtype=np.int64,
+                    ),
+                )
+            os.replace(tmp_path, index_path)
+        except OSError:
+            # The index is only a cache: a read-only release is scanned on every instantiation
+            tmp_path.unlink(missing_ok=True)
+
     def _initial_setup(self, dataset_path, release_name):
         assert dataset_path is not None
         release_path = get_release_path(dataset_path, release_name)
@@ -216,6 +426,8 @@ class LocalDataset:
             A tuple where the first element is the ``height`` of the image and the second is the
             ``width``.
         """
+        if self.image_heights is not None and self.image_widths is not None:
+            return self.image_heights[index], self.image_widths[index]
         parsed = parse_darwin_json(self.annotations_path[index], index)
         return parsed.image_height, parsed.image_width
 
@@ -261,6 +473,8 @@ class LocalDataset:
         self.images_path += dataset.images_path
         self.original_annotations_path = self.annotations_path
         self.annotations_path += dataset.annotations_path
+        # Sizes and class ids of the given dataset may be missing or refer to other classes
+        self.image_heights, self.image_widths, self.class_ids = None, None, None
         return self
 
     def get_image(self, index: int) -> PILImage.Image:
@@ -277,7 +491,18 @@ class LocalDataset:
         PILImage.Image
             The image.
         """
-        return load_pil_image(self.images_path[index])
+        image_path = self.images_path[index]
+        if self.image_cache is None:
+            return load_pil_image(image_path, draft_size=self.image_draft_size)
+
+        key = f"{image_path}:{image_path.stat().st_mtime_ns}:{self.image_draft_size}"
+        pixels = self.image_cache.get(key)
+        if pixels is None:
+            pixels = np.asarray(
+                load_pil_image(image_path, draft_size=self.image_draft_size)
+            )
+            self.image_cache.put(key, pixels)
+        return PILImage.fromarray(pixels)
 
     def get_image_path(self, index: int) -> Path:
         """
@@ -330,32 +555,149 @@ class LocalDataset:
         }
 
     def annotation_type_supported(self, annotation) -> bool:
-        annotation_type = annotation.annotation_class.annotation_type
-        if self.annotation_type == "tag":
-            return annotation_type == "tag"
-        elif self.annotation_type == "bounding_box":
-            is_bounding_box = annotation_type == "bounding_box"
-            is_supported_polygon = (
-                annotation_type == "polygon" and "bounding_box" in annotation.data
-            )
-            return is_bounding_box or is_supported_polygon
-        elif self.annotation_type == "polygon":
-            return annotation_type == "polygon"
-        else:
-            raise ValueError(
-                "annotation_type should be either 'tag', 'bounding_box', or 'polygon'"
+        return _is_annotation_type_supported(annotation, self.annotation_type)
+
+    def get_cache_key(self, *parts: Any) -> str:
+        """
+        Returns a digest identifying the current content of this dataset, used to key the caches
+        stored in its release.
+
+        The digest covers the given parts, the classes, the modification time of the annotations
+        directory of the release and the path, modification time and size of every annotation
+        file, so that editing a file in place changes it.
+
+        Parameters
+        ----------
+        *parts : Any
+            JSON serializable values identifying the cached content.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest.
+        """
+        key = hashlib.sha1()
+        key.update(
+            json.dumps(
+                [
+                    *parts,
+                    self.annotation_type,
+                    self.classes,
+                    (self.release_path / "annotations").stat().st_mtime_ns,
+                ]
+            ).encode()
+        )
+        _update_with_file_stats(key, self.annotations_path)
+        return key.hexdigest()[:16]
+
+    def get_label_statistics(
+        self, count_paths: bool = False, multi_processed: bool = True
+    ) -> LabelStatistics:
+        """
+        Parses every annotation file once to collect the labels of each sample, i.e. the class of
+        each annotation kept by ``parse_json``.
+
+        The result is cached in the release and reused as long as ``get_cache_key`` is unchanged.
+
+        Parameters
+        ----------
+        count_paths : bool, default: False
+            If ``True``, a polygon counts once per path of at least three points, as in semantic
+            segmentation masks, instead of once.
+        multi_processed : bool, default: True
+            Uses a pool of processes to parse the annotation files in parallel.
+
+        Returns
+        -------
+        LabelStatistics
+            The labels of each sample and the statistics derived from them.
+        """
+        key = self.get_cache_key(LABEL_STATISTICS_VERSION, count_paths)
+        cache_path = self.release_path / LABEL_STATISTICS_DIR_NAME / f"{key}.npz"
+        class_ids: Optional[List[List[int]]] = None
+        try:
+            with np.load(cache_path) as cached:
+                offsets = cached["offsets"]
+                class_ids = [
+                    ids.tolist() for ids in np.split(cached["class_ids"], offsets[1:-1])
+                ]
+        except (OSError, KeyError, ValueError):
+            pass
+
+        if class_ids is None or len(class_ids) != len(self):
+            get_class_ids = partial(
+                _get_annotation_class_ids,
+                class_indexes={name: i for i, name in enumerate(self.classes)},
+                annotation_type=self.annotation_type,
+                count_paths=count_paths,
             )
+            if multi_processed and len(self) > 1:
+                with mp.Pool(min(mp.cpu_count(), len(self))) as pool:
+                    class_ids = pool.map(
+                        get_class_ids,
+                        self.annotations_path,
+                        chunksize=max(1, len(self) // (4 * mp.cpu_count())),
+                    )
+            else:
+                class_ids = [get_class_ids(path) for path in self.annotations_path]
+            self._save_label_statistics(cache_path, class_ids)
+
+        labels = [i for ids in class_ids for i in ids]
+        return LabelStatistics(
+            class_ids=class_ids,
+            class_counts=np.bincount(
+                np.array(labels, dtype=np.int64), minlength=len(self.classes)
+            ),
+            weights=self._compute_weights(labels) if labels else np.array([]),
+            is_multi_label=any(len(ids) > 1 for ids in class_ids),
+        )
+
+    def _save_label_statistics(
+        self, cache_path: Path, class_ids: List[List[int]]
+    ) -> None:
+        offsets = np.cumsum([0] + [len(ids) for ids in class_ids])
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            with tmp_path.open("wb") as f:
+                np.savez(
+                    f,
+                    class_ids=np.array(
+                        [i for ids in class_ids for i in ids], dtype=np.int64
+                    ),
+                    offsets=offsets.astype(np.int64),
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The statistics are only cached: a read-only release computes them every time
+            tmp_path.unlink(missing_ok=True)
 
     def measure_mean_std(
-        self, multi_processed: bool = True
+        self,
+        multi_processed: bool = True,
+        sample_size: Optional[int] = None,
+        seed: int = 0,
+        to_rgb: bool = True,
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Computes mean and std of trained images, given the train loader.
 
+        The images are read once: the per channel moments of each image are accumulated in
+        ``float32`` blocks and merged with Chan's parallel algorithm, so neither a second pass nor
+        full size ``float64`` copies of the images are needed.
+
         Parameters
         ----------
         multi_processed : bool, default: True
-            Uses multiprocessing to download the dataset in parallel.
+            Uses multiprocessing to read the images in parallel.
+        sample_size : Optional[int], default: None
+            If given, only this many images, drawn at random, are measured.
+        seed : int, default: 0
+            Seed of the random draw of ``sample_size`` images.
+        to_rgb : bool, default: True
+            Converts every image to RGB before measuring it. If ``False``, the images are measured
+            on their own channels (e.g. one for grayscale, four for RGBA), which must then be the
+            same for every image.
 
         Returns
         -------
@@ -363,34 +705,36 @@ class LocalDataset:
             Mean value (for each channel) of all pixels of the images in the input folder.
         std : ndarray[double]
             Standard deviation (for each channel) of all pixels of the images in the input folder.
+
+        Raises
+        ------
+        ValueError
+            If there are no images to measure, or if ``to_rgb`` is ``False`` and the images do not
+            all have the same number of channels.
         """
+        image_paths = self.images_path
+        if sample_size is not None and sample_size < len(image_paths):
+            rng = np.random.default_rng(seed)
+            indexes = np.sort(rng.choice(len(image_paths), sample_size, replace=False))
+            image_paths = [image_paths[i] for i in indexes]
+        if not image_paths:
+            raise ValueError("There are no images to measure")
+
+        image_moments = partial(_get_image_moments, to_rgb=to_rgb)
+        moments: Optional[Tuple[int, np.ndarray, np.ndarray]] = None
         if multi_processed:
-            # Set up a pool of workers
             with mp.Pool(mp.cpu_count()) as pool:
-                # Online mean
-                results = pool.map(self._return_mean, self.images_path)
-                mean = np.sum(np.array(results), axis=0) / len(self.images_path)
-                # Online image_classification deviation
-                results = pool.starmap(
-                    self._return_std, [[item, mean] for item in self.images_path]
-                )
-                std_sum = np.sum(np.array([item[0] for item in results]), axis=0)
-                total_pixel_count = np.sum(np.array([item[1] for item in results]))
-                std = np.sqrt(std_sum / total_pixel_count)
-                # Shut down the pool
-                pool.close()
-                pool.join()
-            return mean, std
+                chunksize = max(1, len(image_paths) // (4 * mp.cpu_count()))
+                for image in pool.imap_unordered(
+                    image_moments, image_paths, chunksize=chunksize
+                ):
+                    moments = _merge_moments(moments, image)
         else:
-            # Online mean
-            results = [self._return_mean(f) for f in self.images_path]
-            mean = np.sum(np.array(results), axis=0) / len(self.images_path)
-            # Online image_classification deviation
-            results = [self._return_std(f, mean) for f in self.images_path]
-            std_sum = np.sum(np.array([item[0] for item in results]), axis=0)
-            total_pixel_count = np.sum(np.array([item[1] for item in results]))
-            std = np.sqrt(std_sum / total_pixel_count)
-            return mean, std
+            for image_path in image_paths:
+                moments = _merge_moments(moments, image_moments(image_path))
+
+        count, mean, m2 = moments
+        return mean, np.sqrt(m2 / count)
 
     @staticmethod
     def _compute_weights(labels: List[int]) -> np.ndarray:
@@ -415,28 +759,8 @@ class LocalDataset:
         class_weights /= class_weights.sum()
         return class_weights
 
-    # Loads an image with Pillow and returns the channel wise means of the image.
-    @staticmethod
-    def _return_mean(image_path: Path) -> np.ndarray:
-        img = np.array(load_pil_image(image_path))
-        mean = np.array(
-            [np.mean(img[:, :, 0]), np.mean(img[:, :, 1]), np.mean(img[:, :, 2])]
-        )
-        return mean / 255.0
-
-    # Loads an image with OpenCV and returns the channel wise std of the image.
-    @staticmethod
-    def _return_std(image_path: Path, mean: np.ndarray) -> Tuple[np.ndarray, float]:
-        img = np.array(load_pil_image(image_path)) / 255.0
-        m2 = np.square(
-            np.array(
-                [img[:, :, 0] - mean[0], img[:, :, 1] - mean[1], img[:, :, 2] - mean[2]]
-            )
-        )
-        return np.sum(np.sum(m2, axis=1), 1), m2.size / 3.0
-
     def __getitem__(self, index: int):
-        img = load_pil_image(self.images_path[index])
+        img = self.get_image(index)
         target = self.parse_json(index)
         return img, target
 
@@ -452,6 +776,137 @@ class LocalDataset:
         )
 
 
+def _is_annotation_type_supported(annotation, annotation_type: str) -> bool:
+    main_annotation_type = annotation.annotation_class.annotation_type
+    if annotation_type == "tag":
+        return main_annotation_type == "tag"
+    elif annotation_type == "bounding_box":
+        is_bounding_box = main_annotation_type == "bounding_box"
+        is_supported_polygon = (
+            main_annotation_type == "polygon" and "bounding_box" in annotation.data
+        )
+        return is_bounding_box or is_supported_polygon
+    elif annotation_type == "polygon":
+        return main_annotation_type == "polygon"
+    else:
+        raise ValueError(
+            "annotation_type should be either 'tag', 'bounding_box', or 'polygon'"
+        )
+
+
+def _get_annotation_class_ids(
+    annotation_path: Path,
+    class_indexes: Dict[str, int],
+    annotation_type: str,
+    count_paths: bool,
+) -> List[int]:
+    # Module level so that it can be sent to the processes of a pool
+    parsed = parse_darwin_json(annotation_path)
+    if parsed is None or parsed.is_video:
+        return []
+
+    class_ids = []
+    for annotation in parsed.annotations:
+        name = annotation.annotation_class.name
+        if name not in class_indexes or not _is_annotation_type_supported(
+            annotation, annotation_type
+        ):
+            continue
+        if not count_paths:
+            class_ids.append(class_indexes[name])
+            continue
+        paths = (
+            annotation.data["paths"]
+            if "paths" in annotation.data
+            else [annotation.data["path"]]
+        )
+        # Polygons with less than three points are discarded from masks
+        class_ids.extend(class_indexes[name] for path in paths if len(path) >= 3)
+    return class_ids
+
+
+def _update_with_file_stats(key: Any, paths: Iterable[Path]) -> None:
+    # Editing a file in place changes neither its name nor the modification time of its directory
+    for path in paths:
+        try:
+            stat = path.stat()
+            stats = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            stats = None
+        key.update(json.dumps([str(path), stats]).encode())
+
+
+def _get_size_from_stream(darwin_json) -> Tuple[Optional[int], Optional[int]]:
+    slots = darwin_json["item"].get("slots")
+    if not slots:
+        return None, None
+    try:
+        slot = slots[0]
+    except IndexError:
+        return None, None
+    return slot.get("height"), slot.get("width")
+
+
+def _get_image_moments(
+    image_path: Path, to_rgb: bool = True
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    # Module level so that it can be sent to the processes of a pool. Returns the pixel count and
+    # the per channel mean and sum of squared deviations of the image, scaled to [0, 1].
+    image = load_pil_image(image_path, to_rgb=to_rgb)
+    if image.mode == "P":
+        # Palette indexes are not intensities
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    elif image.mode == "CMYK":
+        image = image.convert("RGB")
+    pixels = np.asarray(image)
+    scale = _get_pixel_scale(pixels.dtype)
+    pixels = pixels.reshape(-1, 1 if pixels.ndim == 2 else pixels.shape[-1])
+
+    moments: Optional[Tuple[int, np.ndarray, np.ndarray]] = None
+    for start in range(0, len(pixels), _MOMENTS_BLOCK_SIZE):
+        block = pixels[start : start + _MOMENTS_BLOCK_SIZE].astype(np.float32)
+        block /= scale
+        block_mean = block.mean(axis=0)
+        block -= block_mean
+        block_m2 = np.einsum("ij,ij->j", block, block)
+        moments = _merge_moments(
+            moments,
+            (len(block), block_mean.astype(np.float64), block_m2.astype(np.float64)),
+        )
+    return moments
+
+
+def _get_pixel_scale(dtype: np.dtype) -> float:
+    # 8 bit images are scaled by 255 and 16 bit ones (stored by Pillow as 16 or 32 bit integers)
+    # by 65535, as ``convert_to_rgb`` does, while binary and floating point images are kept as is
+    if dtype == np.uint8:
+        return 255.0
+    if np.issubdtype(dtype, np.integer):
+        return 65535.0
+    return 1.0
+
+
+def _merge_moments(
+    a: Optional[Tuple[int, np.ndarray, np.ndarray]],
+    b: Tuple[int, np.ndarray, np.ndarray],
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    # Chan et al. pairwise update of (count, mean, sum of squared deviations)
+    if a is None:
+        return b
+    count_a, mean_a, m2_a = a
+    count_b, mean_b, m2_b = b
+    if mean_a.shape != mean_b.shape:
+        raise ValueError(
+            f"Images have different numbers of channels ({len(mean_a)} and {len(mean_b)}), "
+            "measure them with to_rgb=True"
+        )
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (count_b / count)
+    m2 = m2_a + m2_b + np.square(delta) * (count_a * count_b / count)
+    return count, mean, m2
+
+
 def get_annotation_filepaths(
     release_path: Path,
     annotations_dir: Path,
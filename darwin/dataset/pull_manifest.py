@@ -0,0 +1,207 @@
+"""
+Holds the local manifest used to pull releases incrementally.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from types import TracebackType
+from typing import List, Optional, Type
+
+MANIFEST_FILE_NAME: str = ".pull_manifest.sqlite"
+
+
+class PullManifest:
+    """
+    SQLite backed record of the files downloaded by previous pulls of a dataset.
+
+    Every row links the hash of an annotation file of a release to one of the files planned for
+    it, so an unchanged annotation can be matched to its already downloaded files without being
+    parsed again. Rows are plans, not completions: they are written before the files are
+    downloaded, and the size of a file is only recorded once it is found at its planned path.
+    Downloads are written to a ``.part`` file renamed on completion, so a file found at its
+    planned path is complete.
+
+    Parameters
+    ----------
+    images_path : Path
+        Local directory where the dataset files are downloaded to. The manifest is stored next to
+        it, in the dataset directory.
+
+    Attributes
+    ----------
+    images_path : Path
+        Local directory where the dataset files are downloaded to.
+    path : Path
+        Location of the SQLite file.
+    """
+
+    def __init__(self, images_path: Path):
+        self.images_path: Path = images_path
+        self.path: Path = images_path.parent / MANIFEST_FILE_NAME
+        self._connection: sqlite3.Connection = sqlite3.connect(str(self.path))
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                annotation_hash TEXT NOT NULL,
+                use_folders INTEGER NOT NULL,
+                item_id TEXT,
+                path TEXT NOT NULL,
+                size INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS files_annotation
+                ON files (annotation_hash, use_folders);
+            CREATE TEMP TABLE seen (annotation_hash TEXT PRIMARY KEY);
+            """
+        )
+
+    def __enter__(self) -> "PullManifest":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self._connection.commit()
+        self._connection.close()
+
+    @staticmethod
+    def hash_annotation(annotation_path: Path) -> str:
+        """
+        Returns the digest of the raw content of an annotation file.
+
+        Parameters
+        ----------
+        annotation_path : Path
+            Path to the annotation file.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest.
+        """
+        return hashlib.sha1(annotation_path.read_bytes()).hexdigest()
+
+    def is_downloaded(self, annotation_hash: str, use_folders: bool) -> bool:
+        """
+        Marks the given annotation as part of the release being pulled and checks whether all of
+        its files were already downloaded.
+
+        A file counts as downloaded if it exists and, once its size has been recorded, still has
+        that size. Sizes are recorded the first time a file is found on disk.
+
+        Parameters
+        ----------
+        annotation_hash : str
+            Digest of the annotation file, as returned by ``hash_annotation``.
+        use_folders : bool
+            Whether the remote folder structure is recreated locally for this pull.
+
+        Returns
+        -------
+        bool
+            True if the annotation is known and all of its files are on disk, False otherwise.
+        """
+        self._connection.execute(
+            "INSERT OR IGNORE INTO seen VALUES (?)", (annotation_hash,)
+        )
+        rows = self._connection.execute(
+            "SELECT rowid, path, size FROM files WHERE annotation_hash = ? AND use_folders = ?",
+            (annotation_hash, int(use_folders)),
+        ).fetchall()
+        if not rows:
+            return False
+
+        for rowid, path, size in rows:
+            local_path = self.images_path / path
+            try:
+                local_size = local_path.stat().st_size
+            except FileNotFoundError:
+                return False
+            if size is None:
+                self._connection.execute(
+                    "UPDATE files SET size = ? WHERE rowid = ?", (local_size, rowid)
+                )
+            elif size != local_size:
+                return False
+        return True
+
+    def add(
+        self,
+        annotation_hash: str,
+        use_folders: bool,
+        item_id: Optional[str],
+        planned_paths: List[Path],
+    ) -> None:
+        """
+        Records the files planned for an annotation, replacing any previous record of it.
+
+        This is called before the files are downloaded, so their sizes are left unset until
+        ``is_downloaded`` finds them on disk.
+
+        Parameters
+        ----------
+        annotation_hash : str
+            Digest of the annotation file, as returned by ``hash_annotation``.
+        use_folders : bool
+            Whether the remote folder structure is recreated locally for this pull.
+        item_id : Optional[str]
+            Id of the dataset item the annotation belongs to.
+        planned_paths : List[Path]
+            Local paths the files of the item are downloaded to.
+        """
+        self._connection.execute(
+            "INSERT OR IGNORE INTO seen VALUES (?)", (annotation_hash,)
+        )
+        self._connection.execute(
+            "DELETE FROM files WHERE annotation_hash = ? AND use_folders = ?",
+            (annotation_hash, int(use_folders)),
+        )
+        self._connection.executemany(
+            "INSERT INTO files VALUES (?, ?, ?, ?, NULL)",
+            [
+                (
+                    annotation_hash,
+                    int(use_folders),
+                    item_id,
+                    path.relative_to(self.images_path).as_posix(),
+                )
+                for path in planned_paths
+            ],
+        )
+
+    def get_stale_paths(self) -> List[Path]:
+        """
+        Returns the local paths of the files recorded for annotations that were not seen while
+        planning the current pull, leaving out those also planned for an annotation that was.
+        """
+        rows = self._connection.execute(
+            """
+            SELECT DISTINCT path FROM files
+            WHERE annotation_hash NOT IN (SELECT annotation_hash FROM seen)
+                AND path NOT IN (
+                    SELECT path FROM files
+                    WHERE annotation_hash IN (SELECT annotation_hash FROM seen)
+                )
+            """
+        )
+        return [self.images_path / path for (path,) in rows]
+
+    def count_downloaded(self) -> int:
+        """
+        Returns the number of recorded files that are on disk, checking each of them instead of
+        scanning the images directory.
+        """
+        rows = self._connection.execute("SELECT DISTINCT path FROM files")
+        return sum((self.images_path / path).exists() for (path,) in rows)
+
+    def prune(self) -> None:
+        """
+        Forgets every annotation that was not seen while planning the current pull.
+        """
+        self._connection.execute(
+            "DELETE FROM files WHERE annotation_hash NOT IN (SELECT annotation_hash FROM seen)"
+        )
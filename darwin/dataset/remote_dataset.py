@@ -22,8 +22,14 @@ from typing import (
 import orjson as json
 from rich.console import Console
 
-from darwin.dataset.download_manager import download_all_images_from_annotations
+from darwin.dataset.download_manager import (
+    DEFAULT_THREADED_CONCURRENCY,
+    DOWNLOAD_ENGINES,
+    download_all_images_from_annotations,
+    download_files_threaded,
+)
 from darwin.dataset.identifier import DatasetIdentifier
+from darwin.dataset.pull_manifest import PullManifest
 from darwin.dataset.release import Release
 from darwin.dataset.split_manager import split_dataset
 from darwin.dataset.upload_manager import (
@@ -138,6 +144,8 @@ class RemoteDataset(ABC):
         preserve_folders: bool = False,
         progress_callback: Optional[ProgressCallback] = None,
         file_upload_callback: Optional[FileUploadCallback] = None,
+        resume: bool = False,
+        pipelined: bool = False,
     ) -> UploadHandler:
         pass
 
@@ -211,6 +219,9 @@ class RemoteDataset(ABC):
         retry: bool = False,
         retry_timeout: int = 600,
         retry_interval: int = 10,
+        engine: str = "multiprocessing",
+        incremental: bool = False,
+        max_connections_per_host: Optional[int] = None,
     ) -> Tuple[Optional[Callable[[], Iterator[Any]]], int]:
         """
         Downloads a remote dataset (images and annotations) to the datasets directory.
@@ -243,6 +254,17 @@ class RemoteDataset(ABC):
             Pulls all slots of items into deeper file structure ({prefix}/{item_name}/{slot_name}/{file_name})
         retry: bool
             If True, will repeatedly try to download the release if it is still processing up to a maximum of 5 minutes.
+        engine : str, default: "multiprocessing"
+            Download engine used when ``blocking`` is True. ``"multiprocessing"`` downloads one file per
+            process, ``"threads"`` runs many concurrent transfers from a single process on a thread pool.
+            The concurrency of either engine is set with the ``DARWIN_DOWNLOAD_FILES_CONCURRENCY``
+            environment variable.
+        incremental : bool, default: False
+            Only parses and downloads the items whose annotations changed since a previous pull, using a
+            manifest stored in the dataset directory.
+        max_connections_per_host : Optional[int], default: None
+            Maximum number of connections the ``"threads"`` engine opens to the same host. Defaults to the
+            ``DARWIN_DOWNLOAD_POOL_SIZE`` environment variable, or to the concurrency of the engine.
 
         Returns
         -------
@@ -259,10 +281,20 @@ class RemoteDataset(ABC):
             If darwin in unable to get ``Team`` configuration.
         ValueError
             If the release is still processing after the maximum retry duration.
+        ValueError
+            If the given ``engine`` is not supported.
         """
 
         console = self.console or Console()
 
+        if engine not in DOWNLOAD_ENGINES:
+            raise ValueError(
+                f"Download engine '{engine}' is not supported. Supported engines: {', '.join(DOWNLOAD_ENGINES)}."
+            )
+
+        if max_connections_per_host is not None and max_connections_per_host < 1:
+            raise ValueError("max_connections_per_host must be a positive integer")
+
         if retry and retry_timeout < retry_interval:
             raise ValueError(
                 f"The value of retry_timeout '{retry_timeout}' must be greater than or equal to the value of retry_interval '{retry_interval}'."
@@ -401,6 +433,7 @@ class RemoteDataset(ABC):
             video_frames=video_frames,
             force_slots=force_slots,
             ignore_slots=ignore_slots,
+            incremental=incremental,
         )
         if count == 0:
             return None, count
@@ -415,12 +448,20 @@ class RemoteDataset(ABC):
             console.print(
                 f"Going to download {str(count)} files to {self.local_images_path.as_posix()} ."
             )
-            successes, errors = exhaust_generator(
-                progress=progress(),
-                count=count,
-                multi_processed=multi_processed,
-                worker_count=max_workers,
-            )
+            if engine == "threads":
+                successes, errors = download_files_threaded(
+                    progress(),
+                    count,
+                    max_concurrency=max_workers or DEFAULT_THREADED_CONCURRENCY,
+                    max_connections_per_host=max_connections_per_host,
+                )
+            else:
+                successes, errors = exhaust_generator(
+                    progress=progress(),
+                    count=count,
+                    multi_processed=multi_processed,
+                    worker_count=max_workers,
+                )
             if errors:
                 self.console.print(
                     f"Encountered errors downloading {len(errors)} files"
@@ -428,13 +469,17 @@ class RemoteDataset(ABC):
             for error in errors:
                 self.console.print(f"\t - {error}")
 
-            downloaded_file_count = len(
-                [
-                    f
-                    for f in self.local_images_path.rglob("*")
-                    if f.is_file() and not f.name.startswith(".")
-                ]
-            )
+            if incremental:
+                with PullManifest(self.local_images_path) as manifest:
+                    downloaded_file_count = manifest.count_downloaded()
+            else:
+                downloaded_file_count = len(
+                    [
+                        f
+                        for f in self.local_images_path.rglob("*")
+                        if f.is_file() and not f.name.startswith(".")
+                    ]
+                )
 
             console.print(
                 f"Total file count after download completed {str(downloaded_file_count)}."
@@ -166,6 +166,8 @@ class RemoteDatasetV2(RemoteDataset):
         preserve_folders: bool = False,
         progress_callback: Optional[ProgressCallback] = None,
         file_upload_callback: Optional[FileUploadCallback] = None,
+        resume: bool = False,
+        pipelined: bool = False,
     ) -> UploadHandler:
         """
         Uploads a local dataset (images ONLY) in the datasets directory.
@@ -197,6 +199,12 @@ class RemoteDatasetV2(RemoteDataset):
             Optional callback, called every time the progress of an uploading files is reported.
         file_upload_callback: Optional[FileUploadCallback], default: None
             Optional callback, called every time a file chunk is uploaded.
+        resume: bool, default: False
+            Records registered uploads in a journal in the local directory of the dataset, so that
+            a push interrupted before its uploads were confirmed resumes them when run again.
+        pipelined: bool, default: False
+            Registers, signs, uploads and confirms files in concurrent stages, so uploads start
+            as soon as the first files are registered. Only applies if ``blocking`` is True.
 
         Returns
         -------
@@ -256,7 +264,9 @@ class RemoteDatasetV2(RemoteDataset):
                 "No files to upload, check your path, exclusion filters and resume flag"
             )
 
-        handler = UploadHandlerV2(self, uploading_files)
+        handler = UploadHandlerV2(
+            self, uploading_files, resume=resume, pipelined=pipelined and blocking
+        )
         if blocking:
             handler.upload(
                 max_workers=max_workers,
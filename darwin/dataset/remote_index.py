@@ -0,0 +1,198 @@
+"""
+Holds the local index of the remote items of a dataset, used to resolve annotation files to items.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+REMOTE_INDEX_FILE_NAME: str = ".remote_items_index.sqlite"
+
+# Default number of seconds an indexed item is trusted before being fetched again
+DEFAULT_REMOTE_INDEX_TTL: int = 24 * 60 * 60
+
+# Version of the layout of the SQLite file, bumped to rebuild indexes written by older versions
+_SCHEMA_VERSION: str = "2"
+
+# Maximum number of parameters bound to a single SQLite query
+_QUERY_CHUNK_SIZE: int = 500
+
+
+class RemoteItemIndex:
+    """
+    SQLite backed map of the full paths of the items of a remote dataset to their id, slot names
+    and layout.
+
+    The index is only valid for the dataset it was built for: opening it for a different dataset
+    id clears it. Items indexed more than ``ttl`` seconds ago are stale: they are left out of
+    lookups, so that they are fetched and indexed again. Items can also be dropped explicitly with
+    ``remove``, e.g. once the API reports that they no longer exist, and deleting the SQLite file
+    clears the whole index.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite file.
+    dataset_id : int
+        Id of the remote dataset the index belongs to.
+    ttl : Optional[int], default: None
+        Number of seconds an indexed item is trusted. Defaults to the value of the
+        ``DARWIN_REMOTE_INDEX_TTL`` environment variable, or to a day.
+
+    Attributes
+    ----------
+    path : Path
+        Location of the SQLite file.
+    dataset_id : int
+        Id of the remote dataset the index belongs to.
+    ttl : int
+        Number of seconds an indexed item is trusted.
+    """
+
+    def __init__(self, path: Path, dataset_id: int, ttl: Optional[int] = None):
+        self.path: Path = path
+        self.dataset_id: int = dataset_id
+        self.ttl: int = _get_ttl() if ttl is None else ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection: sqlite3.Connection = sqlite3.connect(str(self.path))
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        meta = dict(self._connection.execute("SELECT key, value FROM meta"))
+        if meta.get("schema_version") != _SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS items")
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                (_SCHEMA_VERSION,),
+            )
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                full_path TEXT PRIMARY KEY,
+                item_id TEXT NOT NULL,
+                slot_names TEXT NOT NULL,
+                layout TEXT,
+                indexed_at REAL NOT NULL
+            )
+            """
+        )
+        if meta.get("dataset_id") != str(dataset_id):
+            self.clear()
+
+    def __enter__(self) -> "RemoteItemIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self._connection.commit()
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def clear(self) -> None:
+        """
+        Forgets every indexed item.
+        """
+        self._connection.execute("DELETE FROM items")
+        self._connection.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('dataset_id', ?)",
+            (str(self.dataset_id),),
+        )
+
+    def update(self, remote_files: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Adds the given items to the index, replacing any previous entry with the same full path.
+        They are trusted for ``ttl`` seconds from now.
+
+        Parameters
+        ----------
+        remote_files : Dict[str, Dict[str, Any]]
+            Map of full paths to dictionaries with the ``item_id``, ``slot_names`` and ``layout``
+            of each item.
+        """
+        now = time.time()
+        rows: Iterable[Tuple[str, str, str, str, float]] = (
+            (
+                full_path,
+                str(remote_file["item_id"]),
+                json.dumps(remote_file["slot_names"]),
+                json.dumps(remote_file["layout"]),
+                now,
+            )
+            for full_path, remote_file in remote_files.items()
+        )
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?)", rows
+        )
+
+    def remove(self, full_paths: List[str]) -> None:
+        """
+        Forgets the items with the given full paths, so that they are fetched again the next time
+        they are looked up.
+
+        Parameters
+        ----------
+        full_paths : List[str]
+            Full paths of the items to forget.
+        """
+        for i in range(0, len(full_paths), _QUERY_CHUNK_SIZE):
+            chunk = full_paths[i : i + _QUERY_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            self._connection.execute(
+                f"DELETE FROM items WHERE full_path IN ({placeholders})", chunk
+            )
+
+    def get(self, full_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the indexed items with the given full paths. Paths that are not indexed, or whose
+        item is stale, are left out of the result.
+
+        Parameters
+        ----------
+        full_paths : List[str]
+            Full paths of the items to look up.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            Map of full paths to dictionaries with the ``item_id``, ``slot_names`` and ``layout``
+            of each item.
+        """
+        remote_files: Dict[str, Dict[str, Any]] = {}
+        indexed_after = time.time() - self.ttl
+        for i in range(0, len(full_paths), _QUERY_CHUNK_SIZE):
+            chunk = full_paths[i : i + _QUERY_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._connection.execute(
+                f"SELECT full_path, item_id, slot_names, layout FROM items WHERE full_path IN ({placeholders}) AND indexed_at > ?",
+                [*chunk, indexed_after],
+            )
+            for full_path, item_id, slot_names, layout in rows:
+                remote_files[full_path] = {
+                    "item_id": item_id,
+                    "slot_names": json.loads(slot_names),
+                    "layout": json.loads(layout),
+                }
+        return remote_files
+
+
+def _get_ttl(default: int = DEFAULT_REMOTE_INDEX_TTL) -> int:
+    """
+    Returns the number of seconds an indexed item is trusted.
+
+    Can be overridden with the ``DARWIN_REMOTE_INDEX_TTL`` environment variable.
+    """
+    env_ttl: Optional[str] = os.getenv("DARWIN_REMOTE_INDEX_TTL")
+    if env_ttl and int(env_ttl) >= 0:
+        return int(env_ttl)
+    return default
@@ -0,0 +1,213 @@
+"""
+Packs the images and annotations of a pulled release into a few large tar shards, so that they
+can be read sequentially during training instead of as millions of small files.
+
+Shards follow the WebDataset layout: every sample is a run of consecutive members sharing the
+same key, here ``{key}.{image extension}`` with the bytes of the image and ``{key}.json`` with its
+Darwin JSON annotation, minified.
+"""
+
+import io
+import os
+import random
+import tarfile
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson as json
+
+from darwin.dataset.local_dataset import get_annotation_filepaths
+from darwin.dataset.utils import _map_annotations_to_images, get_release_path
+from darwin.datatypes import PathLike
+from darwin.utils import SUPPORTED_VIDEO_EXTENSIONS, attempt_decode
+
+# Directory, inside a release, where its shards are written by default
+SHARDS_DIR_NAME: str = "shards"
+
+# File, next to the shards, listing them with their number of samples and size
+SHARDS_INDEX_FILE_NAME: str = "index.json"
+
+# Size shards are filled up to, unless a single sample is bigger
+DEFAULT_SHARD_SIZE: int = 256 * 1024 * 1024
+
+
+def pack_dataset(
+    dataset_path: PathLike,
+    release_name: Optional[str] = None,
+    output_dir: Optional[PathLike] = None,
+    partition: Optional[str] = None,
+    split: str = "default",
+    split_type: str = "random",
+    annotation_type: str = "polygon",
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    seed: Optional[int] = 0,
+) -> List[Path]:
+    """
+    Writes the images and annotations of a pulled release into tar shards of about
+    ``shard_size`` bytes each.
+
+    Parameters
+    ----------
+    dataset_path : PathLike
+        Path to the location of the dataset on the file system.
+    release_name : Optional[str], default: None
+        Version of the dataset.
+    output_dir : Optional[PathLike], default: None
+        Where to write the shards. Defaults to a directory named after the split and the partition,
+        or ``all``, inside the ``shards`` directory of the release.
+    partition : Optional[str], default: None
+        Selects one of the partitions ``["train", "val", "test"]``. If ``None``, every annotated
+        image of the release is packed.
+    split : str, default: "default"
+        Selects the split that defines the percentages used.
+    split_type : str, default: "random"
+        Heuristic used to do the split ``["random", "stratified"]``.
+    annotation_type : str, default: "polygon"
+        The type of annotation the split was stratified on, for ``stratified`` splits.
+    shard_size : int, default: DEFAULT_SHARD_SIZE
+        Size, in bytes, after which a new shard is started.
+    seed : Optional[int], default: 0
+        Seed of the shuffle of the samples before they are packed, so that every shard holds a
+        random mix of them. If ``None``, they keep the order of the release.
+
+    Returns
+    -------
+    List[Path]
+        The paths of the written shards.
+
+    Raises
+    ------
+    ValueError
+        If ``shard_size`` is not positive or if there is nothing to pack.
+    """
+    if shard_size <= 0:
+        raise ValueError(f"shard_size must be positive, got {shard_size}")
+
+    dataset_path = Path(dataset_path)
+    release_path = get_release_path(dataset_path, release_name)
+    annotations_dir = release_path / "annotations"
+    images_dir = dataset_path / "images"
+    if output_dir is None:
+        name = f"{split}_{split_type}_{partition}" if partition else "all"
+        output_dir = release_path / SHARDS_DIR_NAME / name
+    output_dir = Path(output_dir)
+
+    annotation_filepaths = get_annotation_filepaths(
+        release_path, annotations_dir, annotation_type, split, partition, split_type
+    )
+    images_paths, annotations_paths, _ = _map_annotations_to_images(
+        annotation_filepaths, images_dir, ignore_inconsistent_examples=True
+    )
+    samples = [
+        (image_path, annotation_path)
+        for image_path, annotation_path in zip(images_paths, annotations_paths)
+        if image_path.suffix.lower() not in SUPPORTED_VIDEO_EXTENSIONS
+    ]
+    if not samples:
+        raise ValueError(f"Could not find any image to pack in {images_dir}")
+    if seed is not None:
+        random.Random(seed).shuffle(samples)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stale_shard in output_dir.glob("shard-*.tar"):
+        stale_shard.unlink()
+
+    shards: List[Dict[str, Any]] = []
+    writer: Optional[_ShardWriter] = None
+    for key, (image_path, annotation_path) in enumerate(samples):
+        record = json.dumps(attempt_decode(annotation_path))
+        sample_size = image_path.stat().st_size + len(record)
+        if writer is None or (
+            writer.size > 0 and writer.size + sample_size > shard_size
+        ):
+            if writer is not None:
+                shards.append(writer.close())
+            writer = _ShardWriter(output_dir / f"shard-{len(shards):06d}.tar")
+        writer.add(f"{key:09d}", image_path, record)
+    shards.append(writer.close())
+
+    index = {"shards": shards, "samples": len(samples)}
+    (output_dir / SHARDS_INDEX_FILE_NAME).write_bytes(
+        json.dumps(index, option=json.OPT_INDENT_2)
+    )
+    return [output_dir / shard["name"] for shard in shards]
+
+
+def iterate_shard(path: PathLike) -> Iterator[Tuple[str, Dict[str, bytes]]]:
+    """
+    Reads a shard sequentially and yields its samples.
+
+    Parameters
+    ----------
+    path : PathLike
+        Path to the shard.
+
+    Returns
+    -------
+    Iterator[Tuple[str, Dict[str, bytes]]]
+        The key of each sample, and the content of each of its members by extension (e.g.
+        ``{"jpg": b"...", "json": b"..."}``).
+    """
+    key: Optional[str] = None
+    members: Dict[str, bytes] = {}
+    with tarfile.open(path, mode="r|") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            member_key, _, extension = member.name.partition(".")
+            if member_key != key:
+                if key is not None:
+                    yield key, members
+                key, members = member_key, {}
+            members[extension] = tar.extractfile(member).read()
+    if key is not None:
+        yield key, members
+
+
+def read_shards_index(shards_dir: PathLike) -> Dict[str, Any]:
+    """
+    Returns the index written by ``pack_dataset`` next to its shards.
+
+    Parameters
+    ----------
+    shards_dir : PathLike
+        Directory holding the shards.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The ``name``, number of ``samples`` and ``size`` of each of the ``shards``, and the total
+        number of ``samples``.
+    """
+    return json.loads((Path(shards_dir) / SHARDS_INDEX_FILE_NAME).read_bytes())
+
+
+class _ShardWriter:
+    # Writes a shard under a temporary name and renames it once it is complete
+    def __init__(self, path: Path):
+        self.path: Path = path
+        self.size: int = 0
+        self.samples: int = 0
+        self._tmp_path: Path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        self._tar: tarfile.TarFile = tarfile.open(self._tmp_path, mode="w")
+
+    def add(self, key: str, image_path: Path, record: bytes) -> None:
+        with image_path.open("rb") as image:
+            self._add_member(
+                f"{key}{image_path.suffix.lower()}", image, image_path.stat().st_size
+            )
+        self._add_member(f"{key}.json", io.BytesIO(record), len(record))
+        self.samples += 1
+
+    def close(self) -> Dict[str, Any]:
+        self._tar.close()
+        os.replace(self._tmp_path, self.path)
+        return {"name": self.path.name, "samples": self.samples, "size": self.size}
+
+    def _add_member(self, name: str, content: IO[bytes], size: int) -> None:
+        # Fixed metadata keeps shards identical between runs
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mode = 0o444
+        self._tar.addfile(info, content)
+        self.size += size
@@ -1,14 +1,17 @@
 import math
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import numpy as np
 
-from darwin.dataset.utils import extract_classes, get_release_path
+from darwin.dataset.utils import extract_classes_by_type, get_release_path
 from darwin.datatypes import PathLike
 from darwin.utils import get_annotation_files_from_dir
 
+#: Algorithms available to split a dataset with the stratified strategy.
+STRATIFIED_STRATEGIES: List[str] = ["sklearn", "iterative"]
+
 
 @dataclass
 class Split:
@@ -79,6 +82,7 @@ def split_dataset(
     split_seed: int = 0,
     make_default_split: bool = True,
     stratified_types: List[str] = ["bounding_box", "polygon", "tag"],
+    strategy: str = "sklearn",
 ) -> Path:
     """
     Given a local a dataset (pulled from Darwin), split it by creating lists of filenames.
@@ -105,6 +109,11 @@ def split_dataset(
         Makes this split the default split.
     stratified_types : List[str], default: ["bounding_box", "polygon", "tag"]
         List of annotation types to split with the stratified strategy.
+    strategy : str, default: "sklearn"
+        Algorithm of the stratified split, one of ``STRATIFIED_STRATEGIES``. ``"sklearn"`` splits
+        one entry per image and label with scikit-learn, while ``"iterative"`` assigns whole
+        images, rarest labels first, following the iterative stratification of Sechidis et al.
+        and does not require scikit-learn.
 
     Returns
     -------
@@ -114,15 +123,23 @@ def split_dataset(
     Raises
     ------
     ImportError
-        If ``sklearn`` is not installed.
+        If ``sklearn`` is not installed and the ``"sklearn"`` strategy is used.
+    ValueError
+        If the percentages or the strategy are not valid.
     """
+    if strategy not in STRATIFIED_STRATEGIES:
+        raise ValueError(
+            f"Invalid stratified split strategy ({strategy}). Must be one of {', '.join(STRATIFIED_STRATEGIES)}."
+        )
+
     # Requirements: scikit-learn
-    try:
-        import sklearn  # noqa
-    except ImportError:
-        raise ImportError(
-            "Darwin requires scikit-learn to split a dataset. Install it using: pip install scikit-learn"
-        ) from None
+    if strategy == "sklearn":
+        try:
+            import sklearn  # noqa
+        except ImportError:
+            raise ImportError(
+                "Darwin requires scikit-learn to split a dataset. Install it using: pip install scikit-learn"
+            ) from None
 
     _validate_split(val_percentage, test_percentage)
 
@@ -182,6 +199,7 @@ def split_dataset(
             test_size=test_size,
             stratified_types=stratified_types,
             split_seed=split_seed,
+            strategy=strategy,
         )
 
     # Create symlink for default split
@@ -224,21 +242,33 @@ def _stratified_split(
     test_size: int,
     stratified_types: List[str],
     split_seed: int,
+    strategy: str = "sklearn",
 ) -> None:
     if len(stratified_types) == 0:
         return
 
-    for stratified_type in stratified_types:
-        if stratified_type == "bounding_box":
-            class_annotation_types = [stratified_type, "polygon"]
-        else:
-            class_annotation_types = stratified_type
+    # Bounding boxes are also derived from polygons
+    class_annotation_types: Dict[str, Union[str, List[str]]] = {
+        stratified_type: (
+            [stratified_type, "polygon"]
+            if stratified_type == "bounding_box"
+            else stratified_type
+        )
+        for stratified_type in stratified_types
+    }
+    class_indexes = extract_classes_by_type(annotation_path, class_annotation_types)
 
-        _, idx_to_classes = extract_classes(annotation_path, class_annotation_types)
+    for stratified_type in stratified_types:
+        _, idx_to_classes = class_indexes[stratified_type]
         if len(idx_to_classes) == 0:
             continue
 
-        train_indices, val_indices, test_indices = _stratify_samples(
+        stratify = (
+            _stratify_samples_iteratively
+            if strategy == "iterative"
+            else _stratify_samples
+        )
+        train_indices, val_indices, test_indices = stratify(
             idx_to_classes=idx_to_classes,
             split_seed=split_seed,
             train_size=train_size,
@@ -246,7 +276,7 @@ def _stratified_split(
             test_size=test_size,
         )
 
-        stratified_indices = train_indices + val_indices + test_indices
+        stratified_indices = set(train_indices + val_indices + test_indices)
         for idx in range(train_size + val_size + test_size):
             if idx in stratified_indices:
                 continue
@@ -315,13 +345,15 @@ def _stratify_samples(
     file_indices, labels = zip(*expanded_list)
     file_indices, labels = np.array(file_indices), np.array(labels)
     # Extract entries whose support set is 1 (it would make sklearn crash) and append the to train later
-    unique_labels, count = np.unique(labels, return_counts=True)
-    single_files = []
-    for label in unique_labels[count == 1]:
-        index = np.where(labels == label)[0][0]
-        single_files.append(file_indices[index])
-        labels = np.delete(labels, index)
-        file_indices = np.delete(file_indices, index)
+    unique_labels, inverse, count = np.unique(
+        labels, return_inverse=True, return_counts=True
+    )
+    is_single = count[inverse] == 1
+    single_files = list(
+        file_indices[is_single][np.argsort(inverse[is_single], kind="stable")]
+    )
+    labels = labels[~is_single]
+    file_indices = file_indices[~is_single]
     # If file_indices or labels are empty, the following train_test_split will crash (empty train set)
     if len(file_indices) == 0 or len(labels) == 0:
         return [], [], []
@@ -362,6 +394,119 @@ def _stratify_samples(
     )
 
 
+def _stratify_samples_iteratively(
+    idx_to_classes: Dict[int, Set[str]],
+    split_seed: int,
+    train_size: int,
+    val_size: int,
+    test_size: int,
+) -> Tuple[List[int], List[int], List[int]]:
+    """Splits the list of indices into train, val and test according to their labels, with the
+    iterative stratification of Sechidis et al. (2011).
+
+    Labels are visited from the one with the fewest unassigned images to the most common one. The
+    unassigned images of each label are shuffled and handed out to the partitions that still
+    need the most of that label, and the needs of every label of those images are updated at
+    once. Every image ends up in exactly one partition, so no cross contamination can happen, and
+    labels with a single image need no special handling.
+
+    Parameters
+    ----------
+    idx_to_classes: dict
+    Dictionary where keys are image indices and values are all classes
+    contained in that image
+    split_seed : int
+        Seed for the randomness
+    train_size : int
+        Number of training images
+    val_size : int
+        Number of validation images
+    test_size : int
+        Number of test images
+
+    Returns
+    -------
+    X_train, X_val, X_test : list
+        List of indices of the images for each split
+    """
+    file_indices = np.array(sorted(idx_to_classes), dtype=np.int64)
+    class_names = sorted({c for classes in idx_to_classes.values() for c in classes})
+    if len(file_indices) == 0 or len(class_names) == 0:
+        return [], [], []
+
+    # Sparse indicator matrix, both by image (CSR) and by label (CSC)
+    class_ids = {name: i for i, name in enumerate(class_names)}
+    rows = [sorted(class_ids[c] for c in idx_to_classes[i]) for i in file_indices]
+    row_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    row_offsets[1:] = np.cumsum([len(row) for row in rows])
+    row_labels = np.fromiter(
+        (label for row in rows for label in row), dtype=np.int64, count=row_offsets[-1]
+    )
+    row_samples = np.repeat(np.arange(len(rows)), np.diff(row_offsets))
+    by_label = np.argsort(row_labels, kind="stable")
+    column_samples = row_samples[by_label]
+    column_offsets = np.zeros(len(class_names) + 1, dtype=np.int64)
+    column_offsets[1:] = np.cumsum(np.bincount(row_labels, minlength=len(class_names)))
+
+    sizes = np.array([train_size, val_size, test_size], dtype=np.float64)
+    ratios = sizes / sizes.sum()
+    remaining = np.diff(column_offsets)
+    desired = remaining[:, None] * ratios[None, :]
+    assignment = np.full(len(rows), -1, dtype=np.int64)
+    rng = np.random.default_rng(split_seed)
+
+    while True:
+        label = int(
+            np.argmin(np.where(remaining > 0, remaining, np.iinfo(np.int64).max))
+        )
+        if remaining[label] <= 0:
+            break
+
+        samples = column_samples[column_offsets[label] : column_offsets[label + 1]]
+        samples = rng.permutation(samples[assignment[samples] < 0])
+        counts = _water_fill(desired[label], len(samples))
+        partitions = np.repeat(np.arange(len(counts)), counts)
+        assignment[samples] = partitions
+
+        # Update the needs of every label of the newly assigned images
+        starts, ends = row_offsets[samples], row_offsets[samples + 1]
+        lengths = ends - starts
+        flat = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(
+            lengths.sum()
+        )
+        labels = row_labels[flat]
+        remaining -= np.bincount(labels, minlength=len(class_names))
+        desired -= np.bincount(
+            labels * len(counts) + np.repeat(partitions, lengths),
+            minlength=desired.size,
+        ).reshape(desired.shape)
+
+    return tuple(
+        file_indices[assignment == partition].tolist() for partition in range(3)
+    )
+
+
+def _water_fill(desired: np.ndarray, count: int) -> np.ndarray:
+    """
+    Returns how many of ``count`` items each partition gets when the items are handed out one by
+    one to the partition with the highest desired count, which decreases by one at each item.
+    Ties go to the first partition.
+    """
+    order = np.argsort(-desired, kind="stable")
+    levels = desired[order]
+    # Find the common level t the top k partitions are filled down to
+    for k in range(1, len(levels) + 1):
+        level = (levels[:k].sum() - count) / k
+        if k == len(levels) or level >= levels[k]:
+            break
+
+    counts = np.floor(np.maximum(0, desired - level)).astype(np.int64)
+    # Hand out what rounding left, highest residual first
+    for _ in range(count - counts.sum()):
+        counts[np.argmax(desired - counts)] += 1
+    return counts
+
+
 def _remove_cross_contamination(
     X_a: np.ndarray,
     X_b: np.ndarray,
@@ -393,22 +538,19 @@ def _remove_cross_contamination(
     X_a, X_b, y_a, y_b : ndarray
         All input parameters filtered by removing cross contamination across A and B
     """
-    for a in _unique(X_a):
-        # If a not in X_b, don't remove a from anywhere
-        if a not in X_b:
-            continue
-
-        # Remove a from X_b if it's large enough
-        keep_locations = X_b != a
-        if len(_unique(X_b[keep_locations])) >= b_min_size:
-            X_b = X_b[keep_locations]
-            y_b = y_b[keep_locations]
-            continue
-
-        # Remove from X_a otherwise
-        keep_locations = X_a != a
-        X_a = X_a[keep_locations]
-        y_a = y_a[keep_locations]
+    # Shared elements are removed from X_b, in order of occurrence in X_a, as long as X_b keeps
+    # at least b_min_size unique elements, and from X_a afterwards
+    unique_a = _unique(X_a)
+    shared = unique_a[np.isin(unique_a, X_b)]
+    removable_from_b = max(0, len(np.unique(X_b)) - b_min_size)
+
+    keep_locations = ~np.isin(X_b, shared[:removable_from_b])
+    X_b = X_b[keep_locations]
+    y_b = y_b[keep_locations]
+
+    keep_locations = ~np.isin(X_a, shared[removable_from_b:])
+    X_a = X_a[keep_locations]
+    y_a = y_a[keep_locations]
 
     return X_a, X_b, y_a, y_b
 
@@ -1,5 +1,8 @@
 import concurrent.futures
 import os
+import queue
+import sqlite3
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -246,6 +249,137 @@ class FileMonitor(object):
         return data
 
 
+class UploadJournal:
+    """
+    SQLite backed record of the uploads registered by ``UploadHandlerV2`` that were not confirmed
+    yet, so an interrupted push can resume them instead of registering the files again.
+
+    An entry is only reused while the local file keeps the size and modification time it had when
+    it was registered.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite file.
+
+    Attributes
+    ----------
+    path : Path
+        Location of the SQLite file.
+    """
+
+    def __init__(self, path: Path):
+        self.path: Path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock: threading.Lock = threading.Lock()
+        # Uploads are confirmed from the worker threads of ``UploadHandler.upload``
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            str(path), check_same_thread=False
+        )
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                full_path TEXT PRIMARY KEY,
+                local_path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                dataset_item_id TEXT,
+                upload_id TEXT NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+    def get(self, file: "LocalFile") -> Optional[ItemPayload]:
+        """
+        Returns the registered but unconfirmed upload of the given file, if any.
+
+        Parameters
+        ----------
+        file : LocalFile
+            The file to look for.
+
+        Returns
+        -------
+        Optional[ItemPayload]
+            The pending item of the upload, or ``None`` if the file has no pending upload or
+            changed since it was registered.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT local_path, size, mtime_ns, dataset_item_id, upload_id FROM uploads WHERE full_path = ?",
+                (file.full_path,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        local_path, size, mtime_ns, dataset_item_id, upload_id = row
+        try:
+            stat = file.local_path.stat()
+        except FileNotFoundError:
+            return None
+        if (
+            local_path != str(file.local_path.resolve())
+            or size != stat.st_size
+            or mtime_ns != stat.st_mtime_ns
+        ):
+            return None
+
+        return ItemPayload(
+            dataset_item_id=dataset_item_id,
+            filename=file.data["filename"],
+            path=file.data["path"],
+            slots=[
+                {
+                    "file_name": file.data["filename"],
+                    "slot_name": "0",
+                    "upload_id": upload_id,
+                }
+            ],
+        )
+
+    def add(self, file: "LocalFile", item: ItemPayload) -> None:
+        """
+        Records the upload registered for the given file.
+
+        Parameters
+        ----------
+        file : LocalFile
+            The registered file.
+        item : ItemPayload
+            The pending item returned by the registration.
+        """
+        stat = file.local_path.stat()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    file.full_path,
+                    str(file.local_path.resolve()),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    item.dataset_item_id,
+                    item.slots[0]["upload_id"],
+                ),
+            )
+            self._connection.commit()
+
+    def remove(self, upload_id: str) -> None:
+        """
+        Forgets an upload once it has been confirmed.
+
+        Parameters
+        ----------
+        upload_id : str
+            Id of the confirmed upload.
+        """
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM uploads WHERE upload_id = ?", (upload_id,)
+            )
+            self._connection.commit()
+
+
 ByteReadCallback = Callable[[Optional[str], float, float], None]
 ProgressCallback = Callable[[int, float], None]
 FileUploadCallback = Callable[[str, int, int], None]
@@ -344,28 +478,10 @@ class UploadHandler(ABC):
         if progress_callback:
             progress_callback(self.pending_count, 0)
 
-        # needed to ensure that we don't mark a file as completed twice
-        file_complete: Set[str] = set()
-
-        def callback(file_name, file_total_bytes, file_bytes_sent):
-            if file_upload_callback:
-                file_upload_callback(file_name, file_total_bytes, file_bytes_sent)
-
-            if progress_callback:
-                if (
-                    file_total_bytes == file_bytes_sent
-                    and file_name not in file_complete
-                ):
-                    file_complete.add(file_name)
-                    progress_callback(self.pending_count, 1)
-
-        if max_workers:
-            if max_workers < 1:
-                raise ValueError("max_workers must be greater than 0")
-            elif max_workers > concurrent.futures.ThreadPoolExecutor()._max_workers:
-                raise ValueError(
-                    f"max_workers must be less than or equal to {concurrent.futures.ThreadPoolExecutor()._max_workers}"
-                )
+        callback = self._build_byte_read_callback(
+            progress_callback, file_upload_callback
+        )
+        _validate_max_workers(max_workers)
 
         if multi_threaded and self.progress:
             with concurrent.futures.ThreadPoolExecutor(
@@ -383,6 +499,28 @@ class UploadHandler(ABC):
             for file_to_upload in self.progress:
                 file_to_upload(callback)
 
+    def _build_byte_read_callback(
+        self,
+        progress_callback: Optional[ProgressCallback],
+        file_upload_callback: Optional[FileUploadCallback],
+    ) -> ByteReadCallback:
+        # needed to ensure that we don't mark a file as completed twice
+        file_complete: Set[str] = set()
+
+        def callback(file_name, file_total_bytes, file_bytes_sent):
+            if file_upload_callback:
+                file_upload_callback(file_name, file_total_bytes, file_bytes_sent)
+
+            if progress_callback:
+                if (
+                    file_total_bytes == file_bytes_sent
+                    and file_name not in file_complete
+                ):
+                    file_complete.add(file_name)
+                    progress_callback(self.pending_count, 1)
+
+        return callback
+
     @abstractmethod
     def _request_upload(self) -> Tuple[List[ItemPayload], List[ItemPayload]]:
         pass
@@ -402,14 +540,110 @@ class UploadHandler(ABC):
 
 
 class UploadHandlerV2(UploadHandler):
-    def __init__(self, dataset: "RemoteDataset", local_files: List[LocalFile]):
+    """
+    ``UploadHandler`` for the V2 items API.
+
+    Parameters
+    ----------
+    dataset: RemoteDataset
+        Target ``RemoteDataset`` where we want to upload our files to.
+    local_files : List[LocalFile]
+        List of ``LocalFile``\\s to be uploaded.
+    resume : bool, default: False
+        Records registered uploads in an ``UploadJournal`` in the local directory of the dataset,
+        and resumes the uploads a previous, interrupted push registered but did not confirm.
+    pipelined : bool, default: False
+        Registers the files while uploading them, instead of registering all of them when the
+        handler is created. ``upload`` then runs registration, signing, byte transfer and
+        confirmation as concurrent stages connected by bounded queues, so the first bytes are
+        sent as soon as the first batch of files is registered.
+    """
+
+    def __init__(
+        self,
+        dataset: "RemoteDataset",
+        local_files: List[LocalFile],
+        resume: bool = False,
+        pipelined: bool = False,
+    ):
+        self.journal: Optional[UploadJournal] = (
+            UploadJournal(dataset.local_path / UPLOAD_JOURNAL_FILE_NAME)
+            if resume
+            else None
+        )
+        self.pipelined: bool = pipelined
+        self._registered: bool = False
+        self._file_lookup: Dict[str, LocalFile] = {
+            file.full_path: file for file in local_files
+        }
         super().__init__(dataset=dataset, local_files=local_files)
 
+    def upload(
+        self,
+        multi_threaded: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+        file_upload_callback: Optional[FileUploadCallback] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if not self.pipelined or self._registered:
+            super().upload(
+                multi_threaded=multi_threaded,
+                progress_callback=progress_callback,
+                file_upload_callback=file_upload_callback,
+                max_workers=max_workers,
+            )
+            return
+
+        _validate_max_workers(max_workers)
+        if progress_callback:
+            progress_callback(self.pending_count, 0)
+
+        callback = self._build_byte_read_callback(
+            progress_callback, file_upload_callback
+        )
+        if multi_threaded:
+            transfer_workers = (
+                max_workers or concurrent.futures.ThreadPoolExecutor()._max_workers
+            )
+            api_workers = DEFAULT_PIPELINE_API_WORKERS
+        else:
+            transfer_workers = api_workers = 1
+        self._run_pipeline(callback, api_workers, transfer_workers)
+
     def _request_upload(self) -> Tuple[List[ItemPayload], List[ItemPayload]]:
-        blocked_items = []
-        items = []
+        blocked_items: List[ItemPayload] = []
+        items: List[ItemPayload] = []
+        if self.pipelined:
+            # Files are registered by the first stage of the upload pipeline instead
+            return blocked_items, items
+
+        for registered_blocked_items, registered_items in self._register_files():
+            blocked_items.extend(registered_blocked_items)
+            items.extend(registered_items)
+        self._registered = True
+        return blocked_items, items
+
+    def _register_files(
+        self,
+    ) -> Iterator[Tuple[List[ItemPayload], List[ItemPayload]]]:
+        """
+        Registers the files to upload in chunks of ``_upload_chunk_size()`` files, yielding the
+        blocked and pending items of every chunk as soon as it is registered.
+        """
+        files_to_register = []
+        resumed_items = []
+        for file in self.local_files:
+            resumed_item = self.journal.get(file) if self.journal else None
+            if resumed_item:
+                resumed_items.append(resumed_item)
+            else:
+                files_to_register.append(file)
+        if resumed_items:
+            yield [], resumed_items
+
+        file_lookup = {file.full_path: file for file in files_to_register}
         chunk_size: int = _upload_chunk_size()
-        for file_chunk in chunk(self.local_files, chunk_size):
+        for file_chunk in chunk(files_to_register, chunk_size):
             upload_payload = {"items": [file.serialize_v2() for file in file_chunk]}
             dataset_slug: str = self.dataset_identifier.dataset_slug
             team_slug: Optional[str] = self.dataset_identifier.team_slug
@@ -418,11 +652,15 @@ class UploadHandlerV2(UploadHandler):
                 dataset_slug, upload_payload, team_slug=team_slug
             )
 
-            blocked_items.extend(
-                [ItemPayload.parse_v2(item) for item in data["blocked_items"]]
-            )
-            items.extend([ItemPayload.parse_v2(item) for item in data["items"]])
-        return blocked_items, items
+            blocked_items = [
+                ItemPayload.parse_v2(item) for item in data["blocked_items"]
+            ]
+            registered_items = [ItemPayload.parse_v2(item) for item in data["items"]]
+            if self.journal:
+                for item in registered_items:
+                    if item.full_path in file_lookup:
+                        self.journal.add(file_lookup[item.full_path], item)
+            yield blocked_items, registered_items
 
     def _upload_files(self) -> Iterator[Callable[[Optional[ByteReadCallback]], None]]:
         def upload_function(
@@ -432,20 +670,134 @@ class UploadHandlerV2(UploadHandler):
                 dataset_slug, local_path, upload_id, byte_read_callback
             )
 
-        file_lookup = {file.full_path: file for file in self.local_files}
+        if not self._registered:
+            for blocked_items, items in self._register_files():
+                self.blocked_items.extend(blocked_items)
+                self.pending_items.extend(items)
+            self._registered = True
+
         for item in self.pending_items:
-            if len(item.slots) != 1:
-                raise NotImplementedError("Multi file upload is not supported")
-            upload_id = item.slots[0]["upload_id"]
-            file = file_lookup.get(item.full_path)
-            if not file:
-                raise ValueError(
-                    f"Cannot match {item.full_path} from payload with files to upload"
-                )
             yield upload_function(
-                self.dataset.identifier.dataset_slug, file.local_path, upload_id
+                self.dataset.identifier.dataset_slug,
+                self._get_local_path(item),
+                item.slots[0]["upload_id"],
             )
 
+    def _get_local_path(self, item: ItemPayload) -> Path:
+        if len(item.slots) != 1:
+            raise NotImplementedError("Multi file upload is not supported")
+        file = self._file_lookup.get(item.full_path)
+        if not file:
+            raise ValueError(
+                f"Cannot match {item.full_path} from payload with files to upload"
+            )
+        return file.local_path
+
+    def _run_pipeline(
+        self, callback: ByteReadCallback, api_workers: int, transfer_workers: int
+    ) -> None:
+        """
+        Uploads the files through four stages running concurrently: registration, signing,
+        byte transfer and confirmation. Each stage has its own threads and hands items over to
+        the next one through a queue of at most ``PIPELINE_QUEUE_SIZE`` items, so a slow stage
+        holds back the ones before it instead of buffering the whole push in memory.
+
+        Errors of the signing, transfer and confirmation stages are recorded in ``self.errors``,
+        errors registering files are raised once the files registered so far are uploaded.
+        """
+        dataset_slug: str = self.dataset_identifier.dataset_slug
+        stages: List[Tuple[Callable[[Any], Any], int]] = [
+            (lambda item: self._sign_stage(dataset_slug, item), api_workers),
+            (lambda signed: self._transfer_stage(signed, callback), transfer_workers),
+            (lambda uploaded: self._confirm_stage(dataset_slug, uploaded), api_workers),
+        ]
+        queues: List["queue.Queue[Any]"] = [
+            queue.Queue(maxsize=PIPELINE_QUEUE_SIZE) for _ in stages
+        ]
+        registration_errors: List[Exception] = []
+
+        def register() -> None:
+            try:
+                for blocked_items, items in self._register_files():
+                    self.blocked_items.extend(blocked_items)
+                    self.pending_items.extend(items)
+                    for item in items:
+                        queues[0].put(item)
+            except Exception as e:
+                registration_errors.append(e)
+
+        def work(index: int) -> None:
+            function = stages[index][0]
+            while True:
+                received = queues[index].get()
+                if received is _END_OF_STAGE:
+                    return
+                try:
+                    result = function(received)
+                except UploadRequestError as e:
+                    self.errors.append(e)
+                    continue
+                except Exception as e:
+                    # Every stage receives its item first, possibly followed by stage data
+                    item = (
+                        received if isinstance(received, ItemPayload) else received[0]
+                    )
+                    self.errors.append(
+                        UploadRequestError(
+                            file_path=Path(item.full_path),
+                            stage=UploadStage.OTHER,
+                            error=e,
+                        )
+                    )
+                    continue
+                if index + 1 < len(stages):
+                    queues[index + 1].put(result)
+
+        registration = threading.Thread(target=register, daemon=True)
+        registration.start()
+        workers = [
+            [
+                threading.Thread(target=work, args=(index,), daemon=True)
+                for _ in range(concurrency)
+            ]
+            for index, (_, concurrency) in enumerate(stages)
+        ]
+        for stage_workers in workers:
+            for worker in stage_workers:
+                worker.start()
+
+        # A stage ends once every worker of the stage before it has finished
+        registration.join()
+        for index, stage_workers in enumerate(workers):
+            for _ in stage_workers:
+                queues[index].put(_END_OF_STAGE)
+            for worker in stage_workers:
+                worker.join()
+
+        self._registered = True
+        if registration_errors:
+            raise registration_errors[0]
+
+    def _sign_stage(
+        self, dataset_slug: str, item: ItemPayload
+    ) -> Tuple[ItemPayload, Path, str]:
+        file_path = self._get_local_path(item)
+        upload_id = item.slots[0]["upload_id"]
+        return item, file_path, self._sign_upload(dataset_slug, file_path, upload_id)
+
+    def _transfer_stage(
+        self, signed: Tuple[ItemPayload, Path, str], callback: ByteReadCallback
+    ) -> Tuple[ItemPayload, Path]:
+        item, file_path, upload_url = signed
+        self._transfer_file(file_path, upload_url, callback)
+        return item, file_path
+
+    def _confirm_stage(
+        self, dataset_slug: str, uploaded: Tuple[ItemPayload, Path]
+    ) -> None:
+        item, file_path = uploaded
+        self._confirm_upload(dataset_slug, file_path, item.slots[0]["upload_id"])
+
     def _upload_file(
         self,
         dataset_slug: str,
@@ -471,19 +823,28 @@ class UploadHandlerV2(UploadHandler):
         upload_id: str,
         byte_read_callback: Optional[ByteReadCallback] = None,
     ) -> None:
-        team_slug: Optional[str] = self.dataset_identifier.team_slug
+        upload_url = self._sign_upload(dataset_slug, file_path, upload_id)
+        self._transfer_file(file_path, upload_url, byte_read_callback)
+        self._confirm_upload(dataset_slug, file_path, upload_id)
 
+    def _sign_upload(self, dataset_slug: str, file_path: Path, upload_id: str) -> str:
+        team_slug: Optional[str] = self.dataset_identifier.team_slug
         try:
             sign_response: Dict[str, Any] = self.client.api_v2.sign_upload(
                 dataset_slug, upload_id, team_slug=team_slug
             )
+            return sign_response["upload_url"]
         except Exception as e:
             raise UploadRequestError(
                 file_path=file_path, stage=UploadStage.REQUEST_SIGNATURE, error=e
             )
 
-        upload_url = sign_response["upload_url"]
-
+    def _transfer_file(
+        self,
+        file_path: Path,
+        upload_url: str,
+        byte_read_callback: Optional[ByteReadCallback] = None,
+    ) -> None:
         try:
             file_size = file_path.stat().st_size
             if byte_read_callback:
@@ -493,18 +854,29 @@ class UploadHandlerV2(UploadHandler):
                 if byte_read_callback:
                     byte_read_callback(str(file_path), file_size, monitor.bytes_read)
 
-            with file_path.open("rb") as m:
-                monitor = FileMonitor(m, file_size, callback)
-
-                retries = 0
-                while retries < 5:
-                    upload_response = requests.put(f"{upload_url}", data=monitor)
+            retries = 0
+            while True:
+                # Every attempt streams the file again from its first byte
+                try:
+                    with file_path.open("rb") as m:
+                        monitor = FileMonitor(m, file_size, callback)
+                        upload_response = requests.put(f"{upload_url}", data=monitor)
+                except (
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError,
+                ):
+                    if retries >= MAX_UPLOAD_RETRIES - 1:
+                        raise
+                else:
                     # If s3 is getting to many request it will return 503, we will sleep and retry
-                    if upload_response.status_code != 503:
+                    if (
+                        upload_response.status_code != 503
+                        or retries >= MAX_UPLOAD_RETRIES - 1
+                    ):
                         break
 
-                    time.sleep(2**retries)
-                    retries += 1
+                time.sleep(2**retries)
+                retries += 1
 
             upload_response.raise_for_status()
         except Exception as e:
@@ -512,6 +884,10 @@ class UploadHandlerV2(UploadHandler):
                 file_path=file_path, stage=UploadStage.UPLOAD_TO_S3, error=e
             )
 
+    def _confirm_upload(
+        self, dataset_slug: str, file_path: Path, upload_id: str
+    ) -> None:
+        team_slug: Optional[str] = self.dataset_identifier.team_slug
         try:
             self.client.api_v2.confirm_upload(
                 dataset_slug, upload_id, team_slug=team_slug
@@ -521,8 +897,28 @@ class UploadHandlerV2(UploadHandler):
                 file_path=file_path, stage=UploadStage.CONFIRM_UPLOAD_COMPLETE, error=e
             )
 
+        if self.journal:
+            self.journal.remove(upload_id)
+
+
+def _validate_max_workers(max_workers: Optional[int]) -> None:
+    if max_workers:
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+        elif max_workers > concurrent.futures.ThreadPoolExecutor()._max_workers:
+            raise ValueError(
+                f"max_workers must be less than or equal to {concurrent.futures.ThreadPoolExecutor()._max_workers}"
+            )
+
+
+# Marks the end of the input of a pipeline stage, one per worker of the stage
+_END_OF_STAGE = object()
 
 DEFAULT_UPLOAD_CHUNK_SIZE: int = 500
+DEFAULT_PIPELINE_API_WORKERS: int = 8
+PIPELINE_QUEUE_SIZE: int = 1000
+MAX_UPLOAD_RETRIES: int = 5
+UPLOAD_JOURNAL_FILE_NAME: str = ".upload_journal.sqlite"
 
 
 def _upload_chunk_size() -> int:
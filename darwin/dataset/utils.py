@@ -1,16 +1,30 @@
+import hashlib
 import itertools
 import multiprocessing as mp
+import os
+import pickle
 from collections import Counter, defaultdict
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Generator, Iterator, List, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 from PIL import Image as PILImage
 from rich.live import Live
 from rich.progress import ProgressBar, track
 
-import darwin.datatypes as dt
-
 # from darwin.dataset.remote_dataset_v2 import RemoteDatasetV2
 from darwin.datatypes import PathLike
 from darwin.exceptions import NotFound
@@ -21,6 +35,7 @@ from darwin.utils import (
     SUPPORTED_VIDEO_EXTENSIONS,
     attempt_decode,
     get_annotation_files_from_dir,
+    get_darwin_annotation_type,
     get_image_path_from_stream,
     is_unix_like_os,
     parse_darwin_json,
@@ -30,6 +45,22 @@ from darwin.utils.utils import stream_darwin_json
 # E.g.: {"partition" => {"class_name" => 123}}
 AnnotationDistribution = Dict[str, Counter]
 
+# The type, class name and presence of a path (or paths) of an annotation
+AnnotationClassEntry = Tuple[str, str, bool]
+
+# The classes mapped to the indices of the images containing them, and the indices of the images
+# mapped to the classes they contain
+ClassIndex = Tuple[Dict[str, Set[int]], Dict[int, Set[str]]]
+
+# Directory, inside a release, where the COCO records built by ``get_annotations`` are cached
+RECORDS_CACHE_DIR_NAME: str = ".coco_records"
+
+# Bumped whenever the content of the cached COCO records changes
+RECORDS_CACHE_VERSION: int = 2
+
+# Below this number of annotation files, starting a pool of processes costs more than it saves
+_MIN_FILES_FOR_POOL: int = 64
+
 
 def get_release_path(dataset_path: Path, release_name: Optional[str] = None) -> Path:
     """
@@ -67,9 +98,142 @@ def get_release_path(dataset_path: Path, release_name: Optional[str] = None) ->
     return release_path
 
 
+def parse_annotation_classes(
+    annotation_paths: List[PathLike],
+    multi_processed: bool = True,
+    worker_count: Optional[int] = None,
+) -> Iterator[Optional[List[AnnotationClassEntry]]]:
+    """
+    Parses the given annotation files and yields, in the same order, the type, class name and
+    presence of a path of each of their annotations, or ``None`` for files that cannot be parsed.
+
+    This is the single pass over the annotations shared by ``extract_classes_by_type``,
+    ``compute_max_density`` and ``compute_distributions``.
+
+    Parameters
+    ----------
+    annotation_paths : List[PathLike]
+        Paths of the annotation files.
+    multi_processed : bool, default: True
+        Parses the files in a pool of processes. Small lists of files are always parsed serially.
+    worker_count : Optional[int], default: None
+        Number of processes of the pool. Defaults to the number of CPUs.
+
+    Returns
+    -------
+    Iterator[Optional[List[AnnotationClassEntry]]]
+        The ``(annotation_type, class_name, has_path)`` entries of each file.
+    """
+    return _map_annotation_files(
+        _get_annotation_classes, annotation_paths, multi_processed, worker_count
+    )
+
+
+def _map_annotation_files(
+    function: Callable[[Any], Any],
+    annotation_paths: List[Any],
+    multi_processed: bool,
+    worker_count: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Applies ``function`` to each of the given annotation files (or arguments built from them), in
+    a pool of processes if requested and worthwhile, and yields the results in the same order.
+    """
+    if not multi_processed or len(annotation_paths) < _MIN_FILES_FOR_POOL:
+        yield from map(function, annotation_paths)
+        return
+
+    if worker_count is None:
+        worker_count = mp.cpu_count()
+    chunksize = max(1, len(annotation_paths) // (4 * worker_count))
+    with mp.Pool(worker_count) as pool:
+        yield from pool.imap(function, annotation_paths, chunksize=chunksize)
+
+
+def _get_annotation_classes(
+    annotation_path: PathLike,
+) -> Optional[List[AnnotationClassEntry]]:
+    """Support function for ``pool.imap()`` in ``parse_annotation_classes()``."""
+    annotation_file = parse_path(Path(annotation_path))
+    if annotation_file is None:
+        return None
+
+    entries = []
+    for annotation in annotation_file.annotations:
+        data = getattr(annotation, "data", None) or {}
+        entries.append(
+            (
+                annotation.annotation_class.annotation_type,
+                annotation.annotation_class.name,
+                "path" in data or "paths" in data,
+            )
+        )
+    return entries
+
+
+def extract_classes_by_type(
+    annotations_path: Path,
+    annotation_types: Union[List[str], Dict[str, Union[str, List[str]]]],
+    multi_processed: bool = True,
+) -> Dict[str, ClassIndex]:
+    """
+    Extracts the classes of several annotation types from the GT json files, parsing each file
+    only once.
+
+    Parameters
+    ----------
+    annotations_path : Path
+        Path to the json files with the GT information of each image.
+    annotation_types : Union[List[str], Dict[str, Union[str, List[str]]]]
+        Annotation types to extract the classes of. A dictionary maps the keys of the result to
+        the type(s) of annotation to use for each of them, e.g.
+        ``{"bounding_box": ["bounding_box", "polygon"]}``.
+    multi_processed : bool, default: True
+        Parses the files in a pool of processes.
+
+    Returns
+    -------
+    Dict[str, ClassIndex]
+        For each requested type, the classes found and the image indices containing them, and
+        the image indices and the classes they contain, as returned by ``extract_classes``.
+    """
+    if not isinstance(annotation_types, dict):
+        annotation_types = {
+            annotation_type: annotation_type for annotation_type in annotation_types
+        }
+
+    types_to_load: Dict[str, Set[str]] = {}
+    for key, atypes in annotation_types.items():
+        types_to_load[key] = {atypes} if isinstance(atypes, str) else set(atypes)
+        for atype in types_to_load[key]:
+            assert atype in ["bounding_box", "polygon", "tag"]
+
+    indexes: Dict[str, ClassIndex] = {
+        key: (defaultdict(set), defaultdict(set)) for key in annotation_types
+    }
+
+    annotation_paths = list(get_annotation_files_from_dir(annotations_path))
+    for i, entries in enumerate(
+        parse_annotation_classes(annotation_paths, multi_processed=multi_processed)
+    ):
+        if not entries:
+            continue
+
+        for key, (classes, indices_to_classes) in indexes.items():
+            for annotation_type, class_name, _ in entries:
+                if annotation_type not in types_to_load[key]:
+                    continue
+                indices_to_classes[i].add(class_name)
+                classes[class_name].add(i)
+
+    return indexes
+
+
 def extract_classes(
-    annotations_path: Path, annotation_type: Union[str, List[str]]
-) -> Tuple[Dict[str, Set[int]], Dict[int, Set[str]]]:
+    annotations_path: Path,
+    annotation_type: Union[str, List[str]],
+    multi_processed: bool = True,
+) -> ClassIndex:
     """
     Given the GT as json files extracts all classes and maps images index to classes.
 
@@ -79,6 +243,8 @@ def extract_classes(
         Path to the json files with the GT information of each image.
     annotation_type : Union[str, List[str]]
         Type(s) of annotation to use to extract the GT information.
+    multi_processed : bool, default: True
+        Parses the files in a pool of processes.
 
     Returns
     -------
@@ -88,38 +254,14 @@ def extract_classes(
         ``Dictionary`` where keys are image indices and values are all classes
         contained in that image.
     """
+    return extract_classes_by_type(
+        annotations_path,
+        {"classes": annotation_type},
+        multi_processed=multi_processed,
+    )["classes"]
 
-    if isinstance(annotation_type, str):
-        annotation_types_to_load = [annotation_type]
-    else:
-        annotation_types_to_load = annotation_type
-
-    for atype in annotation_types_to_load:
-        assert atype in ["bounding_box", "polygon", "tag"]
-
-    classes: Dict[str, Set[int]] = defaultdict(set)
-    indices_to_classes: Dict[int, Set[str]] = defaultdict(set)
 
-    for i, file_name in enumerate(get_annotation_files_from_dir(annotations_path)):
-        annotation_file = parse_path(Path(file_name))
-        if not annotation_file:
-            continue
-
-        for annotation in annotation_file.annotations:
-            if (
-                annotation.annotation_class.annotation_type
-                not in annotation_types_to_load
-            ):
-                continue
-
-            class_name = annotation.annotation_class.name
-            indices_to_classes[i].add(class_name)
-            classes[class_name].add(i)
-
-    return classes, indices_to_classes
-
-
-def make_class_lists(release_path: Path) -> None:
+def make_class_lists(release_path: Path, multi_processed: bool = True) -> None:
     """
     Support function to extract classes and save the output to file.
 
@@ -127,6 +269,8 @@ def make_class_lists(release_path: Path) -> None:
     ----------
     release_path : Path
         Path to the location of the dataset on the file system.
+    multi_processed : bool, default: True
+        Parses the annotation files in a pool of processes.
     """
     assert release_path is not None
     if isinstance(release_path, str):
@@ -137,9 +281,13 @@ def make_class_lists(release_path: Path) -> None:
     lists_path = release_path / "lists"
     lists_path.mkdir(exist_ok=True)
 
-    for annotation_type in ["tag", "polygon", "bounding_box"]:
+    indexes = extract_classes_by_type(
+        annotations_path,
+        ["tag", "polygon", "bounding_box"],
+        multi_processed=multi_processed,
+    )
+    for annotation_type, (classes, _) in indexes.items():
         fname = lists_path / f"classes_{annotation_type}.txt"
-        classes, _ = extract_classes(annotations_path, annotation_type=annotation_type)
         classes_names = list(classes.keys())
         if len(classes_names) > 0:
             classes_names.sort()
@@ -406,6 +554,9 @@ def get_annotations(
     annotation_type: str = "polygon",
     release_name: Optional[str] = None,
     ignore_inconsistent_examples: bool = False,
+    multi_processed: bool = False,
+    worker_count: Optional[int] = None,
+    cache: bool = False,
 ) -> Iterator[Dict[str, Any]]:
     """
     Returns all the annotations of a given dataset and split in a single dictionary.
@@ -431,6 +582,14 @@ def get_annotations(
         or more than one images exist for the same annotation.
         If set to ``True``, then filter those examples out of the dataset.
         If set to ``False``, then raise an error as soon as such an example is found.
+    multi_processed : bool, default: False
+        Builds the COCO records in a pool of processes. They are still yielded in order.
+    worker_count : Optional[int], default: None
+        Number of processes of the pool. Defaults to the number of CPUs.
+    cache : bool, default: False
+        Saves the COCO records in the release once they have all been yielded, and loads them from
+        there while the annotations, images, split and classes stay the same. The images are those
+        mapped to the annotations and the directories holding them.
 
     Returns
     -------
@@ -466,6 +625,23 @@ def get_annotations(
         remove_background=True,
     )
 
+    cache_path: Optional[Path] = None
+    if cache and annotation_format == "coco":
+        cache_path = _get_records_cache_path(
+            release_path,
+            images_dir,
+            partition,
+            split_type,
+            split,
+            annotation_type,
+            ignore_inconsistent_examples,
+            classes,
+        )
+        records = _load_records(cache_path)
+        if records is not None:
+            yield from records
+            return
+
     if partition:
         annotation_filepaths = _get_annotation_filepaths_from_split(
             release_path, annotation_type, partition, split_type, split=split
@@ -493,9 +669,79 @@ def get_annotations(
 
     assert len(images_paths) == len(annotations_paths)
 
-    yield from _load_and_format_annotations(
-        images_paths, annotations_paths, annotation_format, annotation_type, classes
+    formatted_annotations = _load_and_format_annotations(
+        images_paths,
+        annotations_paths,
+        annotation_format,
+        annotation_type,
+        classes,
+        multi_processed=multi_processed,
+        worker_count=worker_count,
     )
+    if cache_path is None:
+        yield from formatted_annotations
+        return
+
+    records = []
+    for record in formatted_annotations:
+        records.append(record)
+        yield record
+    _save_records(cache_path, records, images_paths)
+
+
+def _get_records_cache_path(release_path: Path, images_dir: Path, *parts: Any) -> Path:
+    """
+    Returns where the COCO records of the given selection of a release are cached. The name of the
+    file changes whenever the annotation files, the images directory or the splits of the release
+    are modified. Changes to the images the records were built from are checked by ``_load_records``.
+    """
+    key = hashlib.sha1()
+    key.update(repr((RECORDS_CACHE_VERSION,) + parts).encode())
+    key.update(str(images_dir.stat().st_mtime_ns).encode())
+    for annotation_path in get_annotation_files_from_dir(release_path / "annotations"):
+        key.update(f"{annotation_path}:{os.stat(annotation_path).st_mtime_ns}".encode())
+    for split_file in sorted((release_path / "lists").glob("*/*.txt")):
+        key.update(f"{split_file}:{split_file.stat().st_mtime_ns}".encode())
+    return release_path / RECORDS_CACHE_DIR_NAME / f"{key.hexdigest()[:16]}.pkl"
+
+
+def _load_records(cache_path: Path) -> Optional[List[Dict[str, Any]]]:
+    if not cache_path.exists():
+        return None
+    try:
+        with cache_path.open("rb") as f:
+            cached = pickle.load(f)
+        if _get_image_mtimes(cached["images"]) != cached["images"]:
+            return None
+        return cached["records"]
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def _save_records(
+    cache_path: Path, records: List[Dict[str, Any]], images_paths: List[Path]
+) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        images = _get_image_mtimes(
+            [*map(str, images_paths), *{str(p.parent) for p in images_paths}]
+        )
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            pickle.dump(
+                {"images": images, "records": records},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The records are only cached: a read-only release builds them every time
+        tmp_path.unlink(missing_ok=True)
+
+
+def _get_image_mtimes(paths: Iterable[str]) -> Dict[str, int]:
+    # Raises an OSError if one of the images, or of their directories, was removed
+    return {path: os.stat(path).st_mtime_ns for path in paths}
 
 
 def _validate_inputs(
@@ -619,6 +865,8 @@ def _load_and_format_annotations(
     annotation_format: str,
     annotation_type: str,
     classes: List[str],
+    multi_processed: bool = False,
+    worker_count: Optional[int] = None,
 ) -> Generator[str, None, None]:
     """
     Loads and formats annotations based on the specified format and type.
@@ -629,6 +877,8 @@ def _load_and_format_annotations(
         annotation_format (str): Desired output format for annotations. Can be 'coco' or 'darwin'.
         annotation_type (str): Type of annotations. Can be 'tag', 'polygon', or 'bounding_box'.
         classes (List[str]): List of class names.
+        multi_processed (bool): Builds the COCO records in a pool of processes, in chunks.
+        worker_count (Optional[int]): Number of processes of the pool.
 
     Yields:
         Dict: Formatted annotation record.
@@ -638,6 +888,7 @@ def _load_and_format_annotations(
     """
     if annotation_format == "coco":
         images_ids = list(range(len(images_paths)))
+        record_args = []
         for annotation_path, image_path, image_id in zip(
             annotations_paths, images_paths, images_ids
         ):
@@ -646,20 +897,43 @@ def _load_and_format_annotations(
                     f"[WARNING] Cannot load video annotation into COCO format. Skipping {image_path}"
                 )
                 continue
-            yield get_coco_format_record(
-                annotation_path=annotation_path,
+            record_args.append((annotation_path, image_path, image_id))
+
+        yield from _map_annotation_files(
+            partial(
+                _get_coco_format_record_from_args,
                 annotation_type=annotation_type,
-                image_path=image_path,
-                image_id=image_id,
                 classes=classes,
-            )
+            ),
+            record_args,
+            multi_processed,
+            worker_count,
+        )
     elif annotation_format == "darwin":
         for annotation_path in annotations_paths:
             record = attempt_decode(Path(annotation_path))
             yield record
 
 
-def load_pil_image(path: Path, to_rgb: Optional[bool] = True) -> PILImage.Image:
+def _get_coco_format_record_from_args(
+    args: Tuple[Path, Path, int], annotation_type: str, classes: List[str]
+) -> Dict[str, Any]:
+    """Support function for ``pool.imap()`` in ``_load_and_format_annotations()``."""
+    annotation_path, image_path, image_id = args
+    return get_coco_format_record(
+        annotation_path=annotation_path,
+        annotation_type=annotation_type,
+        image_path=image_path,
+        image_id=image_id,
+        classes=classes,
+    )
+
+
+def load_pil_image(
+    path: Path,
+    to_rgb: Optional[bool] = True,
+    draft_size: Optional[Tuple[int, int]] = None,
+) -> PILImage.Image:
     """
     Loads a PIL image and converts it into RGB (optional).
 
@@ -669,6 +943,10 @@ def load_pil_image(path: Path, to_rgb: Optional[bool] = True) -> PILImage.Image:
         Path to the image file.
     to_rgb : Optional[bool], default: True
         Converts the image to RGB.
+    draft_size : Optional[Tuple[int, int]], default: None
+        If given, JPEG images are decoded at the smallest of 1/8, 1/4, 1/2 or full scale that is
+        still at least this ``(width, height)``, which is much faster than decoding them fully.
+        Other formats are always decoded at full scale.
 
     Returns
     -------
@@ -676,6 +954,8 @@ def load_pil_image(path: Path, to_rgb: Optional[bool] = True) -> PILImage.Image:
         The loaded image.
     """
     pic = PILImage.open(path)
+    if draft_size is not None:
+        pic.draft(pic.mode, draft_size)
     if to_rgb:
         pic = convert_to_rgb(pic)
     return pic
@@ -722,7 +1002,7 @@ def convert_to_rgb(pic: PILImage.Image) -> PILImage.Image:
     return pic
 
 
-def compute_max_density(annotations_dir: Path) -> int:
+def compute_max_density(annotations_dir: Path, multi_processed: bool = True) -> int:
     """
     Calculates the maximum density of all of the annotations in the given folder.
     Density is calculated as the number of polygons present in an annotation
@@ -732,6 +1012,8 @@ def compute_max_density(annotations_dir: Path) -> int:
     ----------
     annotations_dir : Path
         Directory where the annotations are present.
+    multi_processed : bool, default: True
+        Parses the annotation files in a pool of processes.
 
     Returns
     -------
@@ -739,13 +1021,11 @@ def compute_max_density(annotations_dir: Path) -> int:
         The maximum density.
     """
     max_density = 0
-    for annotation_path in get_annotation_files_from_dir(annotations_dir):
-        annotation_density = 0
-        darwin_json = parse_darwin_json(Path(annotation_path))
-        for annotation in darwin_json.annotations:
-            if "path" not in annotation.data and "paths" not in annotation.data:
-                continue
-            annotation_density += 1
+    annotation_paths = list(get_annotation_files_from_dir(annotations_dir))
+    for entries in parse_annotation_classes(
+        annotation_paths, multi_processed=multi_processed
+    ):
+        annotation_density = sum(has_path for _, _, has_path in entries or [])
         if annotation_density > max_density:
             max_density = annotation_density
     return max_density
@@ -756,6 +1036,7 @@ def compute_distributions(
     split_path: Path,
     partitions: List[str] = ["train", "val", "test"],
     annotation_types: List[str] = ["polygon"],
+    multi_processed: bool = True,
 ) -> Dict[str, AnnotationDistribution]:
     """
     Builds and returns the following dictionaries:
@@ -774,6 +1055,9 @@ def compute_distributions(
         Partitions to use.
     annotation_types : List[str], default: ["polygon"]
         Annotation types to consider.
+    multi_processed : bool, default: True
+        Parses the annotation files in a pool of processes. Each file is parsed once, even if it
+        is listed in several partitions.
 
     Returns
     -------
@@ -782,45 +1066,94 @@ def compute_distributions(
         - instance_distribution: count of all instances of a given class exist for each partition
     """
 
-    class_distribution: AnnotationDistribution = {
-        partition: Counter() for partition in partitions
-    }
-    instance_distribution: AnnotationDistribution = {
-        partition: Counter() for partition in partitions
-    }
-
-    for partition in partitions:
+    # How many times each annotation file is listed in each partition
+    split_lines: Dict[Path, List[str]] = {}
+    multiplicities: Dict[str, np.ndarray] = {}
+    for partition_id, partition in enumerate(partitions):
         for annotation_type in annotation_types:
             split_file: Path = (
                 split_path / f"stratified_{annotation_type}_{partition}.txt"
             )
             if not split_file.exists():
                 split_file = split_path / f"random_{partition}.txt"
+            if split_file not in split_lines:
+                split_lines[split_file] = [e.rstrip("\n\r") for e in split_file.open()]
 
-            annotation_filepaths: List[str] = [
-                e.rstrip("\n\r") for e in split_file.open()
-            ]
-            for annotation_filepath in annotation_filepaths:
+            for annotation_filepath in split_lines[split_file]:
                 if not annotation_filepath.endswith(".json"):
                     annotation_filepath = f"{annotation_filepath}.json"
-                annotation_path: Path = annotations_dir / annotation_filepath
-                annotation_file: Optional[dt.AnnotationFile] = parse_path(
-                    annotation_path
-                )
-                if annotation_file is None:
-                    continue
-
-                annotation_class_names: List[str] = [
-                    annotation.annotation_class.name
-                    for annotation in annotation_file.annotations
-                ]
+                if annotation_filepath not in multiplicities:
+                    multiplicities[annotation_filepath] = np.zeros(
+                        len(partitions), dtype=np.int64
+                    )
+                multiplicities[annotation_filepath][partition_id] += 1
+
+    # Class id of every instance and unique class ids of every file, flattened by partition
+    class_ids: Dict[str, int] = {}
+    instance_ids: List[List[int]] = [[] for _ in partitions]
+    file_ids: List[List[int]] = [[] for _ in partitions]
+    annotation_filepaths = list(multiplicities)
+    for annotation_filepath, class_names in zip(
+        annotation_filepaths,
+        _map_annotation_files(
+            _get_annotation_class_names,
+            [annotations_dir / filepath for filepath in annotation_filepaths],
+            multi_processed,
+        ),
+    ):
+        if not class_names:
+            continue
 
-                class_distribution[partition] += Counter(set(annotation_class_names))
-                instance_distribution[partition] += Counter(annotation_class_names)
+        ids = [class_ids.setdefault(name, len(class_ids)) for name in class_names]
+        unique_ids = list(set(ids))
+        multiplicity = multiplicities[annotation_filepath]
+        for partition_id in np.flatnonzero(multiplicity):
+            instance_ids[partition_id].extend(ids * int(multiplicity[partition_id]))
+            file_ids[partition_id].extend(unique_ids * int(multiplicity[partition_id]))
+
+    class_names_by_id = list(class_ids)
+    class_distribution: AnnotationDistribution = {}
+    instance_distribution: AnnotationDistribution = {}
+    for partition_id, partition in enumerate(partitions):
+        class_distribution[partition] = _to_counter(
+            class_names_by_id, _count_ids(file_ids[partition_id], len(class_ids))
+        )
+        instance_distribution[partition] = _to_counter(
+            class_names_by_id, _count_ids(instance_ids[partition_id], len(class_ids))
+        )
 
     return {"class": class_distribution, "instance": instance_distribution}
 
 
+def _get_annotation_class_names(annotation_path: PathLike) -> Optional[List[str]]:
+    """
+    Support function for ``pool.imap()`` in ``compute_distributions()``. Returns the class name of
+    each annotation of the given file, keeping the annotations ``parse_path`` keeps, without
+    building them.
+    """
+    annotation_path = Path(annotation_path)
+    if annotation_path.suffix != ".json":
+        return None
+    data = attempt_decode(annotation_path)
+    if "annotations" not in data:
+        return None
+    return [
+        annotation["name"].strip()
+        for annotation in data["annotations"]
+        if "frames" in annotation or get_darwin_annotation_type(annotation)
+    ]
+
+
+def _count_ids(ids: List[int], count: int) -> np.ndarray:
+    """Returns the number of occurrences of each id in ``range(count)``."""
+    return np.bincount(np.array(ids, dtype=np.int64), minlength=count)
+
+
+def _to_counter(class_names: List[str], counts: np.ndarray) -> Counter:
+    """Returns the positive ``counts`` of each class as a ``Counter``."""
+    return Counter({class_names[i]: int(counts[i]) for i in np.flatnonzero(counts > 0)})
+
+
 # https://github.com/python/cpython/blob/main/Lib/pathlib.py#L812
 # TODO implemented here because it's not supported in Pythton < 3.9
 def is_relative_to(path: Path, *other) -> bool:
@@ -1426,6 +1426,7 @@ ImportParser = Callable[[Path], Union[List[AnnotationFile], AnnotationFile, None
 class MaskTypes:
     Palette = Dict[str, int]
     Mode = Literal["index", "grey", "rgb"]
+    InstanceLayout = Literal["full", "id", "rle", "cropped"]
     TypeOfRender = Literal["raster", "polygon"]
     CategoryList = List[str]
     ExceptionList = List[Exception]
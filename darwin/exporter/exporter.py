@@ -1,5 +1,23 @@
+import concurrent.futures
+import inspect
+import multiprocessing as mp
+from collections import deque
+from functools import partial
+from itertools import islice
+from multiprocessing.pool import AsyncResult
 from pathlib import Path
-from typing import Iterator, List
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
 from darwin.datatypes import AnnotationFile, ExportParser, PathLike
 from darwin.utils import (
@@ -9,8 +27,15 @@ from darwin.utils import (
 )
 
 
+# Number of items, e.g. annotation files to parse, processed by a worker in one task
+_CHUNK_SIZE: int = 32
+
+# Number of chunks in flight per worker, bounding how far parsing runs ahead of the exporter
+_CHUNKS_IN_FLIGHT_PER_WORKER: int = 2
+
+
 def darwin_to_dt_gen(
-    file_paths: List[PathLike], split_sequences: bool
+    file_paths: List[PathLike], split_sequences: bool, workers: Optional[int] = None
 ) -> Iterator[AnnotationFile]:
     """
     Parses the given paths recursively and into an ``Iterator`` of ``AnnotationFile``\\s.
@@ -23,31 +48,176 @@ def darwin_to_dt_gen(
     split_sequences: bool
         When `True`, all videos will be split into individual frame images.
 
+    workers: Optional[int], default: None
+        Number of processes parsing the files ahead of the consumer of the ``Iterator``. Files are
+        parsed in the calling process if ``None`` or ``1``. Either way, ``AnnotationFile``\\s are
+        yielded in the same order and with the same ``seq``.
+
     Returns
     -------
     Iterator[AnnotationFile]
         An ``Iterator`` of the parsed ``AnnotationFile``\\s.
     """
+    files = get_json_files(file_paths)
+    parse = partial(_parse_annotation_file, split_sequences=split_sequences)
+    if workers is None or workers <= 1:
+        parsed = map(parse, files)
+    else:
+        parsed = map_in_pool(parse, files, workers)
+
     count = 0
+    for data in parsed:
+        if isinstance(data, list):
+            for d in data:
+                d.seq = count
+                count += 1
+                yield d
+        elif data:
+            yield data
+        count += 1
+
+
+def get_json_files(file_paths: List[PathLike]) -> Iterator[Path]:
+    """
+    Lists the JSON files among the given paths, looking recursively into the directories.
+
+    Parameters
+    ----------
+    file_paths : List[PathLike]
+        The paths of the files or directories to list.
+
+    Returns
+    -------
+    Iterator[Path]
+        The paths of the JSON files.
+    """
     for file_path in map(Path, file_paths):
         files = (
-            list(map(Path, get_annotation_files_from_dir(file_path)))
+            map(Path, get_annotation_files_from_dir(file_path))
             if file_path.is_dir()
             else [file_path]
         )
-        for f in files:
-            if f.suffix != ".json":
+        yield from (f for f in files if f.suffix == ".json")
+
+
+def _parse_annotation_file(
+    path: Path, split_sequences: bool
+) -> Union[None, AnnotationFile, List[AnnotationFile]]:
+    # Videos are returned as the list of their frames when they are split, to be numbered by the
+    # caller
+    data = parse_darwin_json(path)
+    if data and data.is_video and split_sequences:
+        return list(split_video_annotation(data))
+    return data
+
+
+def _map_chunk(function: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    return [function(item) for item in items]
+
+
+def map_in_pool(
+    function: Callable[[Any], Any], items: Iterator[Any], workers: int
+) -> Iterator[Any]:
+    """
+    Applies ``function`` to chunks of ``items`` on a pool of processes and yields the results in
+    order. Chunks are submitted as earlier ones are consumed, so that memory stays bounded when the
+    consumer is slower than the pool.
+
+    Parameters
+    ----------
+    function : Callable[[Any], Any]
+        Function to apply to each item. It is sent to the processes, so it must be picklable.
+    items : Iterator[Any]
+        The items to process, sent to the processes too.
+    workers : int
+        Number of processes of the pool.
+
+    Returns
+    -------
+    Iterator[Any]
+        The result of ``function`` for each item, in the order of ``items``.
+    """
+    chunks = iter(lambda: list(islice(items, _CHUNK_SIZE)), [])
+    pending: Deque[AsyncResult] = deque()
+    with mp.Pool(workers) as pool:
+        for chunk in islice(chunks, workers * _CHUNKS_IN_FLIGHT_PER_WORKER):
+            pending.append(pool.apply_async(_map_chunk, (function, chunk)))
+        while pending:
+            results = pending.popleft().get()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.apply_async(_map_chunk, (function, chunk)))
+            yield from results
+
+
+def run_in_threads(
+    function: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: Optional[int] = None,
+    key: Optional[Callable[[Any], Hashable]] = None,
+) -> None:
+    """
+    Applies ``function`` to every item on a pool of ``workers`` threads, typically to write the
+    output files of an exporter in parallel. Items are consumed lazily: no more than twice
+    ``workers`` of them are held at a time.
+
+    Items with the same ``key``, e.g. the path of their output file, are processed one after the
+    other in the order of ``items``, so that the last one wins as it does in the calling thread.
+
+    Parameters
+    ----------
+    function : Callable[[Any], Any]
+        Function to apply to each item.
+    items : Iterable[Any]
+        The items to process.
+    workers : Optional[int], default: None
+        Number of threads of the pool. Items are processed in the calling thread if ``None`` or
+        ``1``.
+    key : Optional[Callable[[Any], Hashable]], default: None
+        Function returning the key of an item. Items are processed independently if ``None``.
+
+    Raises
+    ------
+    Exception
+        The first exception raised by ``function``, once the items submitted before it are done.
+    """
+    if workers is None or workers <= 1:
+        for item in items:
+            function(item)
+        return
+
+    pending: Deque[concurrent.futures.Future] = deque()
+    # The last future of each key, pruned of the done ones as the pending futures are consumed
+    last_by_key: Dict[Hashable, concurrent.futures.Future] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            if len(pending) >= 2 * workers:
+                pending.popleft().result()
+                if len(last_by_key) > 2 * workers:
+                    last_by_key = {k: f for k, f in last_by_key.items() if not f.done()}
+            if key is None:
+                pending.append(executor.submit(function, item))
                 continue
-            data = parse_darwin_json(f, count)
-            if data:
-                if data.is_video and split_sequences:
-                    for d in split_video_annotation(data):
-                        d.seq = count
-                        count += 1
-                        yield d
-                else:
-                    yield data
-            count += 1
+            item_key = key(item)
+            future = executor.submit(
+                _run_after, last_by_key.get(item_key), function, item
+            )
+            last_by_key[item_key] = future
+            pending.append(future)
+        while pending:
+            pending.popleft().result()
+
+
+def _run_after(
+    previous: Optional[concurrent.futures.Future],
+    function: Callable[[Any], Any],
+    item: Any,
+) -> Any:
+    # The previous future was submitted first, so it was taken off the queue of the executor first
+    # and is already running: waiting on it cannot exhaust the threads of the pool
+    if previous is not None:
+        concurrent.futures.wait([previous])
+    return function(item)
 
 
 def export_annotations(
@@ -55,6 +225,7 @@ def export_annotations(
     file_paths: List[PathLike],
     output_directory: PathLike,
     split_sequences: bool = True,
+    workers: Optional[int] = None,
 ) -> None:
     """
     Converts a set of files to a different annotation format.
@@ -67,10 +238,30 @@ def export_annotations(
         The files we want to parse.
     output_directory : PathLike
         Where the parsed files will be placed after the operation is complete.
+    split_sequences : bool, default: True
+        When ``True``, all videos will be split into individual frame images.
+    workers : Optional[int], default: None
+        Number of processes parsing the files, and of workers writing them for exporters that
+        accept a ``workers`` argument. Files are parsed and written in the calling process if
+        ``None`` or ``1``. The output does not depend on it.
     """
+    # Exporters that accept them are given the class index up front, scanned from the files, so
+    # that they can write their output as the files are parsed, and the number of workers
+    kwargs: Dict[str, Any] = {}
+    parameters = inspect.signature(exporter).parameters
+    if "class_index" in parameters:
+        from darwin.exporter.formats.helpers.yolo_class_builder import (
+            scan_class_index,
+        )
+
+        kwargs["class_index"] = scan_class_index(file_paths, workers=workers)
+    if "workers" in parameters:
+        kwargs["workers"] = workers
+
     print("Converting annotations...")
     exporter(
-        darwin_to_dt_gen(file_paths, split_sequences=split_sequences),
+        darwin_to_dt_gen(file_paths, split_sequences=split_sequences, workers=workers),
         Path(output_directory),
+        **kwargs,
     )
     print(f"Converted annotations saved at {output_directory}")
@@ -7,6 +7,9 @@ supported_formats: List[str] = [
     "cvat",
     "dataloop",
     "instance_mask",
+    "instance_mask_cropped",
+    "instance_mask_id",
+    "instance_mask_rle",
     "pascalvoc",
     "semantic_mask",
     "semantic_mask_grey",
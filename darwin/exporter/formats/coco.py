@@ -1,7 +1,9 @@
+import shutil
 from datetime import date
 from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from tempfile import TemporaryFile
+from typing import IO, Any, Dict, Iterator, List, Optional
 from zlib import crc32
 
 import numpy as np
@@ -23,6 +25,9 @@ def export(annotation_files: Iterator[dt.AnnotationFile], output_dir: Path) -> N
     """
     Exports the given ``AnnotationFile``\\s into the coco format inside of the given ``output_dir``.
 
+    The file is written as the ``AnnotationFile``\\s are read, so that only one of them is held in
+    memory at a time.
+
     Parameters
     ----------
     annotation_files : Iterator[dt.AnnotationFile]
@@ -30,60 +35,91 @@ def export(annotation_files: Iterator[dt.AnnotationFile], output_dir: Path) -> N
     output_dir : Path
         The folder where the new coco file will be.
     """
-    output = _build_json(list(annotation_files))
     output_file_path = (output_dir / "output").with_suffix(".json")
-    with open(output_file_path, "w") as f:
-        op = json.dumps(
-            output, option=json.OPT_INDENT_2 | json.OPT_SERIALIZE_NUMPY
-        ).decode("utf-8")
-        f.write(op)
+    categories: Dict[str, int] = {}
+    tag_categories: Dict[str, int] = {}
+    image_seqs: List[Optional[int]] = []
+    image_offsets: List[int] = [0]
+
+    # Images are sorted by ``seq`` and come before the annotations, so both are spooled to
+    # temporary files and only assembled once every ``AnnotationFile`` has been read
+    with TemporaryFile(dir=output_dir) as images, TemporaryFile(
+        dir=output_dir
+    ) as annotations:
+        annotation_id = 0
+        for annotation_file in annotation_files:
+            _add_categories(annotation_file, categories, tag_categories)
+            images.write(_dumps(_build_image(annotation_file, tag_categories), 2))
+            image_seqs.append(annotation_file.seq)
+            image_offsets.append(images.tell())
+            for annotation in annotation_file.annotations:
+                annotation_id += 1
+                annotation_data = _build_annotation(
+                    annotation_file, annotation_id, annotation, categories
+                )
+                if annotation_data:
+                    annotations.write(
+                        (b",\n    " if annotations.tell() else b"\n    ")
+                        + _dumps(annotation_data, 2)
+                    )
+
+        categories = dict(sorted(categories.items(), key=itemgetter(1)))
+        tag_categories = dict(sorted(tag_categories.items(), key=itemgetter(1)))
+        with open(output_file_path, "wb") as f:
+            f.write(b'{\n  "info": ' + _dumps(_build_info(), 1))
+            f.write(b',\n  "licenses": ' + _dumps(_build_licenses(), 1))
+            f.write(b',\n  "images": [')
+            _copy_images(images, image_seqs, image_offsets, f)
+            f.write(b"\n  ]" if image_seqs else b"]")
+            f.write(b',\n  "annotations": [')
+            annotations.seek(0)
+            shutil.copyfileobj(annotations, f)
+            f.write(b"\n  ]" if annotations.tell() else b"]")
+            f.write(
+                b',\n  "categories": ' + _dumps(list(_build_categories(categories)), 1)
+            )
+            f.write(
+                b',\n  "tag_categories": '
+                + _dumps(list(_build_tag_categories(tag_categories)), 1)
+            )
+            f.write(b"\n}")
 
 
-def _build_json(annotation_files: List[dt.AnnotationFile]) -> Dict[str, Any]:
-    categories: Dict[str, int] = _calculate_categories(annotation_files)
-    tag_categories: Dict[str, int] = _calculate_tag_categories(annotation_files)
-    return {
-        "info": _build_info(),
-        "licenses": _build_licenses(),
-        "images": _build_images(annotation_files, tag_categories),
-        "annotations": list(_build_annotations(annotation_files, categories)),
-        "categories": list(_build_categories(categories)),
-        "tag_categories": list(_build_tag_categories(tag_categories)),
-    }
+def _dumps(data: Any, depth: int) -> bytes:
+    # Serializes ``data`` as it would be when nested ``depth`` levels deep in an indented document
+    return json.dumps(
+        data, option=json.OPT_INDENT_2 | json.OPT_SERIALIZE_NUMPY
+    ).replace(b"\n", b"\n" + b"  " * depth)
 
 
-def _calculate_categories(annotation_files: List[dt.AnnotationFile]) -> Dict[str, int]:
-    categories: Dict[str, int] = {}
-    for annotation_file in annotation_files:
-        for annotation_class in annotation_file.annotation_classes:
-            if (
-                annotation_class.name not in categories
-                and annotation_class.annotation_type
-                in [
-                    "polygon",
-                    "bounding_box",
-                ]
-            ):
-                categories[annotation_class.name] = _calculate_category_id(
-                    annotation_class
-                )
-    return dict(sorted(categories.items(), key=itemgetter(1)))
+def _copy_images(
+    images: IO[bytes], seqs: List[Optional[int]], offsets: List[int], output: IO[bytes]
+) -> None:
+    # Copies the spooled images to ``output`` in the stable order of their ``seq``, compared as
+    # ``sorted`` compares them, so that a single image without ``seq`` is exported as before
+    order = sorted(range(len(seqs)), key=seqs.__getitem__)
+    for position, index in enumerate(order):
+        images.seek(offsets[index])
+        image = images.read(offsets[index + 1] - offsets[index])
+        output.write((b",\n    " if position else b"\n    ") + image)
 
 
-def _calculate_tag_categories(
-    annotation_files: List[dt.AnnotationFile],
-) -> Dict[str, int]:
-    categories: Dict[str, int] = {}
-    for annotation_file in annotation_files:
-        for annotation_class in annotation_file.annotation_classes:
-            if (
-                annotation_class.name not in categories
-                and annotation_class.annotation_type == "tag"
-            ):
+def _add_categories(
+    annotation_file: dt.AnnotationFile,
+    categories: Dict[str, int],
+    tag_categories: Dict[str, int],
+) -> None:
+    for annotation_class in annotation_file.annotation_classes:
+        if annotation_class.annotation_type in ["polygon", "bounding_box"]:
+            if annotation_class.name not in categories:
                 categories[annotation_class.name] = _calculate_category_id(
                     annotation_class
                 )
-    return dict(sorted(categories.items(), key=itemgetter(1)))
+        elif annotation_class.annotation_type == "tag":
+            if annotation_class.name not in tag_categories:
+                tag_categories[annotation_class.name] = _calculate_category_id(
+                    annotation_class
+                )
 
 
 def _calculate_category_id(annotation_class: dt.AnnotationClass) -> int:
@@ -107,15 +143,6 @@ def _build_licenses() -> List[Dict[str, Any]]:
     return [{"url": "n/a", "id": 0, "name": "placeholder license"}]
 
 
-def _build_images(
-    annotation_files: List[dt.AnnotationFile], tag_categories: Dict[str, int]
-) -> List[Dict[str, Any]]:
-    return [
-        _build_image(annotation_file, tag_categories)
-        for annotation_file in sorted(annotation_files, key=lambda x: x.seq)
-    ]
-
-
 def _build_image(
     annotation_file: dt.AnnotationFile, tag_categories: Dict[str, int]
 ) -> Dict[str, Any]:
@@ -153,20 +180,6 @@ def _build_image_id(annotation_file: dt.AnnotationFile) -> int:
         return crc32(str.encode(full_path))
 
 
-def _build_annotations(
-    annotation_files: List[dt.AnnotationFile], categories: Dict[str, int]
-) -> Iterator[Optional[Dict[str, Any]]]:
-    annotation_id = 0
-    for annotation_file in annotation_files:
-        for annotation in annotation_file.annotations:
-            annotation_id += 1
-            annotation_data = _build_annotation(
-                annotation_file, annotation_id, annotation, categories
-            )
-            if annotation_data:
-                yield annotation_data
-
-
 def _build_annotation(
     annotation_file: dt.AnnotationFile,
     annotation_id: int,
@@ -1,9 +1,10 @@
 from pathlib import Path
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import orjson as json
 
 import darwin.datatypes as dt
+from darwin.exporter.exporter import run_in_threads
 
 DEPRECATION_MESSAGE = """
 
@@ -14,7 +15,11 @@ instead of calling this low-level function directly.
 """
 
 
-def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> None:
+def export(
+    annotation_files: Iterable[dt.AnnotationFile],
+    output_dir: Path,
+    workers: Optional[int] = None,
+) -> None:
     """
     Exports the given ``AnnotationFile``\\s into the dataloop format inside of the given ``output_dir``.
 
@@ -24,16 +29,29 @@ def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> N
         The ``AnnotationFile``\\s to be exported.
     output_dir : Path
         The folder where the new coco file will be.
+    workers : Optional[int], default: None
+        Number of threads writing the files.
     """
-    for id, annotation_file in enumerate(annotation_files):
+
+    def export_file(item: Tuple[int, dt.AnnotationFile]) -> None:
+        id, annotation_file = item
         _export_file(annotation_file, id, output_dir)
 
+    run_in_threads(
+        export_file,
+        enumerate(annotation_files),
+        workers,
+        key=lambda item: _get_output_file_path(item[1], output_dir),
+    )
+
+
+def _get_output_file_path(annotation_file: dt.AnnotationFile, output_dir: Path) -> Path:
+    return (output_dir / annotation_file.filename).with_suffix(".json")
+
 
 def _export_file(annotation_file: dt.AnnotationFile, id: int, output_dir: Path) -> None:
     output: Dict[str, Any] = _build_json(annotation_file, id)
-    output_file_path: Path = (output_dir / annotation_file.filename).with_suffix(
-        ".json"
-    )
+    output_file_path: Path = _get_output_file_path(annotation_file, output_dir)
     with open(output_file_path, "w") as f:
         op = json.dumps(
             output, option=json.OPT_INDENT_2 | json.OPT_SERIALIZE_NUMPY
@@ -1,7 +1,10 @@
+from functools import partial
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List
+from typing import Callable, Dict, Iterable, List, Optional, Set
 
-from darwin.datatypes import AnnotationFile
+from darwin.datatypes import AnnotationFile, PathLike
+from darwin.exporter.exporter import get_json_files, map_in_pool, run_in_threads
+from darwin.utils import attempt_decode, get_darwin_annotation_type
 
 ClassIndex = Dict[str, int]
 
@@ -18,6 +21,58 @@ def build_class_index(
     return {k: v for (v, k) in enumerate(sorted(classes))}
 
 
+def scan_class_index(
+    file_paths: List[PathLike],
+    include_types: List[str] = ["bounding_box", "polygon"],
+    workers: Optional[int] = None,
+) -> ClassIndex:
+    """
+    Builds the same class index as ``build_class_index`` straight from Darwin JSON files, reading
+    only the name and the type of their annotations instead of parsing them into
+    ``AnnotationFile``\\s.
+
+    Parameters
+    ----------
+    file_paths : List[PathLike]
+        The paths of the files or directories to scan, as given to ``darwin_to_dt_gen``.
+    include_types : List[str], default: ["bounding_box", "polygon"]
+        The annotation types whose classes are indexed.
+    workers : Optional[int], default: None
+        Number of processes scanning the files. Files are scanned in the calling process if
+        ``None`` or ``1``.
+
+    Returns
+    -------
+    ClassIndex
+        The index of each class, in alphabetical order.
+    """
+    scan = partial(_scan_class_names, include_types=include_types)
+    files = get_json_files(file_paths)
+    if workers is None or workers <= 1:
+        names = map(scan, files)
+    else:
+        names = map_in_pool(scan, files, workers)
+    classes: Set[str] = set().union(*names)
+    return {k: v for (v, k) in enumerate(sorted(classes))}
+
+
+def _scan_class_names(path: Path, include_types: List[str]) -> Set[str]:
+    data = attempt_decode(path)
+    names: Set[str] = set()
+    for annotation in data.get("annotations", []):
+        if "frames" in annotation:
+            frames = {**annotation["frames"], **annotation.get("sections", {})}
+            types = {get_darwin_annotation_type(frame) for frame in frames.values()}
+        elif "raster_layer" in annotation or "mask" in annotation:
+            # Parsed apart from the other annotations, whatever their other keys
+            types = {"raster_layer" if "raster_layer" in annotation else "mask"}
+        else:
+            types = {get_darwin_annotation_type(annotation)}
+        if not types.isdisjoint(include_types):
+            names.add(annotation["name"].strip())
+    return names
+
+
 def export_file(
     annotation_file: AnnotationFile,
     class_index: ClassIndex,
@@ -25,7 +80,13 @@ def export_file(
     build_function: Callable[[AnnotationFile, ClassIndex], str],
 ) -> None:
     txt = build_function(annotation_file, class_index)
+    output_file_path = _get_output_file_path(annotation_file, output_dir)
+    output_file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file_path, "w") as f:
+        f.write(txt)
 
+
+def _get_output_file_path(annotation_file: AnnotationFile, output_dir: Path) -> Path:
     # Just using `.with_suffix(".txt")` would remove all suffixes, so we need to
     # do it manually.
 
@@ -33,11 +94,45 @@ def export_file(
     filename_to_write = (
         filename.replace(".json", ".txt") if ".json" in filename else filename + ".txt"
     )
-    output_file_path = output_dir / filename_to_write
+    return output_dir / filename_to_write
 
-    output_file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file_path, "w") as f:
-        f.write(txt)
+
+def export_files(
+    annotation_files: Iterable[AnnotationFile],
+    class_index: ClassIndex,
+    output_dir: Path,
+    build_function: Callable[[AnnotationFile, ClassIndex], str],
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Writes the file of each of the given ``AnnotationFile``\\s as they are read, on ``workers``
+    threads. Files written to the same path are written in order, so that the last one wins.
+
+    Parameters
+    ----------
+    annotation_files : Iterable[AnnotationFile]
+        The ``AnnotationFile``\\s to be exported.
+    class_index : ClassIndex
+        The index of every class of the ``AnnotationFile``\\s.
+    output_dir : Path
+        The folder where the files will be.
+    build_function : Callable[[AnnotationFile, ClassIndex], str]
+        Function building the content of the file of an ``AnnotationFile``.
+    workers : Optional[int], default: None
+        Number of threads writing the files. Files are written in the calling thread if ``None``
+        or ``1``.
+    """
+    run_in_threads(
+        partial(
+            export_file,
+            class_index=class_index,
+            output_dir=output_dir,
+            build_function=build_function,
+        ),
+        annotation_files,
+        workers,
+        key=partial(_get_output_file_path, output_dir=output_dir),
+    )
 
 
 def save_class_index(class_index: ClassIndex, output_dir: Path) -> None:
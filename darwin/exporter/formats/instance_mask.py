@@ -1,54 +1,286 @@
 import os
 import shutil
+from functools import partial
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, List, Optional, Tuple, get_args
 
 import numpy as np
+import orjson as json
 from PIL import Image
+from upolygon import draw_polygon
 
 import darwin.datatypes as dt
-from darwin.utils import convert_polygons_to_mask, get_progress_bar, ispolygon
+from darwin.exporter.exporter import map_in_pool
+from darwin.utils import (
+    convert_polygons_to_mask,
+    convert_polygons_to_sequences,
+    get_progress_bar,
+    ispolygon,
+)
 
+# Columns appended to ``image_id,mask_id,class_name`` in the CSV index of each layout
+_EXTRA_COLUMNS: Dict[str, List[str]] = {
+    "full": [],
+    "id": ["instance_id"],
+    "rle": [],
+    "cropped": ["x", "y"],
+}
 
-def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> None:
+
+def export(
+    annotation_files: Iterable[dt.AnnotationFile],
+    output_dir: Path,
+    layout: dt.MaskTypes.InstanceLayout = "full",
+    workers: Optional[int] = None,
+) -> None:
     """
     Exports the given ``AnnotationFile``\\s into instance masks format inside of the given
     ``output_dir``. Deletes everything within ``output_dir/masks`` before writting to it.
 
+    Each polygon is listed in ``instance_mask_annotations.csv`` as an ``image_id,mask_id,class_name``
+    row, followed by the columns specific to the layout. The ``layout`` selects how its mask is
+    stored in ``output_dir/masks``:
+
+    - ``"full"``: a full size PNG per polygon, named after its ``mask_id``. As in earlier versions,
+      the ``image_id`` is the filename of the item without its extension, so the masks of items
+      with the same name in different folders overwrite each other, the last item winning.
+    - ``"id"``: a 16 bits PNG per image, named after its ``image_id``, where each polygon is drawn
+      with the value of its ``instance_id`` column and ``0`` is the background. Where polygons
+      overlap, the pixels belong to the last one.
+    - ``"rle"``: a JSON file per image, named after its ``image_id``, mapping the ``mask_id`` of each
+      polygon to its mask in the compressed COCO RLE format.
+    - ``"cropped"``: a PNG per polygon, named after its ``mask_id``, cropped to the bounding box of
+      the polygon, whose top left corner is given by the ``x`` and ``y`` columns.
+
+    In the other layouts, the ``image_id`` is the path of the item in the dataset without its
+    extension, so that the masks of items in folders are stored in the same folders.
+
     Parameters
     ----------
     annotation_files : Iterable[dt.AnnotationFile]
         The ``AnnotationFile``\\s to be exported.
     output_dir : Path
         The folder where the new instance mask files will be.
+    layout : dt.MaskTypes.InstanceLayout, default: "full"
+        How the masks are stored, ``"full"``, ``"id"``, ``"rle"`` or ``"cropped"``.
+    workers : Optional[int], default: None
+        Number of processes rendering the masks. Masks are rendered in the calling process if
+        ``None`` or ``1``.
+
+    Raises
+    ------
+    ValueError
+        If the given ``layout`` is not supported.
     """
+    if layout not in get_args(dt.MaskTypes.InstanceLayout):
+        raise ValueError(f"Unknown instance mask layout: {layout}")
+
     masks_dir = output_dir / "masks"
     if masks_dir.exists():
         shutil.rmtree(masks_dir)
     masks_dir.mkdir(parents=True, exist_ok=True)
+
+    export_file = partial(_export_file, masks_dir=masks_dir, layout=layout)
+    annotation_files = list(annotation_files)
+    # Colliding masks are overwritten in the order of the files, as in a serial export
+    serial = (
+        workers is None
+        or workers <= 1
+        or _has_colliding_image_ids(annotation_files, layout)
+    )
+    annotation_files = get_progress_bar(annotation_files, "Processing annotations")
+    if serial:
+        rows_per_file = map(export_file, annotation_files)
+    else:
+        rows_per_file = map_in_pool(export_file, iter(annotation_files), workers)
+
     with open(output_dir / "instance_mask_annotations.csv", "w") as f:
-        f.write("image_id,mask_id,class_name\n")
-        for annotation_file in get_progress_bar(
-            list(annotation_files), "Processing annotations"
-        ):
-            image_id = os.path.splitext(annotation_file.filename)[0]
-            height = annotation_file.image_height
-            width = annotation_file.image_width
-            annotations = [
-                a for a in annotation_file.annotations if ispolygon(a.annotation_class)
-            ]
-            for i, annotation in enumerate(annotations):
-                cat = annotation.annotation_class.name
-                if annotation.annotation_class.annotation_type == "polygon":
-                    polygon = annotation.data["paths"]
-                else:
-                    continue
-                mask = convert_polygons_to_mask(
-                    polygon, height=height, width=width, value=255
-                )
-                mask = Image.fromarray(mask.astype(np.uint8))
-                mask_id = f"{image_id}_{i:05}"
-                outfile = masks_dir / f"{mask_id}.png"
-                outfile.parent.mkdir(parents=True, exist_ok=True)
-                mask.save(outfile)
-                f.write(f"{image_id},{mask_id},{cat}\n")
+        columns = ["image_id", "mask_id", "class_name", *_EXTRA_COLUMNS[layout]]
+        f.write(",".join(columns) + "\n")
+        for rows in rows_per_file:
+            f.writelines(rows)
+
+
+def _export_file(
+    annotation_file: dt.AnnotationFile,
+    masks_dir: Path,
+    layout: dt.MaskTypes.InstanceLayout,
+) -> List[str]:
+    # Writes the masks of the given file and returns its rows of the CSV index
+    image_id = _get_image_id(annotation_file, layout)
+    height = annotation_file.image_height
+    width = annotation_file.image_width
+    annotations = [
+        a for a in annotation_file.annotations if ispolygon(a.annotation_class)
+    ]
+
+    if layout == "id":
+        if len(annotations) > np.iinfo(np.uint16).max:
+            raise ValueError(
+                f"Too many instances in {annotation_file.filename} for a 16 bits mask: "
+                f"{len(annotations)}"
+            )
+        instance_ids = np.zeros((height, width), dtype=np.uint16)
+    rles: Dict[str, Dict] = {}
+
+    rows: List[str] = []
+    for i, annotation in enumerate(annotations):
+        cat = annotation.annotation_class.name
+        polygon = annotation.data["paths"]
+        mask_id = f"{image_id}_{i:05}"
+        columns: List[int] = []
+        if layout == "full":
+            mask = convert_polygons_to_mask(
+                polygon, height=height, width=width, value=255
+            )
+            _save_png(mask.astype(np.uint8), masks_dir / f"{mask_id}.png")
+        else:
+            (x, y), mask = render_cropped_polygon(polygon, height=height, width=width)
+            if layout == "id":
+                region = instance_ids[y : y + mask.shape[0], x : x + mask.shape[1]]
+                region[mask > 0] = i + 1
+                columns = [i + 1]
+            elif layout == "rle":
+                rles[mask_id] = {
+                    "size": [height, width],
+                    "counts": encode_rle_counts(
+                        cropped_mask_to_rle(mask, x, y, height=height, width=width)
+                    ),
+                }
+            else:
+                _save_png(mask, masks_dir / f"{mask_id}.png")
+                columns = [x, y]
+        rows.append(",".join([image_id, mask_id, cat, *map(str, columns)]) + "\n")
+
+    if layout == "id":
+        _save_png(instance_ids, masks_dir / f"{image_id}.png")
+    elif layout == "rle":
+        outfile = masks_dir / f"{image_id}.json"
+        outfile.parent.mkdir(parents=True, exist_ok=True)
+        outfile.write_bytes(json.dumps(rles))
+    return rows
+
+
+def _get_image_id(
+    annotation_file: dt.AnnotationFile, layout: dt.MaskTypes.InstanceLayout
+) -> str:
+    if layout == "full":
+        return os.path.splitext(annotation_file.filename)[0]
+    return os.path.splitext(annotation_file.full_path)[0].lstrip("/")
+
+
+def _has_colliding_image_ids(
+    annotation_files: List[dt.AnnotationFile], layout: dt.MaskTypes.InstanceLayout
+) -> bool:
+    image_ids = [_get_image_id(f, layout) for f in annotation_files]
+    return len(set(image_ids)) < len(image_ids)
+
+
+def _save_png(mask: np.ndarray, outfile: Path) -> None:
+    outfile.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(mask).save(outfile)
+
+
+def render_cropped_polygon(
+    polygon: List, height: int, width: int, value: int = 255
+) -> Tuple[Tuple[int, int], np.ndarray]:
+    """
+    Renders the given polygon into a mask cropped to its bounding box. The mask is the same as
+    the crop of the full size one of ``convert_polygons_to_mask``.
+
+    Parameters
+    ----------
+    polygon : List
+        List of coordinates in the format ``[{x: x1, y:y1}, ..., {x: xn, y:yn}]`` or a list of them
+        as  ``[[{x: x1, y:y1}, ..., {x: xn, y:yn}], ..., [{x: x1, y:y1}, ..., {x: xn, y:yn}]]``.
+    height : int
+        The height of the image.
+    width : int
+        The width of the image.
+    value : int, default: 255
+        The drawing value for ``upolygon``.
+
+    Returns
+    -------
+    Tuple[Tuple[int, int], np.ndarray]
+        The ``x`` and ``y`` offset of the top left corner of the mask in the image, and the mask.
+    """
+    sequences = convert_polygons_to_sequences(polygon, height=height, width=width)
+    xs = [x for sequence in sequences for x in sequence[0::2]]
+    ys = [y for sequence in sequences for y in sequence[1::2]]
+    x, y = int(min(xs)), int(min(ys))
+    mask = np.zeros((int(max(ys)) - y + 1, int(max(xs)) - x + 1), dtype=np.uint8)
+    shifted = [
+        [coordinate - (y if i % 2 else x) for i, coordinate in enumerate(sequence)]
+        for sequence in sequences
+    ]
+    draw_polygon(mask, shifted, value)
+    return (x, y), mask
+
+
+def cropped_mask_to_rle(
+    mask: np.ndarray, x: int, y: int, height: int, width: int
+) -> List[int]:
+    """
+    Computes the COCO run lengths of a full size mask, in column-major order and starting with a
+    run of background, from its crop at offset ``x``, ``y``.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        The cropped mask, where non zero values are the foreground.
+    x : int
+        The column of the top left corner of the crop in the full size mask.
+    y : int
+        The row of the top left corner of the crop in the full size mask.
+    height : int
+        The height of the full size mask.
+    width : int
+        The width of the full size mask.
+
+    Returns
+    -------
+    List[int]
+        The lengths of the alternating runs of background and foreground.
+    """
+    # Each column of the crop is padded with background, so that its runs start and end in it
+    padded = np.zeros((mask.shape[1], mask.shape[0] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask.T > 0
+    columns, rows = np.nonzero(np.diff(padded, axis=1))
+    changes = (x + columns) * height + y + rows
+    # A run ending at the bottom of a column and one starting at the top of the next one are a
+    # single run of the full size mask
+    changes, occurrences = np.unique(changes, return_counts=True)
+    changes = changes[occurrences == 1]
+    if len(changes) == 0 or changes[-1] != height * width:
+        changes = np.append(changes, height * width)
+    return np.diff(changes, prepend=0).tolist()
+
+
+def encode_rle_counts(counts: List[int]) -> str:
+    """
+    Encodes COCO run lengths into their compressed string form, as read by ``pycocotools`` and
+    ``decode_binary_rle`` of the COCO importer.
+
+    Parameters
+    ----------
+    counts : List[int]
+        The lengths of the alternating runs of background and foreground.
+
+    Returns
+    -------
+    str
+        The compressed run lengths.
+    """
+    chars: List[str] = []
+    for i, count in enumerate(counts):
+        value = count - counts[i - 2] if i > 2 else count
+        more = True
+        while more:
+            c = value & 0x1F
+            value >>= 5
+            more = value != -1 if c & 0x10 else value != 0
+            if more:
+                c |= 0x20
+            chars.append(chr(c + 48))
+    return "".join(chars)
@@ -0,0 +1,31 @@
+from pathlib import Path
+from typing import Iterable, Optional
+
+import darwin.datatypes as dt
+from darwin.exporter.formats.instance_mask import export as export_instance_mask
+
+
+def export(
+    annotation_files: Iterable[dt.AnnotationFile],
+    output_dir: Path,
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Exports the given ``AnnotationFile``\\s into 16 bits instance id masks, one per image,
+    inside of the given ``output_dir``.
+
+    Parameters
+    ----------
+    annotation_files : Iterable[dt.AnnotationFile]
+        The ``AnnotationFile``\\s to be exported.
+    output_dir : Path
+        The folder where the new instance mask files will be.
+    workers : Optional[int], default: None
+        Number of processes rendering the masks.
+    """
+    return export_instance_mask(
+        annotation_files=annotation_files,
+        output_dir=output_dir,
+        layout="id",
+        workers=workers,
+    )
@@ -2,8 +2,9 @@ import colorsys
 import math
 import os
 from csv import writer as csv_writer
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Set, Tuple, get_args
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union, get_args
 
 import numpy as np
 
@@ -16,8 +17,12 @@ from upolygon import draw_polygon
 
 import darwin.datatypes as dt
 from darwin.exceptions import DarwinException
+from darwin.exporter.exporter import map_in_pool
 from darwin.utils import convert_polygons_to_sequences
 
+# Annotation types rendered into the masks
+ACCEPTED_TYPES: List[str] = ["polygon", "raster_layer", "mask"]
+
 
 def get_palette(mode: dt.MaskTypes.Mode, categories: List[str]) -> dt.MaskTypes.Palette:
     """
@@ -163,12 +168,17 @@ def get_render_mode(annotations: List[dt.AnnotationLike]) -> dt.MaskTypes.TypeOf
 
 
 def rle_decode(
-    rle: dt.MaskTypes.UndecodedRLE, label_colours: Dict[int, int]
-) -> List[int]:
+    rle: dt.MaskTypes.UndecodedRLE,
+    label_colours: Dict[int, int],
+    as_array: bool = False,
+) -> Union[List[int], NDArray]:
     """Decodes a run-length encoded list of integers and substitutes labels by colours.
 
     Args:
         rle (List[int]): A run-length encoded list of integers.
+        label_colours (Dict[int, int]): The colour of each label.
+        as_array (bool): Returns a NumPy array instead of a list, which is much faster for large
+            masks.
 
     Returns:
         List[int]: The decoded list of integers.
@@ -176,11 +186,21 @@ def rle_decode(
     if len(rle) % 2 != 0:
         raise ValueError("RLE must be a list of pairs of integers.")
 
-    output = []
-    for i in range(0, len(rle), 2):
-        output += [label_colours[rle[i]]] * rle[i + 1]
+    runs = np.asarray(rle, dtype=np.int64).reshape(-1, 2)
+    if not label_colours and len(runs):
+        raise KeyError(int(runs[0, 0]))
+    labels = np.fromiter(label_colours.keys(), dtype=np.int64, count=len(label_colours))
+    colours = np.fromiter(
+        label_colours.values(), dtype=np.int64, count=len(label_colours)
+    )
+    order = np.argsort(labels)
+    positions = np.searchsorted(labels[order], runs[:, 0]).clip(max=len(labels) - 1)
+    unknown = labels[order][positions] != runs[:, 0]
+    if unknown.any():
+        raise KeyError(int(runs[unknown.argmax(), 0]))
 
-    return output
+    output = np.repeat(colours[order][positions], runs[:, 1])
+    return output if as_array else output.tolist()
 
 
 def get_or_generate_colour(cat_name: str, colours: dt.MaskTypes.ColoursDict) -> int:
@@ -402,8 +422,8 @@ def render_raster(
 
         label_colours[label] = colour_to_draw
 
-    decoded = rle_decode(raster_layer.rle, label_colours)
-    mask = np.array(decoded, dtype=np.uint8).reshape(height, width)
+    decoded = rle_decode(raster_layer.rle, label_colours, as_array=True)
+    mask = np.asarray(decoded).astype(np.uint8).reshape(height, width)
 
     return errors, mask, categories, colours
 
@@ -412,18 +432,45 @@ def export(
     annotation_files: Iterable[dt.AnnotationFile],
     output_dir: Path,
     mode: dt.MaskTypes.Mode,
+    workers: Optional[int] = None,
+    compress_level: Optional[int] = None,
 ) -> None:
+    """
+    Exports the given ``AnnotationFile``\\s into semantic masks inside of the given ``output_dir``.
+
+    Parameters
+    ----------
+    annotation_files : Iterable[dt.AnnotationFile]
+        The ``AnnotationFile``\\s to be exported.
+    output_dir : Path
+        The folder where the new semantic mask files will be.
+    mode : dt.MaskTypes.Mode
+        The colour mode of the masks, ``"index"``, ``"grey"`` or ``"rgb"``.
+    workers : Optional[int], default: None
+        Number of processes rendering the masks. Masks are rendered in the calling process if
+        ``None`` or ``1``.
+    compress_level : Optional[int], default: None
+        The zlib compression level of the PNG files, from 0 (fastest) to 9 (smallest). Defaults to
+        the ``DARWIN_MASK_PNG_COMPRESS_LEVEL`` environment variable, or to the default of Pillow.
+
+    Raises
+    ------
+    ValueError
+        If ``DARWIN_MASK_PNG_COMPRESS_LEVEL`` is set to anything but an integer from 0 to 9.
+    """
+    if compress_level is None:
+        compress_level = _get_png_compress_level()
+
     masks_dir: Path = output_dir / "masks"
     masks_dir.mkdir(exist_ok=True, parents=True)
     annotation_files = list(annotation_files)
-    accepted_types = ["polygon", "raster_layer", "mask"]
     all_classes_sets: List[Set[dt.AnnotationClass]] = [
         a.annotation_classes for a in annotation_files
     ]
     if len(all_classes_sets) > 0:
         all_classes: Set[dt.AnnotationClass] = set.union(*all_classes_sets)
         categories: List[str] = ["__background__"] + sorted(
-            {c.name for c in all_classes if c.annotation_type in accepted_types},
+            {c.name for c in all_classes if c.annotation_type in ACCEPTED_TYPES},
             key=lambda x: x.lower(),
         )
         palette = get_palette(mode, categories)
@@ -431,65 +478,34 @@ def export(
         categories = ["__background__"]
         palette = {}
 
-    colours: dt.MaskTypes.ColoursDict = {}
-
-    for annotation_file in annotation_files:
-        image_rel_path = os.path.splitext(annotation_file.full_path)[0].lstrip("/")
-        outfile = masks_dir / f"{image_rel_path}.png"
-        outfile.parent.mkdir(parents=True, exist_ok=True)
-
-        height = annotation_file.image_height
-        width = annotation_file.image_width
-        if height is None or width is None:
-            raise ValueError(
-                f"Annotation file {annotation_file.filename} references an image with no height or width"
-            )
-
-        mask: NDArray = np.zeros((height, width)).astype(np.uint8)
-        annotations: List[dt.AnnotationLike] = [
-            a
-            for a in annotation_file.annotations
-            if a.annotation_class.annotation_type in accepted_types
-        ]
-
-        render_type = get_render_mode(annotations)
-
-        if render_type == "raster":
-            # Add categories to list
-            errors, mask, categories, colours = render_raster(
-                mask, colours, categories, annotations, annotation_file, height, width
-            )
-
-        else:
-            #  Add categories to list
-            errors, mask, categories, colours = render_polygons(
-                mask, colours, categories, annotations, annotation_file, height, width
-            )
+    export_file = partial(
+        _export_file,
+        masks_dir=masks_dir,
+        mode=mode,
+        palette=palette,
+        compress_level=compress_level,
+    )
+    if workers is None or workers <= 1:
+        # Categories met in a file but missing from the classes of its ``AnnotationFile`` are
+        # seen by the next files
+        for annotation_file in annotation_files:
+            categories = export_file(annotation_file, categories=categories)
+    else:
+        # In the pool, such categories are only seen by the next files of the same chunk. A mask
+        # only depends on the categories once those of its file are added, so the files rendered
+        # with other categories than in a serial export are rendered again here
+        rendered = map_in_pool(
+            partial(export_file, categories=list(categories)),
+            iter(annotation_files),
+            workers,
+        )
+        for annotation_file, file_categories in zip(annotation_files, rendered):
+            categories.extend(c for c in file_categories if c not in categories)
+            if file_categories != categories:
+                export_file(annotation_file, categories=list(categories))
 
-        if errors:
-            print(f"Errors rendering {annotation_file.filename}:")
-            for e in errors:
-                print(e)
-
-            raise DarwinException.from_multiple_exceptions(errors)
-
-        # Map to palette
-        mask = np.array(
-            mask, dtype=np.uint8
-        )  # Final double check that type is using correct dtype
-
-        if mode == "rgb":
-            rgb_colours, palette_rgb = get_rgb_colours(categories)
-            image = Image.fromarray(mask, "P")
-            image.putpalette(rgb_colours)
-            image = image.convert("RGB")
-        elif mode == "grey":
-            for value, colour in enumerate(palette.values()):
-                mask = np.where(mask == value, colour, mask)
-            image = Image.fromarray(mask)
-        else:
-            image = Image.fromarray(mask)
-        image.save(outfile)
+    if mode == "rgb":
+        _, palette_rgb = get_rgb_colours(categories)
 
     with open(output_dir / "class_mapping.csv", "w", newline="") as f:
         writer = csv_writer(f)
@@ -503,6 +519,90 @@ def export(
                 writer.writerow([class_key, f"{palette[class_key]}"])
 
 
+def _export_file(
+    annotation_file: dt.AnnotationFile,
+    masks_dir: Path,
+    mode: dt.MaskTypes.Mode,
+    categories: dt.MaskTypes.CategoryList,
+    palette: dt.MaskTypes.Palette,
+    compress_level: Optional[int],
+) -> dt.MaskTypes.CategoryList:
+    # Renders the mask of the given file and returns the categories, with any met for the first
+    # time appended to them
+    image_rel_path = os.path.splitext(annotation_file.full_path)[0].lstrip("/")
+    outfile = masks_dir / f"{image_rel_path}.png"
+    outfile.parent.mkdir(parents=True, exist_ok=True)
+
+    height = annotation_file.image_height
+    width = annotation_file.image_width
+    if height is None or width is None:
+        raise ValueError(
+            f"Annotation file {annotation_file.filename} references an image with no height or width"
+        )
+
+    mask: NDArray = np.zeros((height, width), dtype=np.uint8)
+    annotations: List[dt.AnnotationLike] = [
+        a
+        for a in annotation_file.annotations
+        if a.annotation_class.annotation_type in ACCEPTED_TYPES
+    ]
+
+    render_type = get_render_mode(annotations)
+    renderer = render_raster if render_type == "raster" else render_polygons
+    errors, mask, categories, _ = renderer(
+        mask, {}, categories, annotations, annotation_file, height, width
+    )
+
+    if errors:
+        print(f"Errors rendering {annotation_file.filename}:")
+        for e in errors:
+            print(e)
+
+        raise DarwinException.from_multiple_exceptions(errors)
+
+    # Map to palette
+    mask = np.asarray(
+        mask, dtype=np.uint8
+    )  # Final double check that type is using correct dtype
+
+    if mode == "rgb":
+        rgb_colours, _ = get_rgb_colours(categories)
+        image = Image.fromarray(mask, "P")
+        image.putpalette(rgb_colours)
+        image = image.convert("RGB")
+    elif mode == "grey":
+        # A single lookup replaces each class index by its grey level
+        lut = np.arange(256, dtype=np.uint8)
+        lut[: len(palette)] = list(palette.values())
+        image = Image.fromarray(lut[mask])
+    else:
+        image = Image.fromarray(mask)
+
+    if compress_level is None:
+        image.save(outfile)
+    else:
+        image.save(outfile, compress_level=compress_level)
+    return categories
+
+
+def _get_png_compress_level() -> Optional[int]:
+    """
+    Returns the zlib compression level of the PNG masks, from 0 to 9, or ``None`` for the default
+    of Pillow.
+
+    Can be set with the ``DARWIN_MASK_PNG_COMPRESS_LEVEL`` environment variable.
+    """
+    env_level: Optional[str] = os.getenv("DARWIN_MASK_PNG_COMPRESS_LEVEL")
+    if not env_level:
+        return None
+    if not env_level.strip().isdigit() or not 0 <= int(env_level) <= 9:
+        raise ValueError(
+            "DARWIN_MASK_PNG_COMPRESS_LEVEL must be an integer from 0 to 9, "
+            f"got '{env_level}'"
+        )
+    return int(env_level)
+
+
 def annotations_exceed_window(
     annotations: List[dt.Annotation], height: int, width: int
 ) -> bool:
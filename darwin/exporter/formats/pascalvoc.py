@@ -1,9 +1,11 @@
+from functools import partial
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Optional
 from xml.etree.ElementTree import Element, SubElement, tostring
 
 
 import darwin.datatypes as dt
+from darwin.exporter.exporter import run_in_threads
 
 DEPRECATION_MESSAGE = """
 
@@ -21,7 +23,11 @@ changes in its interface and implementation are to be expected. We encourage no
 """
 
 
-def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> None:
+def export(
+    annotation_files: Iterable[dt.AnnotationFile],
+    output_dir: Path,
+    workers: Optional[int] = None,
+) -> None:
     """
     Exports the given ``AnnotationFile``\\s into the pascalvoc format inside of the given
     ``output_dir``.
@@ -32,14 +38,24 @@ def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> N
         The ``AnnotationFile``\\s to be exported.
     output_dir : Path
         The folder where the new pascalvoc files will be.
+    workers : Optional[int], default: None
+        Number of threads writing the files.
     """
-    for annotation_file in annotation_files:
-        _export_file(annotation_file, output_dir)
+    run_in_threads(
+        partial(_export_file, output_dir=output_dir),
+        annotation_files,
+        workers,
+        key=partial(_get_output_file_path, output_dir=output_dir),
+    )
+
+
+def _get_output_file_path(annotation_file: dt.AnnotationFile, output_dir: Path) -> Path:
+    return (output_dir / annotation_file.filename).with_suffix(".xml")
 
 
 def _export_file(annotation_file: dt.AnnotationFile, output_dir: Path) -> None:
     xml = _build_xml(annotation_file)
-    output_file_path = (output_dir / annotation_file.filename).with_suffix(".xml")
+    output_file_path = _get_output_file_path(annotation_file, output_dir)
     output_file_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_file_path, "wb") as f:
         f.write(tostring(xml))
@@ -1,11 +1,15 @@
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import darwin.datatypes as dt
 from darwin.exporter.formats.mask import export as export_mask
 
 
-def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> None:
+def export(
+    annotation_files: Iterable[dt.AnnotationFile],
+    output_dir: Path,
+    workers: Optional[int] = None,
+) -> None:
     """
     Exports the given ``AnnotationFile``\\s into semantic masks inside of the given ``output_dir``.
 
@@ -15,7 +19,12 @@ def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> N
         The ``AnnotationFile``\\s to be exported.
     output_dir : Path
         The folder where the new semantic mask files will be.
+    workers : Optional[int], default: None
+        Number of processes rendering the masks.
     """
     return export_mask(
-        annotation_files=annotation_files, output_dir=output_dir, mode="rgb"
+        annotation_files=annotation_files,
+        output_dir=output_dir,
+        mode="rgb",
+        workers=workers,
     )
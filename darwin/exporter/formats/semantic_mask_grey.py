@@ -1,11 +1,18 @@
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import darwin.datatypes as dt
 from darwin.exporter.formats.mask import export as export_mask
 
 
-def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> None:
+def export(
+    annotation_files: Iterable[dt.AnnotationFile],
+    output_dir: Path,
+    workers: Optional[int] = None,
+) -> None:
     return export_mask(
-        annotation_files=annotation_files, output_dir=output_dir, mode="grey"
+        annotation_files=annotation_files,
+        output_dir=output_dir,
+        mode="grey",
+        workers=workers,
     )
@@ -1,16 +1,21 @@
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import darwin.datatypes as dt
 from darwin.exporter.formats.helpers.yolo_class_builder import (
     ClassIndex,
     build_class_index,
-    export_file,
+    export_files,
     save_class_index,
 )
 
 
-def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> None:
+def export(
+    annotation_files: Iterable[dt.AnnotationFile],
+    output_dir: Path,
+    class_index: Optional[ClassIndex] = None,
+    workers: Optional[int] = None,
+) -> None:
     """
     Exports the given ``AnnotationFile``\\s into the YOLO format inside of the given
     ``output_dir``.
@@ -21,14 +26,19 @@ def export(annotation_files: Iterable[dt.AnnotationFile], output_dir: Path) -> N
         The ``AnnotationFile``\\s to be exported.
     output_dir : Path
         The folder where the new pascalvoc files will be.
+    class_index : Optional[ClassIndex], default: None
+        The index of every class of the ``AnnotationFile``\\s, e.g. from ``scan_class_index``. If
+        given, files are written as the ``AnnotationFile``\\s are read instead of once all of them
+        are in memory.
+    workers : Optional[int], default: None
+        Number of threads writing the files.
     """
 
-    annotation_files = list(annotation_files)
+    if class_index is None:
+        annotation_files = list(annotation_files)
+        class_index = build_class_index(annotation_files)
 
-    class_index = build_class_index(annotation_files)
-
-    for annotation_file in annotation_files:
-        export_file(annotation_file, class_index, output_dir, _build_txt)
+    export_files(annotation_files, class_index, output_dir, _build_txt, workers)
 
     save_class_index(class_index, output_dir)
 
@@ -2,14 +2,14 @@ from collections import namedtuple
 from enum import Enum, auto
 from logging import getLogger
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 from darwin.datatypes import Annotation, AnnotationFile, VideoAnnotation
 from darwin.exceptions import DarwinException
 from darwin.exporter.formats.helpers.yolo_class_builder import (
     ClassIndex,
     build_class_index,
-    export_file,
+    export_files,
     save_class_index,
 )
 
@@ -21,7 +21,12 @@ CLOSE_VERTICES: bool = False  # Set true if polygons need to be closed
 Point = namedtuple("Point", ["x", "y"])
 
 
-def export(annotation_files: Iterable[AnnotationFile], output_dir: Path) -> None:
+def export(
+    annotation_files: Iterable[AnnotationFile],
+    output_dir: Path,
+    class_index: Optional[ClassIndex] = None,
+    workers: Optional[int] = None,
+) -> None:
     """
     Exports YoloV8 format as segments
 
@@ -31,20 +36,25 @@ def export(annotation_files: Iterable[AnnotationFile], output_dir: Path) -> None
         The ``AnnotationFile``\\s to be exported.
     output_dir : Path
         The folder where the new pascalvoc files will be.
+    class_index : Optional[ClassIndex], default: None
+        The index of every class of the ``AnnotationFile``\\s, e.g. from ``scan_class_index``. If
+        given, files are written as the ``AnnotationFile``\\s are read instead of once all of them
+        are in memory.
+    workers : Optional[int], default: None
+        Number of threads writing the files.
 
     Returns
     -------
     None
     """
-    annotation_files = list(annotation_files)
-
-    class_index: ClassIndex = build_class_index(
-        # fmt: off
-        annotation_files, ["bounding_box", "polygon"]
-    )  # fmt: on
-
-    for annotation_file in annotation_files:
-        export_file(annotation_file, class_index, output_dir, _build_text)
+    if class_index is None:
+        annotation_files = list(annotation_files)
+        class_index = build_class_index(
+            # fmt: off
+            annotation_files, ["bounding_box", "polygon"]
+        )  # fmt: on
+
+    export_files(annotation_files, class_index, output_dir, _build_text, workers)
 
     save_class_index(class_index, output_dir)
 
@@ -1,6 +1,10 @@
 import concurrent.futures
+import json
+import os
+import threading
 import uuid
 from collections import defaultdict
+from contextlib import contextmanager
 from functools import partial
 from logging import getLogger
 from multiprocessing import cpu_count
@@ -13,6 +17,7 @@ from typing import (
     Dict,
     Generator,
     Iterable,
+    Iterator,
     List,
     Optional,
     Set,
@@ -20,6 +25,7 @@ from typing import (
     Union,
 )
 
+from darwin.dataset.remote_index import REMOTE_INDEX_FILE_NAME, RemoteItemIndex
 from darwin.datatypes import AnnotationFile, Property, parse_property_classes
 from darwin.future.data_objects.properties import (
     FullProperty,
@@ -43,7 +49,11 @@ from rich.theme import Theme
 
 import darwin.datatypes as dt
 from darwin.datatypes import PathLike
-from darwin.exceptions import IncompatibleOptions, RequestEntitySizeExceeded
+from darwin.exceptions import (
+    IncompatibleOptions,
+    NotFound,
+    RequestEntitySizeExceeded,
+)
 from darwin.utils import secure_continue_request
 from darwin.utils.flatten_list import flatten_list
 
@@ -56,6 +66,18 @@ try:
 except ImportError:
     MPIRE_AVAILABLE = False
 
+# Item types annotations can be imported to
+REMOTE_FILE_TYPES = "image,playback_video,video_frame"
+
+# Default number of chunks of filenames resolved to remote files concurrently
+DEFAULT_LOOKUP_CONCURRENCY = 8
+
+# Default upper bound, in bytes of serialized payloads, of a batch of annotation imports
+DEFAULT_IMPORT_BATCH_BYTES = 8 * 1024 * 1024
+
+# Annotation import for a single item: the parsed file, the id of its remote item and its payload
+ImportRequest = Tuple[dt.AnnotationFile, Union[str, int], dt.DictFreeForm]
+
 # Classes missing import support on backend side
 UNSUPPORTED_CLASSES = ["string", "graph"]
 
@@ -183,10 +205,14 @@ def _build_attribute_lookup(dataset: "RemoteDataset") -> Dict[str, Unknown]:
 
 
 def _get_remote_files(
-    dataset: "RemoteDataset", filenames: List[str], chunk_size: int = 100
+    dataset: "RemoteDataset",
+    filenames: List[str],
+    chunk_size: int = 100,
+    max_workers: int = 1,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Fetches remote files from the datasets in chunks; by default 100 filenames at a time.
+    Up to ``max_workers`` chunks are fetched concurrently.
 
     The output is a dictionary for each remote file with the following keys:
     - "item_id": Item ID
@@ -195,18 +221,105 @@ def _get_remote_files(
 
     Fetching slot names & layout is necessary here to avoid double-trip to API downstream for remote files.
     """
+
+    def fetch_chunk(chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+        return _to_remote_files_lookup(
+            dataset.fetch_remote_files(
+                {"types": REMOTE_FILE_TYPES, "item_names": chunk}
+            )
+        )
+
+    # Duplicated names, e.g. the same file in several folders, only need to be looked up once
+    filenames = list(dict.fromkeys(filenames))
+    chunks = [
+        filenames[i : i + chunk_size] for i in range(0, len(filenames), chunk_size)
+    ]
+
     remote_files = {}
-    for i in range(0, len(filenames), chunk_size):
-        chunk = filenames[i : i + chunk_size]
-        for remote_file in dataset.fetch_remote_files(
-            {"types": "image,playback_video,video_frame", "item_names": chunk}
-        ):
-            slot_names = _get_slot_names(remote_file)
-            remote_files[remote_file.full_path] = {
-                "item_id": remote_file.id,
-                "slot_names": slot_names,
-                "layout": remote_file.layout,
-            }
+    if max_workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            remote_files.update(fetch_chunk(chunk))
+        return remote_files
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_files in executor.map(fetch_chunk, chunks):
+            remote_files.update(chunk_files)
+    return remote_files
+
+
+def _to_remote_files_lookup(
+    remote_items: Iterable[DatasetItem],
+) -> Dict[str, Dict[str, Any]]:
+    return {
+        remote_file.full_path: {
+            "item_id": remote_file.id,
+            "slot_names": _get_slot_names(remote_file),
+            "layout": remote_file.layout,
+        }
+        for remote_file in remote_items
+    }
+
+
+def _fetch_remote_files_by_name(
+    dataset: "RemoteDataset", filenames: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetches the remote files matching the given filenames, halving the chunk size every time a
+    chunk of filenames is too large for the request URL.
+
+    The chunk size and the number of chunks fetched concurrently start at the values of the
+    ``DARWIN_IMPORT_LOOKUP_CHUNK_SIZE`` and ``DARWIN_IMPORT_LOOKUP_CONCURRENCY`` environment
+    variables, 100 and 8 by default.
+
+    Raises
+    ------
+    ValueError
+        If the remote files cannot be fetched even one filename at a time.
+    """
+    chunk_size = _get_env_int("DARWIN_IMPORT_LOOKUP_CHUNK_SIZE", 100)
+    max_workers = _get_env_int(
+        "DARWIN_IMPORT_LOOKUP_CONCURRENCY", DEFAULT_LOOKUP_CONCURRENCY
+    )
+    while True:
+        try:
+            return _get_remote_files(dataset, filenames, chunk_size, max_workers)
+        except RequestEntitySizeExceeded:
+            if chunk_size == 1:
+                raise ValueError("Unable to fetch remote file list.")
+            chunk_size = max(chunk_size // 2, 1)
+
+
+def _get_indexed_remote_files(
+    dataset: "RemoteDataset", parsed_files: List[dt.AnnotationFile]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolves the given annotation files to remote files through the ``RemoteItemIndex`` kept in the
+    local directory of the dataset.
+
+    The first time the index is used, all the items of the dataset are fetched into it. Files that
+    are not in the index afterwards, e.g. items registered since or whose entry expired, are fetched
+    by name and added to it. Deleting the index file forces the whole dataset to be fetched again.
+    """
+    full_paths = [parsed_file.full_path for parsed_file in parsed_files]
+    index_path = dataset.local_path / REMOTE_INDEX_FILE_NAME
+    with RemoteItemIndex(index_path, dataset.dataset_id) as index:
+        if not len(index):
+            index.update(
+                _to_remote_files_lookup(
+                    dataset.fetch_remote_files({"types": REMOTE_FILE_TYPES})
+                )
+            )
+
+        remote_files = index.get(full_paths)
+        missing_filenames = [
+            parsed_file.filename
+            for parsed_file in parsed_files
+            if parsed_file.full_path not in remote_files
+        ]
+        if missing_filenames:
+            fetched_files = _fetch_remote_files_by_name(dataset, missing_filenames)
+            index.update(fetched_files)
+            remote_files.update(fetched_files)
     return remote_files
 
 
@@ -703,6 +816,8 @@ def import_annotations(  # noqa: C901
     use_multi_cpu: bool = False,
     cpu_limit: Optional[int] = None,
     no_legacy: Optional[bool] = False,
+    use_remote_index: bool = False,
+    batch_size: Optional[int] = None,
 ) -> None:
     """
     Imports the given given Annotations into the given Dataset.
@@ -747,10 +862,24 @@ def import_annotations(  # noqa: C901
     no_legacy : bool, default: False
         If ``True`` will not use the legacy isotropic transformation to resize annotations
         If ``False`` will use the legacy isotropic transformation to resize annotations
+    use_remote_index : bool, default: False
+        If ``True``, annotation files are resolved to remote items through an index of the whole
+        dataset cached in its local directory and reused across imports. The index is built on
+        first use and only files missing from it are fetched from the API afterwards. Entries
+        expire after ``DARWIN_REMOTE_INDEX_TTL`` seconds (a day by default), items the API reports
+        as not found are dropped from it, and deleting ``.remote_items_index.sqlite`` from the
+        local directory of the dataset clears it.
+    batch_size : Optional[int], default: None
+        If given, the payloads are grouped into batches of up to ``batch_size`` items, bounded in
+        size by the ``DARWIN_IMPORT_BATCH_BYTES`` environment variable (8 MiB by default). Payloads
+        are built and batches are sent on pools of ``cpu_limit`` threads when ``use_multi_cpu`` is
+        ``True`` and of one otherwise. The API imports one item per request, so the items of a
+        batch are sent one after the other and their failures are reported separately.
     Raises
     -------
     ValueError
         - If ``file_paths`` is not a list.
+        - If ``batch_size`` is smaller than 1.
         - If the application is unable to fetch any remote classes.
         - If the application was unable to find/parse any annotation files.
         - If the application was unable to fetch remote file list.
@@ -774,6 +903,9 @@ def import_annotations(  # noqa: C901
             "The options 'append' and 'delete_for_empty' cannot be used together. Use only one of them."
         )
 
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1. Current value: {batch_size}")
+
     cpu_limit, use_multi_cpu = _get_multi_cpu_settings(
         cpu_limit, cpu_count(), use_multi_cpu
     )
@@ -812,6 +944,8 @@ def import_annotations(  # noqa: C901
     local_files = []
     local_files_missing_remotely = []
 
+    metrics = _ImportMetrics()
+    parse_start = perf_counter()
     maybe_parsed_files: Optional[Iterable[dt.AnnotationFile]] = _find_and_parse(
         importer, file_paths, console, use_multi_cpu, cpu_limit
     )
@@ -820,6 +954,7 @@ def import_annotations(  # noqa: C901
         raise ValueError("Not able to parse any files.")
 
     parsed_files: List[AnnotationFile] = flatten_list(list(maybe_parsed_files))
+    metrics.add("parse", perf_counter() - parse_start, len(parsed_files))
 
     filenames: List[str] = [
         parsed_file.filename for parsed_file in parsed_files if parsed_file is not None
@@ -828,19 +963,11 @@ def import_annotations(  # noqa: C901
     console.print("Fetching remote file list...", style="info")
     # This call will only filter by filename; so can return a superset of matched files across different paths
     # There is logic in this function to then include paths to narrow down to the single correct matching file
-    remote_files: Dict[str, Dict[str, Any]] = {}
-
-    # Try to fetch files in large chunks; in case the filenames are too large and exceed the url size
-    # retry in smaller chunks
-    chunk_size = 100
-    while chunk_size > 0:
-        try:
-            remote_files = _get_remote_files(dataset, filenames, chunk_size)
-            break
-        except RequestEntitySizeExceeded:
-            chunk_size -= 8
-            if chunk_size <= 0:
-                raise ValueError("Unable to fetch remote file list.")
+    remote_files: Dict[str, Dict[str, Any]]
+    if use_remote_index:
+        remote_files = _get_indexed_remote_files(dataset, parsed_files)
+    else:
+        remote_files = _fetch_remote_files_by_name(dataset, filenames)
 
     for parsed_file in parsed_files:
         if parsed_file.full_path not in remote_files:
@@ -955,115 +1082,119 @@ def import_annotations(  # noqa: C901
         if not continue_to_overwrite:
             return
 
-    def import_annotation(parsed_file):
+    def get_import_target(parsed_file):
         image_id = remote_files[parsed_file.full_path]["item_id"]
         default_slot_name = remote_files[parsed_file.full_path]["slot_names"][0]
         if parsed_file.slots and parsed_file.slots[0].name:
             default_slot_name = parsed_file.slots[0].name
+        return image_id, default_slot_name
 
-        metadata_path = is_properties_enabled(parsed_file.path)
-
-        errors, _ = _import_annotations(
-            dataset.client,
-            image_id,
-            remote_classes,
-            attributes,
-            parsed_file.annotations,
-            default_slot_name,
-            dataset,
-            append,
-            delete_for_empty,
-            import_annotators,
-            import_reviewers,
-            metadata_path,
-        )
+    files_to_import = []
+    for parsed_file in local_files:
+        if not parsed_file.annotations and not delete_for_empty:
+            console.print(
+                f"{parsed_file.filename} has no annotations. Skipping upload...",
+                style="warning",
+            )
+        else:
+            files_to_import.append(parsed_file)
+    if files_to_import:
+        _warn_unsupported_annotations(files_to_import)
+
+    def build_import_request(parsed_file):
+        image_id, default_slot_name = get_import_target(parsed_file)
+        with metrics.measure("payload"):
+            payload = _build_import_payload(
+                dataset.client,
+                remote_classes,
+                attributes,
+                parsed_file.annotations,
+                default_slot_name,
+                dataset,
+                append,
+                import_annotators,
+                import_reviewers,
+                is_properties_enabled(parsed_file.path),
+            )
+        return parsed_file, image_id, payload
+
+    def try_build_import_request(parsed_file):
+        try:
+            return parsed_file, build_import_request(parsed_file), []
+        except Exception as e:
+            return parsed_file, None, [e]
+
+    def import_file(parsed_file):
+        parsed_file, import_request, errors = try_build_import_request(parsed_file)
+        if import_request is None:
+            return parsed_file, errors
+        return _send_import_request(dataset, import_request, metrics)
 
+    failed_files = []
+    # Indexed items the API no longer knows about, e.g. deleted or moved since they were indexed
+    stale_full_paths = []
+
+    def report(parsed_file, errors):
         if errors:
+            failed_files.append(parsed_file)
+            if use_remote_index and any(isinstance(e, NotFound) for e in errors):
+                stale_full_paths.append(parsed_file.full_path)
             console.print(f"Errors importing {parsed_file.filename}", style="error")
             for error in errors:
                 console.print(f"\t{error}", style="error")
 
-    def process_local_file(local_file):
-        if local_file is None:
-            parsed_files = []
-        elif not isinstance(local_file, List):
-            parsed_files = [local_file]
+    # A pool of ``max_workers`` threads runs the whole import phase, so the number of payloads
+    # being built and requests in flight is bounded by ``cpu_limit``. In batch mode, payloads are
+    # built on one such pool and the batches they are grouped into are sent on another
+    max_workers = cpu_limit if use_multi_cpu else 1
+    import_start = perf_counter()
+    with tqdm(total=len(files_to_import), desc="Importing annotations") as progress:
+        if batch_size is None:
+            results = _run_bounded(import_file, files_to_import, max_workers)
         else:
-            parsed_files = local_file
-
-        # Remove files missing on the server
-        missing_files = [
-            missing_file.full_path for missing_file in local_files_missing_remotely
-        ]
-        parsed_files = [
-            parsed_file
-            for parsed_file in parsed_files
-            if parsed_file.full_path not in missing_files
-        ]
 
-        files_to_not_track = [
-            file_to_track
-            for file_to_track in parsed_files
-            if not file_to_track.annotations and (not delete_for_empty)
-        ]
-
-        for file in files_to_not_track:
-            console.print(
-                f"{file.filename} has no annotations. Skipping upload...",
-                style="warning",
+            def built_import_requests():
+                for parsed_file, import_request, errors in _run_bounded(
+                    try_build_import_request, files_to_import, max_workers
+                ):
+                    if import_request is None:
+                        report(parsed_file, errors)
+                        progress.update()
+                    else:
+                        yield import_request
+
+            results = _import_annotations_in_batches(
+                dataset,
+                built_import_requests(),
+                batch_size,
+                max_workers,
+                metrics=metrics,
             )
 
-        files_to_track = [
-            file for file in parsed_files if file not in files_to_not_track
-        ]
-        if files_to_track:
-            _warn_unsupported_annotations(files_to_track)
-
-            if use_multi_cpu:
-                with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=cpu_limit
-                ) as executor:
-                    futures = [
-                        executor.submit(import_annotation, file)
-                        for file in files_to_track
-                    ]
-                    for _ in tqdm(
-                        concurrent.futures.as_completed(futures),
-                        total=len(futures),
-                        desc="Importing annotations from local file",
-                    ):
-                        future = next(concurrent.futures.as_completed(futures))
-                        try:
-                            future.result()
-                        except Exception as exc:
-                            console.print(
-                                f"Generated an exception: {exc}", style="error"
-                            )
-            else:
-                for file in tqdm(
-                    files_to_track, desc="Importing annotations from local file"
-                ):
-                    import_annotation(file)
+        for parsed_file, errors in results:
+            report(parsed_file, errors)
+            progress.update()
 
-    if use_multi_cpu:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=cpu_limit) as executor:
-            futures = [
-                executor.submit(process_local_file, local_file)
-                for local_file in local_files
-            ]
-            for _ in tqdm(
-                concurrent.futures.as_completed(futures),
-                total=len(futures),
-                desc="Processing local annotation files",
-            ):
-                future = next(concurrent.futures.as_completed(futures))
-                try:
-                    future.result()
-                except Exception as exc:
-                    console.print(f"Generated an exception: {exc}", style="error")
-    else:
-        for local_file in tqdm(local_files, desc="Processing local annotation files"):
-            process_local_file(local_file)
+    if stale_full_paths:
+        with RemoteItemIndex(
+            dataset.local_path / REMOTE_INDEX_FILE_NAME, dataset.dataset_id
+        ) as index:
+            index.remove(stale_full_paths)
+        console.print(
+            f"Removed {len(stale_full_paths)} item(s) that no longer exist from the remote index, "
+            "they will be fetched again on the next import.",
+            style="warning",
+        )
+    if failed_files:
+        console.print(
+            f"{len(failed_files)} of {len(files_to_import)} file(s) failed to import.",
+            style="error",
+        )
+    console.print(
+        f"Imported {len(files_to_import) - len(failed_files)} file(s) in {perf_counter() - import_start:.2f}s "
+        f"using {max_workers} worker(s) ({metrics.summary()})",
+        style="info",
+    )
 
 
 def _get_multi_cpu_settings(
@@ -1321,23 +1452,22 @@ def _parse_empty_masks(
     return raster_layer_dense_rle_ids, raster_layer_dense_rle_ids_frames
 
 
-def _import_annotations(
-    client: "Client",  # TODO: This is unused, should it be?
-    id: Union[str, int],
+def _build_import_payload(
+    client: "Client",
     remote_classes: dt.DictFreeForm,
     attributes: dt.DictFreeForm,
     annotations: List[dt.Annotation],
     default_slot_name: str,
     dataset: "RemoteDataset",
     append: bool,
-    delete_for_empty: bool,  # TODO: This is unused, should it be?
     import_annotators: bool,
     import_reviewers: bool,
     metadata_path: Union[Path, bool] = False,
-) -> Tuple[dt.ErrorList, dt.Success]:
-    errors: dt.ErrorList = []
-    success: dt.Success = dt.Success.SUCCESS
-
+) -> dt.DictFreeForm:
+    """
+    Serializes the given annotations into the payload sent to import them into a single item.
+    Annotations whose class is not in ``remote_classes`` are skipped.
+    """
     raster_layer: Optional[dt.Annotation] = None
     raster_layer_dense_rle_ids: Optional[Set[str]] = None
     raster_layer_dense_rle_ids_frames: Optional[Dict[int, Set[str]]] = None
@@ -1429,14 +1559,215 @@ def _import_annotations(
 
     payload: dt.DictFreeForm = {"annotations": serialized_annotations}
     payload["overwrite"] = _get_overwrite_value(append)
+    return payload
+
+
+def _get_env_int(name: str, default: int) -> int:
+    """
+    Returns the value of the given environment variable as a positive integer, or ``default`` if
+    it is not set.
+    """
+    env_value: Optional[str] = os.getenv(name)
+    if env_value and int(env_value) > 0:
+        return int(env_value)
+    return default
+
+
+def _get_import_batch_bytes(default: int = DEFAULT_IMPORT_BATCH_BYTES) -> int:
+    """
+    Returns the maximum size, in bytes of serialized payloads, of a batch of annotation imports.
+
+    Can be overridden with the ``DARWIN_IMPORT_BATCH_BYTES`` environment variable.
+    """
+    return _get_env_int("DARWIN_IMPORT_BATCH_BYTES", default)
+
+
+def _batch_import_requests(
+    import_requests: Iterable[ImportRequest], batch_size: int, max_batch_bytes: int
+) -> Generator[List[ImportRequest], None, None]:
+    """
+    Groups the given import requests into batches of at most ``batch_size`` items whose payloads
+    add up to at most ``max_batch_bytes`` once serialized. A single payload larger than
+    ``max_batch_bytes`` is sent on its own.
+
+    Parameters
+    ----------
+    import_requests : Iterable[ImportRequest]
+        The import requests to group. They are consumed lazily.
+    batch_size : int
+        Maximum number of items per batch.
+    max_batch_bytes : int
+        Maximum size of the serialized payloads of a batch.
+
+    Returns
+    -------
+    Generator[List[ImportRequest], None, None]
+        The batches, in the order of ``import_requests``.
+    """
+    batch: List[ImportRequest] = []
+    batch_bytes = 0
+    for import_request in import_requests:
+        payload_bytes = len(json.dumps(import_request[2]))
+        if batch and (
+            len(batch) >= batch_size or batch_bytes + payload_bytes > max_batch_bytes
+        ):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(import_request)
+        batch_bytes += payload_bytes
+    if batch:
+        yield batch
+
+
+class _ImportMetrics:
+    """
+    Thread-safe record of the time spent in, and the number of items processed by, each stage of
+    an import. Times of stages run concurrently add up, so they can exceed the elapsed time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
 
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.counts[stage] += count
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, perf_counter() - start)
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{stage}: {self.counts[stage]} in {seconds:.2f}s"
+            for stage, seconds in self.seconds.items()
+        )
+
+
+def _run_bounded(
+    function: Callable[[Any], Any], items: Iterable[Any], max_workers: int
+) -> Generator[Any, None, None]:
+    """
+    Applies ``function`` to every item on a pool of ``max_workers`` threads and yields the results
+    as they complete. Items are consumed lazily: no more than twice ``max_workers`` of them are
+    submitted to the pool at any time.
+
+    Parameters
+    ----------
+    function : Callable[[Any], Any]
+        Function to apply to each item.
+    items : Iterable[Any]
+        The items to process.
+    max_workers : int
+        Number of threads of the pool.
+
+    Returns
+    -------
+    Generator[Any, None, None]
+        The results of ``function``, in completion order.
+    """
+    max_pending = 2 * max_workers
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Set[concurrent.futures.Future] = set()
+        for item in items:
+            if len(pending) >= max_pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(function, item))
+
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+
+def _send_import_request(
+    dataset: "RemoteDataset",
+    import_request: ImportRequest,
+    metrics: Optional[_ImportMetrics] = None,
+) -> Tuple[dt.AnnotationFile, dt.ErrorList]:
+    """
+    Imports the annotations of a single item, returning its file with the error raised while
+    importing it, if any, instead of raising it.
+    """
+    parsed_file, item_id, payload = import_request
+    start = perf_counter()
     try:
-        dataset.import_annotation(id, payload=payload)
+        dataset.import_annotation(item_id, payload=payload)
+        return parsed_file, []
     except Exception as e:
-        errors.append(e)
-        success = dt.Success.FAILURE
+        return parsed_file, [e]
+    finally:
+        if metrics is not None:
+            metrics.add("http", perf_counter() - start)
+
+
+def _send_import_batch(
+    dataset: "RemoteDataset",
+    batch: List[ImportRequest],
+    metrics: Optional[_ImportMetrics] = None,
+) -> List[Tuple[dt.AnnotationFile, dt.ErrorList]]:
+    """
+    Imports every item of the given batch, one request per item, and returns the file of each
+    item with its own errors, so that a failing item does not stop the rest of the batch.
+    """
+    return [
+        _send_import_request(dataset, import_request, metrics)
+        for import_request in batch
+    ]
+
+
+def _import_annotations_in_batches(
+    dataset: "RemoteDataset",
+    import_requests: Iterable[ImportRequest],
+    batch_size: int,
+    max_in_flight: int,
+    max_batch_bytes: Optional[int] = None,
+    metrics: Optional[_ImportMetrics] = None,
+) -> Generator[Tuple[dt.AnnotationFile, dt.ErrorList], None, None]:
+    """
+    Imports the given requests in batches through ``_run_bounded``, with at most ``max_in_flight``
+    batches being sent at any time. Requests are consumed lazily, so payloads are only held until
+    their batch is sent.
+
+    Parameters
+    ----------
+    dataset : RemoteDataset
+        Dataset the annotations are imported to.
+    import_requests : Iterable[ImportRequest]
+        The import requests to send.
+    batch_size : int
+        Maximum number of items per batch.
+    max_in_flight : int
+        Maximum number of batches being sent concurrently.
+    max_batch_bytes : Optional[int], default: None
+        Maximum size of the serialized payloads of a batch. Defaults to the value returned by
+        ``_get_import_batch_bytes``.
+    metrics : Optional[_ImportMetrics], default: None
+        If given, the time spent sending each item is recorded under the ``http`` stage.
 
-    return errors, success
+    Returns
+    -------
+    Generator[Tuple[dt.AnnotationFile, dt.ErrorList], None, None]
+        Every imported file with the errors raised while importing it, as batches complete.
+    """
+    if max_batch_bytes is None:
+        max_batch_bytes = _get_import_batch_bytes()
+
+    for results in _run_bounded(
+        partial(_send_import_batch, dataset, metrics=metrics),
+        _batch_import_requests(import_requests, batch_size, max_batch_bytes),
+        max_in_flight,
+    ):
+        yield from results
 
 
 # mypy: ignore-errors
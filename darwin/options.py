@@ -69,6 +69,12 @@ class Options:
         parser_convert.add_argument(
             "output_dir", type=str, help="Where to store output files."
         )
+        parser_convert.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of processes parsing the annotation files. Parses them in a single process if omitted.",
+        )
 
         # VALIDATE SCHEMA
         parser_validate_schema = subparsers.add_parser(
@@ -184,6 +190,18 @@ class Options:
             help="Preserve the local folder structure in the dataset.",
         )
 
+        parser_push.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume the uploads of a previous push that was interrupted before they were confirmed.",
+        )
+
+        parser_push.add_argument(
+            "--pipelined",
+            action="store_true",
+            help="Start uploading files while the rest are still being registered.",
+        )
+
         # Remove
         parser_remove = dataset_action.add_parser(
             "remove", help="Remove a remote or remote and local dataset."
@@ -307,6 +325,24 @@ class Options:
             default=10,
             help="Time to wait between retries of checking if the release is ready for download.",
         )
+        parser_pull.add_argument(
+            "--engine",
+            type=str,
+            choices=["multiprocessing", "threads"],
+            default="multiprocessing",
+            help="Download engine. 'threads' runs many concurrent transfers on a thread pool of a single process.",
+        )
+        parser_pull.add_argument(
+            "--max-connections-per-host",
+            type=int,
+            default=None,
+            help="Maximum number of connections the 'threads' engine opens to the same host.",
+        )
+        parser_pull.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only parses and downloads items that changed since the previous pull of this dataset.",
+        )
         slots_group = parser_pull.add_mutually_exclusive_group()
         slots_group.add_argument(
             "--force-slots",
@@ -390,6 +426,17 @@ class Options:
             default=1,
             help="Limits amount of cores used on machine to process results, default to single core",
         )
+        parser_import.add_argument(
+            "--batch-size",
+            type=int,
+            required=False,
+            help="Send the annotations in batches of up to this many items, with up to '--cpu-limit' batches in flight.",
+        )
+        parser_import.add_argument(
+            "--remote-index",
+            action="store_true",
+            help="Resolve files to dataset items through a local index of the dataset, built on first use and reused by later imports.",
+        )
 
         # Convert
         parser_convert = dataset_action.add_parser(
@@ -411,6 +458,12 @@ class Options:
         parser_convert.add_argument(
             "-o", "--output_dir", type=str, help="Where to store output files."
         )
+        parser_convert.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of processes parsing the annotation files. Parses them in a single process if omitted.",
+        )
 
         # Split
         parser_split = dataset_action.add_parser(
@@ -437,6 +490,67 @@ class Options:
         parser_split.add_argument(
             "-s", "--seed", type=int, required=False, default=0, help="Split seed."
         )
+        parser_split.add_argument(
+            "--strategy",
+            type=str,
+            choices=["sklearn", "iterative"],
+            default="sklearn",
+            help="Algorithm of the stratified split. 'iterative' assigns whole images, rarest labels first, and scales to large releases.",
+        )
+
+        # Pack
+        parser_pack = dataset_action.add_parser(
+            "pack",
+            help="Packs a local dataset into tar shards, to be read sequentially during training.",
+        )
+        parser_pack.add_argument(
+            "dataset", type=str, help="Local dataset name to pack."
+        )
+        parser_pack.add_argument(
+            "--partition",
+            type=str,
+            choices=["train", "val", "test"],
+            required=False,
+            help="Partition to pack. Packs every annotated image if omitted.",
+        )
+        parser_pack.add_argument(
+            "--split",
+            type=str,
+            default="default",
+            help="Split defining the partitions.",
+        )
+        parser_pack.add_argument(
+            "--split-type",
+            type=str,
+            choices=["random", "stratified"],
+            default="random",
+            help="Type of the split.",
+        )
+        parser_pack.add_argument(
+            "--annotation-type",
+            type=str,
+            default="polygon",
+            help="Annotation type a stratified split was made on.",
+        )
+        parser_pack.add_argument(
+            "--shard-size",
+            type=int,
+            default=256,
+            help="Size of each shard, in megabytes.",
+        )
+        parser_pack.add_argument(
+            "--output-dir",
+            type=str,
+            required=False,
+            help="Where to write the shards. Defaults to the 'shards' directory of the release.",
+        )
+        parser_pack.add_argument(
+            "-s",
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the shuffle of the samples between shards.",
+        )
 
         # List Files
         parser_files = dataset_action.add_parser(
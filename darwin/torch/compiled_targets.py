@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from darwin.dataset.local_dataset import LocalDataset
+
+# Directory, inside a release, where the compiled targets of its datasets are stored
+COMPILED_TARGETS_DIR_NAME: str = ".compiled_targets"
+
+# Bumped whenever the layout of the compiled targets changes
+COMPILED_TARGETS_VERSION: int = 1
+
+
+class CompiledTargets:
+    """
+    Flat NumPy arrays holding the targets of every sample of a dataset, saved as ``.npy`` files and
+    memory-mapped on first access.
+
+    Variable length fields are stored as a ``values`` array and an ``offsets`` array with one more
+    entry than there are rows, so that the values of row ``i`` are
+    ``values[offsets[i]:offsets[i + 1]]``.
+
+    Only the location of the arrays is pickled, so data loader workers map the same files instead
+    of receiving copies of the arrays.
+
+    Parameters
+    ----------
+    path : Path
+        Directory holding the ``.npy`` files.
+
+    Attributes
+    ----------
+    path : Path
+        Directory holding the ``.npy`` files.
+    """
+
+    def __init__(self, path: Path):
+        self.path: Path = path
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return self._arrays[name]
+
+    def __getstate__(self) -> Dict[str, Path]:
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Path]) -> None:
+        self.__init__(state["path"])
+
+    def rows(
+        self, name: str, index: int, offsets_name: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Returns the values of the given row of a variable length field.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field.
+        index : int
+            Index of the row.
+        offsets_name : Optional[str], default: None
+            Name of the offsets of the field. Defaults to ``{name}_offsets``.
+
+        Returns
+        -------
+        np.ndarray
+            A read-only view of the values of the row.
+        """
+        offsets = self[offsets_name or f"{name}_offsets"]
+        return self[name][offsets[index] : offsets[index + 1]]
+
+    @staticmethod
+    def save(path: Path, arrays: Dict[str, np.ndarray]) -> "CompiledTargets":
+        """
+        Writes the given arrays to ``path``, replacing any previous content at once.
+
+        Parameters
+        ----------
+        path : Path
+            Directory to write the ``.npy`` files to.
+        arrays : Dict[str, np.ndarray]
+            The arrays to write, by name.
+
+        Returns
+        -------
+        CompiledTargets
+            The saved targets.
+        """
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        for name, array in arrays.items():
+            np.save(tmp_path / f"{name}.npy", array, allow_pickle=False)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return CompiledTargets(path)
+
+
+def flatten_rows(
+    rows: Sequence[Sequence], dtype: type, width: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flattens variable length rows into a values array and an offsets array.
+
+    Parameters
+    ----------
+    rows : Sequence[Sequence]
+        The rows to flatten.
+    dtype : type
+        Type of the values array.
+    width : Optional[int], default: None
+        If given, every value is itself a sequence of ``width`` elements and the values array has
+        shape ``(n, width)``.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The values and the offsets of each row.
+    """
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(row) for row in rows])
+    shape = (int(offsets[-1]),) if width is None else (int(offsets[-1]), width)
+    values = np.empty(shape, dtype=dtype)
+    for row, start, end in zip(rows, offsets[:-1], offsets[1:]):
+        if end > start:
+            values[start:end] = row
+    return values, offsets
+
+
+def load_or_compile_targets(
+    dataset: LocalDataset, compile: Callable[[], Dict[str, np.ndarray]]
+) -> CompiledTargets:
+    """
+    Returns the compiled targets of the given dataset, compiling them if they were never compiled
+    for its current content.
+
+    Compiled targets are stored in the release of the dataset and keyed by the type of the
+    dataset and its ``get_cache_key``. If the release is read-only they are kept in a temporary
+    directory instead.
+
+    Parameters
+    ----------
+    dataset : LocalDataset
+        The dataset to compile the targets of.
+    compile : Callable[[], Dict[str, np.ndarray]]
+        Function returning the arrays of the targets of every sample of ``dataset``.
+
+    Returns
+    -------
+    CompiledTargets
+        The compiled targets.
+    """
+    name = f"{type(dataset).__name__}_{dataset.get_cache_key(COMPILED_TARGETS_VERSION, type(dataset).__name__)}"
+    path = dataset.release_path / COMPILED_TARGETS_DIR_NAME / name
+    if path.is_dir():
+        return CompiledTargets(path)
+
+    arrays = compile()
+    try:
+        return CompiledTargets.save(path, arrays)
+    except OSError:
+        return CompiledTargets.save(Path(tempfile.mkdtemp()) / name, arrays)
@@ -10,6 +10,11 @@ from darwin.cli_functions import _error, _load_client
 from darwin.client import Client
 from darwin.dataset.identifier import DatasetIdentifier
 from darwin.dataset.local_dataset import LocalDataset
+from darwin.torch.compiled_targets import (
+    CompiledTargets,
+    flatten_rows,
+    load_or_compile_targets,
+)
 from darwin.torch.transforms import (
     Compose,
     ConvertPolygonsToInstanceMasks,
@@ -27,6 +32,7 @@ def get_dataset(
     split_type: str = "random",
     transform: Optional[List] = None,
     client: Optional[Client] = None,
+    cache_index: bool = False,
 ) -> LocalDataset:
     """
     Creates and returns a ``LocalDataset``.
@@ -47,6 +53,8 @@ def get_dataset(
         List of PyTorch transforms.
     client : Optional[Client], default: None
         Client to use to retrieve the dataset.
+    cache_index : bool, default: False
+        Whether to save the files found in the release to an index reused by later calls.
     """
     dataset_functions = {
         "classification": ClassificationDataset,
@@ -72,6 +80,7 @@ def get_dataset(
                 split_type=split_type,
                 release_name=identifier.version,
                 transform=transform,
+                cache_index=cache_index,
             )
 
     _error(
@@ -91,16 +100,24 @@ class ClassificationDataset(LocalDataset):
         torchvision transform function to run on the dataset.
     is_multi_label : bool, default: False
         Whether the dataset is multilabel or not.
+    compiled_targets : Optional[CompiledTargets]
+        Memory-mapped targets of every image, if ``compile_targets`` is ``True``.
 
     Parameters
     ----------
     transform: Optional[Union[Callable, List[Callable]]], default: None
         torchvision function or list to set the ``transform`` attribute. If it is a list, it will
         be composed via torchvision.
+    compile_targets : bool, default: False
+        If ``True``, the tags of every image are converted once into memory-mapped arrays stored
+        in the release, and ``get_target`` reads them instead of parsing annotation files.
     """
 
     def __init__(
-        self, transform: Optional[Union[Callable, List]] = None, **kwargs
+        self,
+        transform: Optional[Union[Callable, List]] = None,
+        compile_targets: bool = False,
+        **kwargs,
     ) -> None:
         super().__init__(annotation_type="tag", **kwargs)
 
@@ -109,6 +126,10 @@ class ClassificationDataset(LocalDataset):
 
         self.transform: Optional[Callable] = transform
 
+        self.compiled_targets: Optional[CompiledTargets] = None
+        if compile_targets:
+            self.compiled_targets = load_or_compile_targets(self, self._compile_targets)
+
         self.is_multi_label = False
         self.check_if_multi_label()
 
@@ -152,45 +173,49 @@ class ClassificationDataset(LocalDataset):
             The target's tensor.
         """
 
-        data = self.parse_json(index)
-        annotations = data.pop("annotations")
-        tags = [
-            a.annotation_class.name
-            for a in annotations
-            if a.annotation_class.annotation_type == "tag"
-        ]
+        if self.compiled_targets is not None:
+            tags = self.compiled_targets.rows("labels", index).tolist()
+        else:
+            tags = self._get_tag_ids(index)
 
         if not self.is_multi_label:
             # Binary or multiclass must have a label per image
             assert len(tags) >= 1, f"No tags were found for index={index}"
-            target: Tensor = torch.tensor(self.classes.index(tags[0]))
+            target: Tensor = torch.tensor(tags[0])
 
         else:
             target = torch.zeros(len(self.classes))
             # one hot encode all the targets, all zeros if the image/frame is without tag
-            for tag in tags:
-                idx = self.classes.index(tag)
+            for idx in tags:
                 target[idx] = 1
 
         return target
 
+    def _get_tag_ids(self, index: int) -> List[int]:
+        data = self.parse_json(index)
+        return [
+            self.classes.index(a.annotation_class.name)
+            for a in data["annotations"]
+            if a.annotation_class.annotation_type == "tag"
+        ]
+
+    def _compile_targets(self) -> Dict[str, np.ndarray]:
+        labels, labels_offsets = flatten_rows(
+            [self._get_tag_ids(i) for i in range(len(self))], np.int64
+        )
+        return {"labels": labels, "labels_offsets": labels_offsets}
+
     def check_if_multi_label(self) -> None:
         """
         Loops over all the ``.json`` files and checks if we have more than one tag in at least one
         file, if yes we assume the dataset is for multi label classification.
         """
-        for idx in range(len(self)):
-            target = self.parse_json(idx)
-            annotations = target.pop("annotations")
-            tags = [
-                a.annotation_class.name
-                for a in annotations
-                if a.annotation_class.annotation_type == "tag"
-            ]
-
-            if len(tags) > 1:
-                self.is_multi_label = True
-                break
+        if self.compiled_targets is not None:
+            tag_counts = np.diff(self.compiled_targets["labels_offsets"])
+            self.is_multi_label = bool(np.any(tag_counts > 1))
+            return
+
+        self.is_multi_label = self.get_label_statistics().is_multi_label
 
     def get_class_idx(self, index: int) -> int:
         """
@@ -220,16 +245,14 @@ class ClassificationDataset(LocalDataset):
         np.ndarray[float]
             Weight for each class in the train set (one for each class) as a 1D array normalized.
         """
-        # Collect all the labels by iterating over the whole dataset
         labels = []
-        for i, _filename in enumerate(self.images_path):
-            target: Tensor = self.get_target(i)
+        for index, tags in enumerate(self.get_label_statistics().class_ids):
             if self.is_multi_label:
                 # get the indices of the class present
-                target = torch.where(target == 1)[0]
-                labels.extend(target.tolist())
+                labels.extend(sorted(set(tags)))
             else:
-                labels.append(target.item())
+                assert len(tags) >= 1, f"No tags were found for index={index}"
+                labels.append(tags[0])
 
         return self._compute_weights(labels)
 
@@ -243,6 +266,10 @@ class InstanceSegmentationDataset(LocalDataset):
     transform: Optional[Union[Callable, List[Callable]]], default: None
         torchvision function or list to set the ``transform`` attribute. If it is a list, it will
         be composed via torchvision.
+    compile_targets : bool, default: False
+        If ``True``, the polygons, boxes, areas and labels of every image are converted once into
+        memory-mapped arrays stored in the release, and ``get_target`` reads them instead of
+        parsing annotation files.
 
     Attributes
     ----------
@@ -252,10 +279,17 @@ class InstanceSegmentationDataset(LocalDataset):
         Whether the dataset is multilabel or not.
     convert_polygons : ConvertPolygonsToInstanceMasks
         Object used to convert polygons to instance masks.
+    compiled_targets : Optional[CompiledTargets]
+        Memory-mapped targets of every image, if ``compile_targets`` is ``True``.
 
     """
 
-    def __init__(self, transform: Optional[Union[Callable, List]] = None, **kwargs):
+    def __init__(
+        self,
+        transform: Optional[Union[Callable, List]] = None,
+        compile_targets: bool = False,
+        **kwargs,
+    ):
         super().__init__(annotation_type="polygon", **kwargs)
 
         if transform is not None and isinstance(transform, list):
@@ -265,6 +299,10 @@ class InstanceSegmentationDataset(LocalDataset):
 
         self.convert_polygons = ConvertPolygonsToInstanceMasks()
 
+        self.compiled_targets: Optional[CompiledTargets] = None
+        if compile_targets:
+            self.compiled_targets = load_or_compile_targets(self, self._compile_targets)
+
     def __getitem__(self, index: int) -> Tuple[Tensor, Dict[str, Any]]:
         """
         Notes
@@ -322,6 +360,83 @@ class InstanceSegmentationDataset(LocalDataset):
         Dict[str, Any]
             The target.
         """
+        if self.compiled_targets is not None:
+            return self._get_compiled_target(index)
+        return self._parse_target(index)
+
+    def _get_compiled_target(self, index: int) -> Dict[str, Any]:
+        compiled = self.compiled_targets
+        category_ids = compiled.rows("category_ids", index, "annotations_offsets")
+        bboxes = compiled.rows("bboxes", index, "annotations_offsets")
+        areas = compiled.rows("areas", index, "annotations_offsets")
+        start = compiled["annotations_offsets"][index]
+        sequences_offsets = compiled["sequences_offsets"]
+
+        annotations = []
+        for i in range(len(category_ids)):
+            sequences = range(
+                sequences_offsets[start + i], sequences_offsets[start + i + 1]
+            )
+            annotations.append(
+                {
+                    "category_id": int(category_ids[i]),
+                    "segmentation": [
+                        compiled.rows("segmentation", s).tolist() for s in sequences
+                    ],
+                    "bbox": bboxes[i].tolist(),
+                    "area": float(areas[i]),
+                }
+            )
+
+        height = int(compiled["heights"][index])
+        width = int(compiled["widths"][index])
+        return {
+            "image_id": index,
+            "image_path": str(self.images_path[index]),
+            "height": height if height >= 0 else None,
+            "width": width if width >= 0 else None,
+            "annotations": annotations,
+        }
+
+    def _compile_targets(self) -> Dict[str, np.ndarray]:
+        targets = [self._parse_target(i) for i in range(len(self))]
+        annotations = [target["annotations"] for target in targets]
+        flat_annotations = [a for image in annotations for a in image]
+
+        category_ids, annotations_offsets = flatten_rows(
+            [[a["category_id"] for a in image] for image in annotations], np.int64
+        )
+        bboxes, _ = flatten_rows(
+            [[a["bbox"] for a in image] for image in annotations], np.float64, width=4
+        )
+        areas, _ = flatten_rows(
+            [[a["area"] for a in image] for image in annotations], np.float64
+        )
+        _, sequences_offsets = flatten_rows(
+            [[len(s) for s in a["segmentation"]] for a in flat_annotations], np.int64
+        )
+        segmentation, segmentation_offsets = flatten_rows(
+            [s for a in flat_annotations for s in a["segmentation"]], np.float64
+        )
+        return {
+            "category_ids": category_ids,
+            "bboxes": bboxes,
+            "areas": areas,
+            "annotations_offsets": annotations_offsets,
+            "sequences_offsets": sequences_offsets,
+            "segmentation": segmentation,
+            "segmentation_offsets": segmentation_offsets,
+            "heights": np.array(
+                [-1 if t["height"] is None else t["height"] for t in targets],
+                dtype=np.int64,
+            ),
+            "widths": np.array(
+                [-1 if t["width"] is None else t["width"] for t in targets],
+                dtype=np.int64,
+            ),
+        }
+
+    def _parse_target(self, index: int) -> Dict[str, Any]:
         target = self.parse_json(index)
 
         annotations = []
@@ -394,12 +509,7 @@ class InstanceSegmentationDataset(LocalDataset):
         class_weights : np.ndarray[float]
             Weight for each class in the train set (one for each class) as a 1D array normalized.
         """
-        # Collect all the labels by iterating over the whole dataset
-        labels: List[int] = []
-        for i, _ in enumerate(self.images_path):
-            target = self.get_target(i)
-            labels.extend([a["category_id"] for a in target["annotations"]])
-        return self._compute_weights(labels)
+        return self.get_label_statistics().weights
 
 
 class SemanticSegmentationDataset(LocalDataset):
@@ -524,13 +634,11 @@ class SemanticSegmentationDataset(LocalDataset):
         class_weights : np.ndarray[float]
             Weight for each class in the train set (one for each class) as a 1D array normalized.
         """
-        # Collect all the labels by iterating over the whole dataset
-        # specifically add in the background class as it won't be an annotation to include
+        # Specifically add in the background class as it won't be an annotation to include
         BACKGROUND_CLASS: int = 0
         labels = [BACKGROUND_CLASS]
-        for i, _ in enumerate(self.images_path):
-            target = self.get_target(i)
-            labels.extend([a["category_id"] for a in target["annotations"]])
+        for class_ids in self.get_label_statistics(count_paths=True).class_ids:
+            labels.extend(class_ids)
         return self._compute_weights(labels)
 
 
@@ -544,13 +652,25 @@ class ObjectDetectionDataset(LocalDataset):
         torchvision function or list to set the ``transform`` attribute. If it is a list, it will
         be composed via torchvision.
 
+    compile_targets : bool, default: False
+        If ``True``, the boxes and labels of every image are converted once into memory-mapped
+        arrays stored in the release, and ``get_target`` reads them instead of parsing annotation
+        files.
+
     Attributes
     ----------
     transform : Optional[Callable], default: None
         torchvision transform function(s) to run on the dataset.
+    compiled_targets : Optional[CompiledTargets]
+        Memory-mapped targets of every image, if ``compile_targets`` is ``True``.
     """
 
-    def __init__(self, transform: Optional[List] = None, **kwargs):
+    def __init__(
+        self,
+        transform: Optional[List] = None,
+        compile_targets: bool = False,
+        **kwargs,
+    ):
         super().__init__(annotation_type="bounding_box", **kwargs)
 
         if transform is not None and isinstance(transform, list):
@@ -558,6 +678,10 @@ class ObjectDetectionDataset(LocalDataset):
 
         self.transform: Optional[Callable] = transform
 
+        self.compiled_targets: Optional[CompiledTargets] = None
+        if compile_targets:
+            self.compiled_targets = load_or_compile_targets(self, self._compile_targets)
+
     def __getitem__(self, index: int):
         """
         Notes
@@ -612,6 +736,33 @@ class ObjectDetectionDataset(LocalDataset):
         Dict[str, Any]
             The target.
         """
+        if self.compiled_targets is not None:
+            boxes = torch.from_numpy(
+                np.array(self.compiled_targets.rows("boxes", index, "offsets"))
+            )
+            labels = torch.from_numpy(
+                np.array(self.compiled_targets.rows("labels", index, "offsets"))
+            )
+            return {
+                "boxes": boxes,
+                "area": boxes[:, 2] * boxes[:, 3],
+                "labels": labels,
+                "image_id": torch.tensor([index]),
+                "iscrowd": torch.zeros_like(labels),
+            }
+        return self._parse_target(index)
+
+    def _compile_targets(self) -> Dict[str, np.ndarray]:
+        targets = [self._parse_target(i) for i in range(len(self))]
+        boxes, offsets = flatten_rows(
+            [target["boxes"].tolist() for target in targets], np.float32, width=4
+        )
+        labels, _ = flatten_rows(
+            [target["labels"].tolist() for target in targets], np.int64
+        )
+        return {"boxes": boxes, "labels": labels, "offsets": offsets}
+
+    def _parse_target(self, index: int) -> Dict[str, Tensor]:
         target = self.parse_json(index)
         annotations = target.pop("annotations")
 
@@ -628,7 +779,8 @@ class ObjectDetectionDataset(LocalDataset):
             w = bbox["w"]
             h = bbox["h"]
 
-            bbox = torch.tensor([x, y, w, h])
+            # float32 whatever the type of the coordinates, as in the compiled targets
+            bbox = torch.tensor([x, y, w, h], dtype=torch.float32)
             area = bbox[2] * bbox[3]
             label = torch.tensor(self.classes.index(annotation.annotation_class.name))
 
@@ -659,9 +811,4 @@ class ObjectDetectionDataset(LocalDataset):
         class_weights : np.ndarray[float]
             Weight for each class in the train set (one for each class) as a 1D array normalized.
         """
-        # Collect all the labels by iterating over the whole dataset
-        labels = []
-        for i, _ in enumerate(self.images_path):
-            target = self.get_target(i)
-            labels.extend(target["labels"].tolist())
-        return self._compute_weights(labels)
+        return self.get_label_statistics().weights
@@ -0,0 +1,148 @@
+import io
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import orjson as json
+import torch.distributed as dist
+from PIL import Image as PILImage
+from torch.utils.data import IterableDataset, get_worker_info
+
+from darwin.dataset.shards import iterate_shard
+from darwin.dataset.utils import load_pil_image
+from darwin.datatypes import PathLike
+
+
+class ShardDataset(IterableDataset):
+    """
+    Streams the samples of the shards written by ``darwin.dataset.shards.pack_dataset``.
+
+    Every shard is read sequentially from start to end. Samples are shuffled at the level of the
+    shards, whose order changes with every epoch, and within a buffer of ``shuffle_buffer``
+    samples. Shards are split between the processes of a distributed run and between the workers
+    of each ``DataLoader``, so that every sample is read once per epoch. Each of them should
+    therefore hold at least as many shards as there are ranks times workers.
+
+    Parameters
+    ----------
+    shards : Union[PathLike, Sequence[PathLike]]
+        The shards to read, or the directory holding them.
+    shuffle : bool, default: True
+        Whether to shuffle the shards and their samples.
+    shuffle_buffer : int, default: 1000
+        Number of samples shuffled together, when ``shuffle`` is ``True``.
+    seed : int, default: 0
+        Seed of the shuffles. It must be the same for every rank.
+    transform : Optional[Callable], default: None
+        Called with the image and the annotation of every sample, returning the sample to yield.
+    rank : Optional[int], default: None
+        Rank of this process. Defaults to its rank in the default ``torch.distributed`` group, if
+        it is initialized, or to ``0``.
+    world_size : Optional[int], default: None
+        Number of processes. Defaults to the size of the default ``torch.distributed`` group, if it
+        is initialized, or to ``1``.
+
+    Attributes
+    ----------
+    shards : List[Path]
+        The shards to read.
+    epoch : int
+        The current epoch, set with ``set_epoch``.
+    """
+
+    def __init__(
+        self,
+        shards: Union[PathLike, Sequence[PathLike]],
+        shuffle: bool = True,
+        shuffle_buffer: int = 1000,
+        seed: int = 0,
+        transform: Optional[Callable] = None,
+        rank: Optional[int] = None,
+        world_size: Optional[int] = None,
+    ):
+        if isinstance(shards, (str, Path)):
+            shards = sorted(Path(shards).glob("shard-*.tar"))
+        self.shards: List[Path] = [Path(shard) for shard in shards]
+        if not self.shards:
+            raise ValueError("Could not find any shard to read")
+        self.shuffle: bool = shuffle
+        self.shuffle_buffer: int = max(1, shuffle_buffer)
+        self.seed: int = seed
+        self.transform: Optional[Callable] = transform
+        self.epoch: int = 0
+
+        distributed = dist.is_available() and dist.is_initialized()
+        if rank is None:
+            rank = dist.get_rank() if distributed else 0
+        if world_size is None:
+            world_size = dist.get_world_size() if distributed else 1
+        self.rank: int = rank
+        self.world_size: int = world_size
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        Sets the epoch, which changes the order of the shards and of their samples.
+
+        Parameters
+        ----------
+        epoch : int
+            The epoch.
+        """
+        self.epoch = epoch
+
+    def get_shards(self) -> List[Path]:
+        """
+        Returns the shards read by the current worker of this process, in reading order.
+
+        Returns
+        -------
+        List[Path]
+            The shards to read.
+        """
+        shards = list(self.shards)
+        if self.shuffle:
+            random.Random(self.seed + self.epoch).shuffle(shards)
+
+        worker_info = get_worker_info()
+        worker_id, num_workers = (
+            (0, 1) if worker_info is None else (worker_info.id, worker_info.num_workers)
+        )
+        start = self.rank * num_workers + worker_id
+        return shards[start :: self.world_size * num_workers]
+
+    def __iter__(self) -> Iterator[Any]:
+        # Samples are shuffled before being decoded, so that the buffer only holds encoded images
+        samples = (
+            members
+            for shard in self.get_shards()
+            for _, members in iterate_shard(shard)
+        )
+        if self.shuffle:
+            samples = self._shuffled(samples)
+        for members in samples:
+            image, annotation = self._decode(members)
+            if self.transform is not None:
+                yield self.transform(image, annotation)
+            else:
+                yield image, annotation
+
+    def _shuffled(self, samples: Iterator[Any]) -> Iterator[Any]:
+        worker_info = get_worker_info()
+        worker_id = 0 if worker_info is None else worker_info.id
+        rng = random.Random(hash((self.seed, self.epoch, self.rank, worker_id)))
+        buffer: List[Any] = []
+        for sample in samples:
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(sample)
+                continue
+            index = rng.randrange(len(buffer))
+            yield buffer[index]
+            buffer[index] = sample
+        rng.shuffle(buffer)
+        yield from buffer
+
+    @staticmethod
+    def _decode(members: Dict[str, bytes]) -> Tuple[PILImage.Image, Dict[str, Any]]:
+        annotation = json.loads(members.pop("json"))
+        (image,) = members.values()
+        return load_pil_image(io.BytesIO(image)), annotation
@@ -8,7 +8,10 @@ import torchvision.transforms as transforms
 import torchvision.transforms.functional as F
 from PIL import Image as PILImage
 
-from darwin.torch.utils import convert_segmentation_to_mask, flatten_masks_by_category
+from darwin.torch.utils import (
+    convert_segmentation_to_label_image,
+    convert_segmentation_to_mask,
+)
 
 # Optional dependency
 try:
@@ -269,14 +272,9 @@ class ConvertPolygonsToSemanticMask(object):
         annotations = target.pop("annotations")
         segmentations = [obj["segmentation"] for obj in annotations]
         cats = [obj["category_id"] for obj in annotations]
-        if segmentations:
-            masks = convert_segmentation_to_mask(segmentations, h, w)
-            # merge all instance masks into a single segmentation map
-            # with its corresponding categories
-            mask = flatten_masks_by_category(masks, cats)
-
-        else:
-            mask = torch.zeros((h, w), dtype=torch.uint8)
+        # draw all instances into a single segmentation map
+        # with their corresponding categories
+        mask = convert_segmentation_to_label_image(segmentations, cats, h, w)
 
         target["mask"] = mask
         target["image_id"] = image_id
@@ -294,14 +292,9 @@ class ConvertPolygonToMask(object):
         w, h = image.size
         segmentations = [obj["segmentation"] for obj in annotation]
         cats = [obj["category_id"] for obj in annotation]
-        if segmentations:
-            masks = convert_segmentation_to_mask(segmentations, h, w)
-            # merge all instance masks into a single segmentation map
-            # with its corresponding categories
-            target = flatten_masks_by_category(masks, cats)
-
-        else:
-            target = torch.zeros((h, w), dtype=torch.uint8)
+        # draw all instances into a single segmentation map
+        # with their corresponding categories
+        target = convert_segmentation_to_label_image(segmentations, cats, h, w)
         target = PILImage.fromarray(target.numpy())
         return image, target
 
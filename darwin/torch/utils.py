@@ -31,18 +31,13 @@ def flatten_masks_by_category(masks: torch.Tensor, cats: List[int]) -> torch.Ten
     assert isinstance(masks, torch.Tensor)
     assert isinstance(cats, List)
     assert masks.shape[0] == len(cats)
-    order_of_polygons = list(range(1, len(cats) + 1))
-    polygon_mapping = {order: cat for cat, order in zip(cats, order_of_polygons)}
-    BACKGROUND: int = 0
-    polygon_mapping[BACKGROUND] = 0
-    # Uses matrix multiplication here with `masks` being a binary array of same dimensions as image
-    # and polygon orders being overlaid onto the relevant mask
-    order_tensor = torch.as_tensor(order_of_polygons, dtype=masks.dtype)
-    flattened, _ = (masks * order_tensor[:, None, None]).max(dim=0)
-    # The mask is now flattened in order of the polygons but needs to be converted back to the categories
-    # vectorize the dictionary to return the original category id's
-    mapped = np.vectorize(polygon_mapping.__getitem__)(flattened)
-    return torch.as_tensor(mapped, dtype=masks.dtype)
+    # The top most mask of a pixel is the last one covering it, i.e. the first one when reversed
+    reversed_masks = masks.flip(0)
+    order = masks.shape[0] - reversed_masks.argmax(dim=0)
+    order[reversed_masks.amax(dim=0) == 0] = 0
+    # Map the order of the polygons back to their category id's, the background being 0
+    categories = torch.as_tensor([0] + list(cats), dtype=torch.int64)
+    return categories[order].to(masks.dtype)
 
 
 def convert_segmentation_to_mask(
@@ -63,16 +58,45 @@ def convert_segmentation_to_mask(
     Returns
     -------
     torch.tensor
-        A ``Tensor`` representing a segmentation mask.
+        A ``uint8`` ``Tensor`` with one ``height`` x ``width`` mask per polygon, allocated at once.
     """
-    if not segmentations:
-        return torch.zeros((0, height, width), dtype=torch.uint8)
+    masks = np.zeros((len(segmentations), height, width), dtype=np.uint8)
+    for mask, contour in zip(masks, segmentations):
+        draw_polygon(mask, contour, 1)
+    return torch.from_numpy(masks)
 
-    masks = []
-    for contour in segmentations:
-        mask = torch.zeros((height, width)).numpy().astype(np.uint8)
-        masks.append(torch.from_numpy(np.asarray(draw_polygon(mask, contour, 1))))
-    return torch.stack(masks)
+
+def convert_segmentation_to_label_image(
+    segmentations: List[Segment], values: List[int], height: int, width: int
+) -> torch.Tensor:
+    """
+    Draws all the given polygons into a single label image, each with its own value, without
+    building a mask per polygon. Where polygons overlap, the last one wins, like in
+    ``flatten_masks_by_category``.
+
+    Parameters
+    ----------
+    segmentations : List[Segment]
+        List of float values -> ``[[x11, y11, x12, y12], ..., [xn1, yn1, xn2, yn2]]``.
+    values : List[int]
+        Value of each polygon, e.g. its category id.
+    height : int
+        Image's height.
+    width : int
+        Image's width.
+
+    Returns
+    -------
+    torch.Tensor
+        A ``uint8`` label image, or an ``int32`` one if a value does not fit in ``uint8``. Pixels
+        outside every polygon are 0.
+    """
+    assert len(segmentations) == len(values)
+    dtype = np.uint8 if max(values, default=0) <= 255 else np.int32
+    label_image = np.zeros((height, width), dtype=dtype)
+    for contour, value in zip(segmentations, values):
+        draw_polygon(label_image, contour, value)
+    return torch.from_numpy(label_image)
 
 
 def polygon_area(x: ArrayLike, y: ArrayLike) -> float:
@@ -118,6 +142,8 @@ def detectron2_register_dataset(
     split: Optional[str] = "default",
     split_type: Optional[str] = "stratified",
     evaluator_type: Optional[str] = None,
+    multi_processed: bool = True,
+    cache: bool = True,
 ) -> str:
     """
     Registers a local Darwin-formatted dataset in Detectron2.
@@ -136,6 +162,11 @@ def detectron2_register_dataset(
         Heuristic used to do the split ``["random", "stratified"]``.
     evaluator_type : Optional[str], default: None
         Evaluator to be used in the val and test sets.
+    multi_processed : bool, default: True
+        Builds the records of the dataset in a pool of processes.
+    cache : bool, default: True
+        Caches the records of the dataset in its release, so that registering it again, e.g. in
+        each process of a multi-GPU launch, loads them instead of building them.
 
     Returns
     -------
@@ -190,6 +221,8 @@ def detectron2_register_dataset(
                 annotation_type="polygon",
                 annotation_format="coco",
                 ignore_inconsistent_examples=True,
+                multi_processed=multi_processed,
+                cache=cache,
             )
         ),
     )
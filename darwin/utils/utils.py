@@ -75,6 +75,24 @@ SUPPORTED_EXTENSIONS = SUPPORTED_IMAGE_EXTENSIONS + SUPPORTED_VIDEO_EXTENSIONS
 
 _darwin_schema_cache = {}
 
+# Keys of the annotation types read by ``_parse_darwin_annotation``, apart from polygons, in the
+# order they are checked
+_DARWIN_ANNOTATION_TYPES: Tuple[str, ...] = (
+    "bounding_box",
+    "tag",
+    "line",
+    "keypoint",
+    "ellipse",
+    "cuboid",
+    "skeleton",
+    "table",
+    "simple_table",
+    "string",
+    "graph",
+    "mask",
+    "raster_layer",
+)
+
 
 def is_extension_allowed_by_filename(filename: str) -> bool:
     """
@@ -673,6 +691,29 @@ def _parse_darwin_video(
     return annotation_file
 
 
+def get_darwin_annotation_type(annotation: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns the main type of a Darwin JSON annotation, as ``parse_darwin_json`` reads it. Frames of
+    video annotations are classified the same way.
+
+    Parameters
+    ----------
+    annotation : Dict[str, Any]
+        The annotation, as found in the ``annotations`` of a Darwin JSON file.
+
+    Returns
+    -------
+    Optional[str]
+        The type of the annotation, or ``None`` if it has no supported type.
+    """
+    # Darwin JSON 2.0 representation of polygons, or the legacy single path one
+    if "polygon" in annotation and (
+        "paths" in annotation["polygon"] or "path" in annotation["polygon"]
+    ):
+        return "polygon"
+    return next((key for key in _DARWIN_ANNOTATION_TYPES if key in annotation), None)
+
+
 def _parse_darwin_annotation(
     annotation: Dict[str, Any],
     only_keyframes: bool = False,
@@ -682,23 +723,17 @@ def _parse_darwin_annotation(
     slot_names = parse_slot_names(annotation)
     name: str = annotation["name"].strip()
     main_annotation: Optional[dt.Annotation] = None
+    main_type = get_darwin_annotation_type(annotation)
 
-    # Darwin JSON 2.0 representation of polygons
-    if "polygon" in annotation and "paths" in annotation["polygon"]:
+    if main_type == "polygon":
         bounding_box = annotation.get("bounding_box")
-        paths = annotation["polygon"]["paths"]
+        polygon = annotation["polygon"]
+        paths = polygon["paths"] if "paths" in polygon else polygon["path"]
         main_annotation = dt.make_polygon(
             name, paths, bounding_box, slot_names=slot_names
         )
 
-    elif "polygon" in annotation and "path" in annotation["polygon"]:
-        bounding_box = annotation.get("bounding_box")
-        path = annotation["polygon"]["path"]
-        main_annotation = dt.make_polygon(
-            name, path, bounding_box, slot_names=slot_names
-        )
-
-    elif "bounding_box" in annotation:
+    elif main_type == "bounding_box":
         bounding_box = annotation["bounding_box"]
         main_annotation = dt.make_bounding_box(
             name,
@@ -708,39 +743,39 @@ def _parse_darwin_annotation(
             bounding_box["h"],
             slot_names=slot_names,
         )
-    elif "tag" in annotation:
+    elif main_type == "tag":
         main_annotation = dt.make_tag(name, slot_names=slot_names)
-    elif "line" in annotation:
+    elif main_type == "line":
         main_annotation = dt.make_line(
             name, annotation["line"]["path"], slot_names=slot_names
         )
-    elif "keypoint" in annotation:
+    elif main_type == "keypoint":
         main_annotation = dt.make_keypoint(
             name,
             annotation["keypoint"]["x"],
             annotation["keypoint"]["y"],
             slot_names=slot_names,
         )
-    elif "ellipse" in annotation:
+    elif main_type == "ellipse":
         main_annotation = dt.make_ellipse(
             name, annotation["ellipse"], slot_names=slot_names
         )
-    elif "cuboid" in annotation:
+    elif main_type == "cuboid":
         main_annotation = dt.make_cuboid(
             name, annotation["cuboid"], slot_names=slot_names
         )
-    elif "skeleton" in annotation:
+    elif main_type == "skeleton":
         main_annotation = dt.make_skeleton(
             name, annotation["skeleton"]["nodes"], slot_names=slot_names
         )
-    elif "table" in annotation:
+    elif main_type == "table":
         main_annotation = dt.make_table(
             name,
             annotation["table"]["bounding_box"],
             annotation["table"]["cells"],
             slot_names=slot_names,
         )
-    elif "simple_table" in annotation:
+    elif main_type == "simple_table":
         main_annotation = dt.make_simple_table(
             name,
             annotation["simple_table"]["bounding_box"],
@@ -748,20 +783,20 @@ def _parse_darwin_annotation(
             annotation["simple_table"]["row_offsets"],
             slot_names=slot_names,
         )
-    elif "string" in annotation:
+    elif main_type == "string":
         main_annotation = dt.make_string(
             name, annotation["string"]["sources"], slot_names=slot_names
         )
-    elif "graph" in annotation:
+    elif main_type == "graph":
         main_annotation = dt.make_graph(
             name,
             annotation["graph"]["nodes"],
             annotation["graph"]["edges"],
             slot_names=slot_names,
         )
-    elif "mask" in annotation:
+    elif main_type == "mask":
         main_annotation = dt.make_mask(name, slot_names=slot_names)
-    elif "raster_layer" in annotation:
+    elif main_type == "raster_layer":
         raster_layer = annotation["raster_layer"]
         main_annotation = dt.make_raster_layer(
             name,
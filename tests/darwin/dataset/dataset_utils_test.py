@@ -1,5 +1,7 @@
+import os
 import shutil
 import tempfile
+from collections import Counter
 from pathlib import Path
 from typing import Dict
 from unittest.mock import MagicMock, patch
@@ -10,15 +12,21 @@ import pytest
 
 from darwin.dataset.split_manager import split_dataset
 from darwin.dataset.utils import (
+    _get_annotation_class_names,
+    _get_annotation_classes,
     compute_distributions,
+    compute_max_density,
     exhaust_generator,
     extract_classes,
+    extract_classes_by_type,
     get_annotations,
+    get_coco_format_record,
     get_external_file_type,
     get_release_path,
     parse_external_file_path,
     sanitize_filename,
 )
+from darwin.importer.formats.darwin import parse_path
 from tests.fixtures import *
 
 
@@ -100,6 +108,100 @@ def test_compute_distributions(parse_file_mock, open_mock):
     }
 
 
+class TestComputeDistributions:
+    @pytest.fixture
+    def split_path(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> Path:
+        root = team_extracted_dataset_path / team_slug_darwin_json_v2 / "coco"
+        return split_dataset(
+            root, release_name="latest", val_percentage=0.2, test_percentage=0.2
+        )
+
+    @staticmethod
+    def _expected(release_path: Path, split_path: Path, annotation_types):
+        expected = {"class": {}, "instance": {}}
+        for partition in ["train", "val", "test"]:
+            expected["class"][partition] = Counter()
+            expected["instance"][partition] = Counter()
+            for annotation_type in annotation_types:
+                split_file = (
+                    split_path / f"stratified_{annotation_type}_{partition}.txt"
+                )
+                if not split_file.exists():
+                    split_file = split_path / f"random_{partition}.txt"
+                for line in split_file.read_text().splitlines():
+                    annotation_file = parse_path(release_path / "annotations" / line)
+                    names = [
+                        a.annotation_class.name for a in annotation_file.annotations
+                    ]
+                    expected["class"][partition] += Counter(set(names))
+                    expected["instance"][partition] += Counter(names)
+        return expected
+
+    @pytest.mark.parametrize(
+        "annotation_types", [["polygon"], ["polygon", "tag"], ["bounding_box"]]
+    )
+    def test_matches_counting_parsed_annotations(
+        self, split_path: Path, annotation_types
+    ):
+        release_path = split_path.parent.parent
+
+        value = compute_distributions(
+            release_path / "annotations",
+            split_path,
+            annotation_types=annotation_types,
+            multi_processed=False,
+        )
+
+        assert value == self._expected(release_path, split_path, annotation_types)
+
+    def test_parallel_pass_matches_serial_pass(self, split_path: Path):
+        release_path = split_path.parent.parent
+        serial = compute_distributions(
+            release_path / "annotations", split_path, multi_processed=False
+        )
+
+        with patch("darwin.dataset.utils._MIN_FILES_FOR_POOL", 0):
+            parallel = compute_distributions(
+                release_path / "annotations", split_path, multi_processed=True
+            )
+
+        assert parallel == serial
+
+    def test_class_names_match_the_parsed_annotations(self, tmp_path: Path):
+        annotation_path = tmp_path / "annotation.json"
+        annotation_path.write_bytes(
+            json.dumps(
+                {
+                    "version": "2.0",
+                    "schema_ref": "https://darwin-public.s3.eu-west-1.amazonaws.com/darwin_json/2.0/schema.json",
+                    "item": {
+                        "name": "image.jpg",
+                        "path": "/",
+                        "slots": [{"type": "image", "slot_name": "0"}],
+                    },
+                    "annotations": [
+                        {"name": " cat ", "tag": {}, "slot_names": ["0"]},
+                        {
+                            "name": "dog",
+                            "polygon": {"paths": [[{"x": 0, "y": 0}]]},
+                            "slot_names": ["0"],
+                        },
+                        {"name": "no_paths", "polygon": {}, "slot_names": ["0"]},
+                    ],
+                }
+            )
+        )
+
+        names = _get_annotation_class_names(annotation_path)
+
+        assert names == ["cat", "dog"]
+        assert names == [
+            a.annotation_class.name for a in parse_path(annotation_path).annotations
+        ]
+
+
 class TestExtractClasses:
     @pytest.fixture
     def annotations_path(self, tmp_path: Path):
@@ -308,6 +410,95 @@ class TestExtractClasses:
         assert index_dict[1] == {"class_1", "class_5", "class_6"}
 
 
+class TestExtractClassesByType:
+    @pytest.fixture
+    def annotations_path(self, tmp_path: Path) -> Path:
+        annotations_path = tmp_path / "annotations"
+        annotations_path.mkdir(parents=True)
+        for i, annotations in enumerate(
+            [
+                [
+                    {"name": "class_1", "polygon": {"paths": [[]]}},
+                    {
+                        "name": "class_2",
+                        "bounding_box": {"x": 0, "y": 0, "w": 10, "h": 10},
+                    },
+                    {"name": "class_4", "tag": {}},
+                ],
+                [
+                    {"name": "class_3", "polygon": {"paths": [[]]}},
+                    {"name": "class_1", "polygon": {"paths": [[]]}},
+                ],
+            ]
+        ):
+            _create_annotation_file(
+                annotations_path,
+                f"{i}.json",
+                {
+                    "version": "2.0",
+                    "schema_ref": "https://darwin-public.s3.eu-west-1.amazonaws.com/darwin_json/2.0/schema.json",
+                    "item": {
+                        "name": f"{i}.jpg",
+                        "path": "/",
+                        "slots": [
+                            {
+                                "type": "image",
+                                "slot_name": "0",
+                                "source_files": [
+                                    {
+                                        "file_name": f"{i}.jpg",
+                                        "url": f"https://example.com/{i}.jpg",
+                                    }
+                                ],
+                            }
+                        ],
+                    },
+                    "annotations": annotations,
+                },
+            )
+        return annotations_path
+
+    def test_matches_extract_classes_for_each_type(self, annotations_path: Path):
+        indexes = extract_classes_by_type(
+            annotations_path,
+            {"polygon": "polygon", "tag": "tag", "box": ["bounding_box", "polygon"]},
+        )
+
+        assert indexes["polygon"] == extract_classes(annotations_path, "polygon")
+        assert indexes["tag"] == extract_classes(annotations_path, "tag")
+        assert indexes["box"] == extract_classes(
+            annotations_path, ["bounding_box", "polygon"]
+        )
+
+    def test_parses_each_file_once(self, annotations_path: Path):
+        with patch(
+            "darwin.dataset.utils._get_annotation_classes",
+            wraps=_get_annotation_classes,
+        ) as mock_get_classes:
+            extract_classes_by_type(
+                annotations_path, ["tag", "polygon", "bounding_box"]
+            )
+
+        assert mock_get_classes.call_count == 2
+
+    def test_parallel_pass_matches_serial_pass(self, annotations_path: Path):
+        serial = extract_classes_by_type(
+            annotations_path, ["tag", "polygon"], multi_processed=False
+        )
+
+        with patch("darwin.dataset.utils._MIN_FILES_FOR_POOL", 0):
+            parallel = extract_classes_by_type(
+                annotations_path, ["tag", "polygon"], multi_processed=True
+            )
+
+        assert parallel == serial
+
+    def test_compute_max_density_counts_annotations_with_paths(
+        self, annotations_path: Path
+    ):
+        assert compute_max_density(annotations_path) == 2
+
+
 class TestSanitizeFilename:
     def test_normal_filenames_stay_untouched(self):
         assert sanitize_filename("test.jpg") == "test.jpg"
@@ -531,3 +722,114 @@ class TestGetAnnotations:
                             == expected_splits[f"{split_type}_{partition}"]
                         )
                         assert annotations[0]["annotations"][0]["tag"] == {}
+
+
+class TestGetCocoAnnotations:
+    @pytest.fixture
+    def dataset_path(self, tmp_path: Path) -> Path:
+        with ZipFile("tests/model_training_data.zip") as zfile:
+            zfile.extractall(tmp_path)
+        return tmp_path / "model_training_data" / "instance-segmentation-test"
+
+    def test_parallel_records_match_serial_records(self, dataset_path: Path):
+        serial = list(
+            get_annotations(
+                dataset_path=dataset_path,
+                release_name="complete",
+                annotation_type="polygon",
+            )
+        )
+
+        with patch("darwin.dataset.utils._MIN_FILES_FOR_POOL", 0):
+            parallel = list(
+                get_annotations(
+                    dataset_path=dataset_path,
+                    release_name="complete",
+                    annotation_type="polygon",
+                    multi_processed=True,
+                    worker_count=2,
+                )
+            )
+
+        assert len(serial) > 0
+        assert parallel == serial
+
+    def test_records_are_cached_in_the_release(self, dataset_path: Path):
+        first = list(
+            get_annotations(
+                dataset_path=dataset_path,
+                release_name="complete",
+                annotation_type="polygon",
+                cache=True,
+            )
+        )
+
+        with patch(
+            "darwin.dataset.utils.get_coco_format_record"
+        ) as mock_get_record, patch(
+            "darwin.dataset.utils.stream_darwin_json"
+        ) as mock_stream:
+            second = list(
+                get_annotations(
+                    dataset_path=dataset_path,
+                    release_name="complete",
+                    annotation_type="polygon",
+                    cache=True,
+                )
+            )
+
+        mock_get_record.assert_not_called()
+        mock_stream.assert_not_called()
+        assert second == first
+
+    def test_cache_is_rebuilt_when_the_annotations_change(self, dataset_path: Path):
+        first = list(
+            get_annotations(
+                dataset_path=dataset_path,
+                release_name="complete",
+                annotation_type="polygon",
+                cache=True,
+            )
+        )
+        annotations_dir = dataset_path / "releases" / "complete" / "annotations"
+        sorted(annotations_dir.glob("**/*.json"))[-1].unlink()
+
+        second = list(
+            get_annotations(
+                dataset_path=dataset_path,
+                release_name="complete",
+                annotation_type="polygon",
+                cache=True,
+            )
+        )
+
+        assert len(second) == len(first) - 1
+
+    def test_cache_is_rebuilt_when_an_image_changes(self, dataset_path: Path):
+        list(
+            get_annotations(
+                dataset_path=dataset_path,
+                release_name="complete",
+                annotation_type="polygon",
+                cache=True,
+            )
+        )
+        # Nested below the images directory, whose own mtime does not change
+        image_path = sorted((dataset_path / "images").glob("*/**/*.*"))[0]
+        stat = image_path.stat()
+        os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch(
+            "darwin.dataset.utils.get_coco_format_record",
+            side_effect=get_coco_format_record,
+        ) as mock_get_record:
+            list(
+                get_annotations(
+                    dataset_path=dataset_path,
+                    release_name="complete",
+                    annotation_type="polygon",
+                    cache=True,
+                )
+            )
+
+        mock_get_record.assert_called()
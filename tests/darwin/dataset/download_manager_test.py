@@ -1,9 +1,13 @@
+import threading
+import time
 from pathlib import Path
-from typing import Callable, List
-from unittest.mock import MagicMock
+from typing import Callable, Dict, List
+from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 import responses
+from requests.adapters import HTTPAdapter
 
 from darwin.dataset import download_manager as dm
 from darwin.datatypes import AnnotationClass, AnnotationFile, Slot
@@ -353,3 +357,281 @@ def test__check_for_duplicate_local_filepaths_multiple_duplicates(capsys):
     )
     assert "path/to/file1.jpg is duplicated 2 times" in captured.out
     assert "path/to/file3.jpg is duplicated 3 times" in captured.out
+
+
+def test__get_session_is_reused_within_a_process() -> None:
+    with patch.object(dm, "_session", None):
+        session = dm._get_session()
+        assert dm._get_session() is session
+
+
+def test__get_session_is_recreated_after_fork() -> None:
+    with patch.object(dm, "_session", None):
+        session = dm._get_session()
+        with patch("darwin.dataset.download_manager.os.getpid", return_value=-1):
+            assert dm._get_session() is not session
+
+
+def test__build_session_uses_pool_size_from_env(monkeypatch) -> None:
+    monkeypatch.setenv("DARWIN_DOWNLOAD_POOL_SIZE", "32")
+    session = dm._build_session(dm._get_pool_size())
+    adapter = session.get_adapter("https://example.com")
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 5
+
+
+def test__download_image_reuses_session_and_sends_api_key(tmp_path: Path) -> None:
+    with patch.object(dm, "_session", None):
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, "http://test.com/1", body=b"1")
+            rsps.add(responses.GET, "http://test.com/2?token=abc", body=b"2")
+            dm._download_image("http://test.com/1", tmp_path / "1.jpg", "key")
+            dm._download_image("http://test.com/2?token=abc", tmp_path / "2.jpg", "key")
+            assert rsps.calls[0].request.headers["Authorization"] == "ApiKey key"
+            assert "Authorization" not in rsps.calls[1].request.headers
+    assert (tmp_path / "1.jpg").read_bytes() == b"1"
+    assert (tmp_path / "2.jpg").read_bytes() == b"2"
+
+
+def test_download_files_threaded_collects_successes_and_errors() -> None:
+    def throw() -> None:
+        raise ValueError("failed")
+
+    successes, errors = dm.download_files_threaded(
+        [lambda: 1, throw, lambda: 2], 3, max_concurrency=2
+    )
+    assert sorted(successes) == [1, 2]
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+
+def test_download_files_threaded_bounds_concurrency() -> None:
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def download() -> None:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+
+    successes, errors = dm.download_files_threaded(
+        [download] * 20, 20, max_concurrency=4
+    )
+    assert len(successes) == 20 and not errors
+    assert peak <= 4
+
+
+def test_download_files_threaded_downloads_through_blocking_session(
+    tmp_path: Path,
+) -> None:
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.GET, "http://test.com/1", body=b"abc")
+        successes, errors = dm.download_files_threaded(
+            [lambda: dm._download_image("http://test.com/1", tmp_path / "1", "k")],
+            1,
+            max_concurrency=8,
+            max_connections_per_host=2,
+        )
+    assert not errors
+    assert (tmp_path / "1").read_bytes() == b"abc"
+    assert dm._bytes_callback is None
+
+
+def test_download_files_threaded_caps_connections_per_host() -> None:
+    def get_adapter() -> HTTPAdapter:
+        return dm._get_session().get_adapter("https://test.com")
+
+    adapters, errors = dm.download_files_threaded(
+        [get_adapter], 1, max_concurrency=8, max_connections_per_host=2
+    )
+    assert not errors
+    assert adapters[0]._pool_maxsize == 2
+    assert adapters[0]._pool_block
+
+
+def test_download_files_threaded_rejects_non_positive_concurrency() -> None:
+    with pytest.raises(ValueError):
+        dm.download_files_threaded([], 0, max_concurrency=0)
+
+
+def _ranged_body_callback(body: bytes, requests_seen: List[Dict[str, str]]):
+    def callback(request):
+        requests_seen.append(dict(request.headers))
+        byte_range = request.headers.get("Range")
+        if byte_range is None:
+            return (
+                200,
+                {"Content-Length": str(len(body)), "Accept-Ranges": "bytes"},
+                body,
+            )
+        start_str, end_str = byte_range.split("=")[1].split("-")
+        start = int(start_str)
+        end = int(end_str) if end_str else len(body) - 1
+        headers = {"Content-Range": f"bytes {start}-{end}/{len(body)}"}
+        return 206, headers, body[start : end + 1]
+
+    return callback
+
+
+def test__download_image_writes_through_part_file(tmp_path: Path) -> None:
+    path = tmp_path / "image.jpg"
+    with patch.object(dm, "_session", None):
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(
+                responses.GET,
+                "http://test.com/image",
+                callback=_ranged_body_callback(b"abcdef", []),
+            )
+            dm._download_image("http://test.com/image", path, "key")
+    assert path.read_bytes() == b"abcdef"
+    assert not dm._part_path(path).exists()
+
+
+def test__download_image_resumes_from_existing_part_file(tmp_path: Path) -> None:
+    path = tmp_path / "image.jpg"
+    dm._part_path(path).write_bytes(b"abc")
+    requests_seen: List[Dict[str, str]] = []
+    with patch.object(dm, "_session", None):
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(
+                responses.GET,
+                "http://test.com/image",
+                callback=_ranged_body_callback(b"abcdef", requests_seen),
+            )
+            dm._download_image("http://test.com/image", path, "key")
+    assert requests_seen[0]["Range"] == "bytes=3-"
+    assert path.read_bytes() == b"abcdef"
+
+
+def test__write_file_resumes_after_dropped_connection(tmp_path: Path) -> None:
+    def dropped_body(chunk_size: int):
+        yield b"abc"
+        raise requests.exceptions.ChunkedEncodingError()
+
+    first = MagicMock(status_code=200, headers={"Content-Length": "6"})
+    first.iter_content.side_effect = dropped_body
+    resumed = MagicMock(status_code=206, headers={"Content-Range": "bytes 3-5/6"})
+    resumed.iter_content.return_value = iter([b"def"])
+    session = MagicMock()
+    session.get.return_value = resumed
+
+    path = tmp_path / "video.mp4"
+    with patch.object(dm, "_get_session", return_value=session), patch(
+        "darwin.dataset.download_manager.time.sleep"
+    ):
+        dm._write_file(path, first, url="http://test.com/video")
+
+    assert session.get.call_args.kwargs["headers"]["Range"] == "bytes=3-"
+    assert path.read_bytes() == b"abcdef"
+
+
+def test__write_file_raises_on_size_mismatch(tmp_path: Path) -> None:
+    response = MagicMock(status_code=200, headers={"Content-Length": "10"})
+    response.iter_content.return_value = iter([b"abc"])
+    path = tmp_path / "image.jpg"
+    with pytest.raises(Exception, match="incomplete"):
+        dm._write_file(path, response, url="http://test.com/image")
+    assert not path.exists()
+    assert not dm._part_path(path).exists()
+
+
+def test__write_file_downloads_large_files_as_parallel_ranges(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv("DARWIN_DOWNLOAD_RANGE_CHUNKS", "3")
+    monkeypatch.setattr(dm, "PARALLEL_RANGE_MIN_SIZE", 1)
+    body = bytes(range(100))
+    requests_seen: List[Dict[str, str]] = []
+    path = tmp_path / "scan.dcm"
+    with patch.object(dm, "_session", None):
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(
+                responses.GET,
+                "http://test.com/scan",
+                callback=_ranged_body_callback(body, requests_seen),
+            )
+            dm._download_image("http://test.com/scan", path, "key")
+    assert path.read_bytes() == body
+    assert sorted(r["Range"] for r in requests_seen if "Range" in r) == [
+        "bytes=0-33",
+        "bytes=34-67",
+        "bytes=68-99",
+    ]
+
+
+def test_incremental_download_only_parses_changed_annotations(tmp_path: Path) -> None:
+    annotations_path = tmp_path / "annotations"
+    annotations_path.mkdir()
+    images_path = tmp_path / "images"
+    annotation_path = annotations_path / "221b-1.json"
+    annotation_path.write_text(
+        Path("tests/darwin/data/annotation_without_properties.json").read_text()
+    )
+
+    def pull() -> int:
+        _, count = dm.download_all_images_from_annotations(
+            "key", annotations_path, images_path, use_folders=True, incremental=True
+        )
+        return count
+
+    assert pull() == 1
+    (images_path / "221b-1.jpeg").write_bytes(b"image")
+
+    with patch.object(dm, "parse_darwin_json", wraps=dm.parse_darwin_json) as parse:
+        # The unchanged annotation is matched through the manifest without parsing it
+        assert pull() == 0
+        parse.assert_not_called()
+
+        # A changed annotation is parsed again, but its file is already on disk
+        annotation_path.write_text(annotation_path.read_text() + "\n")
+        assert pull() == 0
+        parse.assert_called_once()
+
+        (images_path / "221b-1.jpeg").unlink()
+        assert pull() == 1
+
+
+def test_incremental_remove_extra_only_removes_files_from_the_manifest(
+    tmp_path: Path,
+) -> None:
+    annotations_path = tmp_path / "annotations"
+    annotations_path.mkdir()
+    images_path = tmp_path / "images"
+    annotation_path = annotations_path / "221b-1.json"
+    annotation_path.write_text(
+        Path("tests/darwin/data/annotation_without_properties.json").read_text()
+    )
+    dm.download_all_images_from_annotations(
+        "key", annotations_path, images_path, use_folders=True, incremental=True
+    )
+    (images_path / "221b-1.jpeg").write_bytes(b"image")
+    (images_path / "folder").mkdir()
+    (images_path / "folder" / "never_pulled.jpg").write_bytes(b"image")
+
+    annotation_path.unlink()
+    with patch.object(Path, "rglob", side_effect=AssertionError("scanned")):
+        dm.download_all_images_from_annotations(
+            "key",
+            annotations_path,
+            images_path,
+            use_folders=True,
+            remove_extra=True,
+            incremental=True,
+        )
+
+    assert not (images_path / "221b-1.jpeg").exists()
+    assert (images_path / "folder" / "never_pulled.jpg").exists()
+
+
+def test__remove_empty_parents_stops_at_non_empty_directories(tmp_path: Path) -> None:
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "a" / "kept.jpg").write_bytes(b"image")
+
+    dm._remove_empty_parents(tmp_path / "a" / "b" / "c", tmp_path)
+
+    assert not (tmp_path / "a" / "b").exists()
+    assert (tmp_path / "a" / "kept.jpg").exists()
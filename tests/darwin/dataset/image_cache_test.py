@@ -0,0 +1,83 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from darwin.dataset.image_cache import DecodedImageCache
+
+
+def _image(value: int, size: int = 10) -> np.ndarray:
+    return np.full((size, size, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture(params=["ram", "disk"])
+def make_cache(request, tmp_path: Path):
+    def make(max_bytes: int) -> DecodedImageCache:
+        directory = tmp_path / "cache" if request.param == "disk" else None
+        return DecodedImageCache(max_bytes, directory)
+
+    return make
+
+
+class TestDecodedImageCache:
+    def test_returns_the_cached_images(self, make_cache):
+        cache = make_cache(1000)
+        cache.put("a", _image(1))
+
+        assert np.array_equal(cache.get("a"), _image(1))
+        assert cache.get("b") is None
+
+    def test_evicts_the_least_recently_used_images(self, make_cache):
+        cache = make_cache(700)
+        cache.put("a", _image(1))
+        cache.put("b", _image(2))
+        cache.get("a")
+
+        cache.put("c", _image(3))
+
+        assert cache.get("b") is None
+        assert np.array_equal(cache.get("a"), _image(1))
+        assert np.array_equal(cache.get("c"), _image(3))
+        assert cache.nbytes == 600
+
+    def test_does_not_cache_images_bigger_than_the_cache(self, make_cache):
+        cache = make_cache(100)
+
+        cache.put("a", _image(1))
+
+        assert cache.get("a") is None
+        assert cache.nbytes == 0
+
+    def test_pickles_without_its_images(self, make_cache):
+        cache = make_cache(1000)
+        cache.put("a", _image(1))
+
+        copy = pickle.loads(pickle.dumps(cache))
+
+        assert copy.max_bytes == 1000
+        assert len(copy) == 0
+
+    def test_images_on_disk_are_shared_between_caches(self, tmp_path: Path):
+        first = DecodedImageCache(1000, tmp_path)
+        second = DecodedImageCache(1000, tmp_path)
+
+        first.put("a", _image(4))
+
+        assert "a" in second
+        image = second.get("a")
+        assert isinstance(image, np.memmap)
+        assert np.array_equal(image, _image(4))
+
+    def test_evicted_images_are_removed_from_disk(self, tmp_path: Path):
+        cache = DecodedImageCache(300, tmp_path)
+        cache.put("a", _image(1))
+
+        cache.put("b", _image(2))
+
+        assert len(list(tmp_path.glob("*.npy"))) == 1
+        assert "a" not in cache
+
+    def test_raises_for_negative_size(self):
+        with pytest.raises(ValueError):
+            DecodedImageCache(-1)
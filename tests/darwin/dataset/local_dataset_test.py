@@ -1,9 +1,23 @@
+import json
+import os
+import shutil
 from pathlib import Path
 from shutil import copyfile
+from typing import List
+from unittest.mock import patch
 
+import numpy as np
 import pytest
+from PIL import Image as PILImage
 
-from darwin.dataset.local_dataset import get_annotation_filepaths
+from darwin.dataset.image_cache import DecodedImageCache
+from darwin.dataset.local_dataset import (
+    LABEL_STATISTICS_DIR_NAME,
+    LocalDataset,
+    _get_image_moments,
+    get_annotation_filepaths,
+)
+from darwin.dataset.utils import load_pil_image
 from tests.fixtures import *
 
 
@@ -83,3 +97,315 @@ class TestGetAnnotationFilepaths:
         assert str(annotations_path / "1.json") in annotation_filepaths
         assert str(annotations_path / "2/2.json") in annotation_filepaths
         assert str(annotations_path / "test/3/3.json") in annotation_filepaths
+
+
+class TestLocalDatasetIndex:
+    @pytest.fixture
+    def dataset_path(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> Path:
+        return team_extracted_dataset_path / team_slug_darwin_json_v2 / "ml"
+
+    def test_index_matches_a_full_scan(self, dataset_path: Path):
+        scanned = LocalDataset(dataset_path, "tag", release_name="latest")
+        indexed = LocalDataset(
+            dataset_path, "tag", release_name="latest", cache_index=True
+        )
+
+        assert indexed.images_path == scanned.images_path
+        assert indexed.annotations_path == scanned.annotations_path
+        for index in range(len(scanned)):
+            assert indexed.get_height_and_width(index) == scanned.get_height_and_width(
+                index
+            )
+
+    def test_index_lists_files_larger_than_the_stream_buffer(self, dataset_path: Path):
+        annotation_path = (
+            dataset_path / "releases" / "latest" / "annotations" / "0.json"
+        )
+        darwin_json = json.loads(annotation_path.read_text())
+        polygon = {
+            "name": "red",
+            "slot_names": ["0"],
+            "polygon": {"paths": [[{"x": x, "y": x} for x in range(100)]]},
+        }
+        darwin_json["annotations"] = [
+            {**polygon, "id": str(i)} for i in range(20)
+        ] + darwin_json["annotations"]
+        annotation_path.write_text(json.dumps(darwin_json))
+        assert annotation_path.stat().st_size > 32 * 1024
+
+        scanned = LocalDataset(dataset_path, "tag", release_name="latest")
+        indexed = LocalDataset(
+            dataset_path, "tag", release_name="latest", cache_index=True
+        )
+
+        assert annotation_path in indexed.annotations_path
+        assert indexed.annotations_path == scanned.annotations_path
+
+    def test_index_is_loaded_without_scanning(self, dataset_path: Path):
+        first = LocalDataset(
+            dataset_path, "tag", release_name="latest", cache_index=True
+        )
+        assert list(
+            (dataset_path / "releases" / "latest").glob(".local_dataset_index/*.npz")
+        )
+
+        with patch.object(LocalDataset, "_setup_annotations_and_images") as mock_setup:
+            second = LocalDataset(
+                dataset_path, "tag", release_name="latest", cache_index=True
+            )
+
+        mock_setup.assert_not_called()
+        assert second.images_path == first.images_path
+        assert second.annotations_path == first.annotations_path
+        assert second.image_heights == first.image_heights
+        assert second.image_widths == first.image_widths
+
+    def test_index_is_rebuilt_when_the_release_changes(self, dataset_path: Path):
+        LocalDataset(dataset_path, "tag", release_name="latest", cache_index=True)
+        annotations_dir = dataset_path / "releases" / "latest" / "annotations"
+        stat = annotations_dir.stat()
+        os.utime(annotations_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch.object(
+            LocalDataset,
+            "_setup_annotations_and_images",
+            autospec=True,
+            side_effect=LocalDataset._setup_annotations_and_images,
+        ) as mock_setup:
+            LocalDataset(dataset_path, "tag", release_name="latest", cache_index=True)
+
+        mock_setup.assert_called_once()
+
+    def test_index_is_rebuilt_when_an_annotation_file_is_edited_in_place(
+        self, dataset_path: Path
+    ):
+        LocalDataset(dataset_path, "tag", release_name="latest", cache_index=True)
+        annotations_dir = dataset_path / "releases" / "latest" / "annotations"
+        annotation_path = annotations_dir / "0.json"
+        dir_stat = annotations_dir.stat()
+        annotation_path.write_text(annotation_path.read_text() + " ")
+        os.utime(annotations_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+        with patch.object(
+            LocalDataset,
+            "_setup_annotations_and_images",
+            autospec=True,
+            side_effect=LocalDataset._setup_annotations_and_images,
+        ) as mock_setup:
+            LocalDataset(dataset_path, "tag", release_name="latest", cache_index=True)
+
+        mock_setup.assert_called_once()
+
+
+class TestGetLabelStatistics:
+    @pytest.fixture
+    def dataset_path(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> Path:
+        return team_extracted_dataset_path / team_slug_darwin_json_v2 / "coco"
+
+    def test_collects_the_labels_of_each_sample(self, dataset_path: Path):
+        ds = LocalDataset(dataset_path, "polygon", release_name="latest")
+
+        stats = ds.get_label_statistics(multi_processed=False)
+
+        expected = [
+            [
+                ds.classes.index(a.annotation_class.name)
+                for a in ds.parse_json(i)["annotations"]
+            ]
+            for i in range(len(ds))
+        ]
+        assert stats.class_ids == expected
+        assert stats.class_counts.sum() == sum(len(ids) for ids in expected)
+        assert stats.is_multi_label == any(len(ids) > 1 for ids in expected)
+        assert np.isclose(stats.weights.sum(), 1)
+
+    def test_parallel_pass_matches_serial_pass(self, dataset_path: Path):
+        ds = LocalDataset(dataset_path, "polygon", release_name="latest")
+        serial = ds.get_label_statistics(multi_processed=False)
+        shutil.rmtree(ds.release_path / LABEL_STATISTICS_DIR_NAME)
+
+        parallel = ds.get_label_statistics(multi_processed=True)
+
+        assert parallel.class_ids == serial.class_ids
+
+    def test_statistics_are_cached_in_the_release(self, dataset_path: Path):
+        ds = LocalDataset(dataset_path, "polygon", release_name="latest")
+        first = ds.get_label_statistics(multi_processed=False)
+
+        with patch(
+            "darwin.dataset.local_dataset._get_annotation_class_ids"
+        ) as mock_get_class_ids:
+            second = ds.get_label_statistics(multi_processed=False)
+
+        mock_get_class_ids.assert_not_called()
+        assert second.class_ids == first.class_ids
+        assert np.array_equal(second.class_counts, first.class_counts)
+
+    def test_statistics_are_recomputed_when_a_file_is_edited_in_place(
+        self, dataset_path: Path
+    ):
+        ds = LocalDataset(dataset_path, "polygon", release_name="latest")
+        first = ds.get_label_statistics(multi_processed=False)
+        annotations_dir = ds.release_path / "annotations"
+        dir_stat = annotations_dir.stat()
+        annotation_path = ds.annotations_path[0]
+        darwin_json = json.loads(annotation_path.read_text())
+        darwin_json["annotations"] = darwin_json["annotations"][:0]
+        annotation_path.write_text(json.dumps(darwin_json))
+        os.utime(annotations_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+        second = ds.get_label_statistics(multi_processed=False)
+
+        assert first.class_ids[0]
+        assert second.class_ids[0] == []
+        assert second.class_ids[1:] == first.class_ids[1:]
+
+
+class TestMeasureMeanStd:
+    @pytest.fixture
+    def dataset(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> LocalDataset:
+        return LocalDataset(
+            team_extracted_dataset_path / team_slug_darwin_json_v2 / "coco",
+            "polygon",
+            release_name="latest",
+        )
+
+    @staticmethod
+    def _save_images(directory: Path, arrays: List[np.ndarray]) -> List[Path]:
+        paths = []
+        for i, array in enumerate(arrays):
+            path = directory / f"{i}.png"
+            PILImage.fromarray(array).save(path)
+            paths.append(path)
+        return paths
+
+    def test_matches_the_statistics_of_all_pixels(
+        self, dataset: LocalDataset, tmp_path: Path
+    ):
+        rng = np.random.default_rng(0)
+        arrays = [
+            rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8)
+            for h, w in [(5, 7), (11, 3), (8, 8)]
+        ]
+        dataset.images_path = self._save_images(tmp_path, arrays)
+
+        mean, std = dataset.measure_mean_std(multi_processed=False)
+
+        pixels = np.concatenate([a.reshape(-1, 3) for a in arrays]) / 255.0
+        assert np.allclose(mean, pixels.mean(axis=0), atol=1e-6)
+        assert np.allclose(std, pixels.std(axis=0), atol=1e-6)
+
+    def test_parallel_pass_matches_serial_pass(
+        self, dataset: LocalDataset, tmp_path: Path
+    ):
+        rng = np.random.default_rng(1)
+        arrays = [
+            rng.integers(0, 256, size=(6, 4, 3), dtype=np.uint8) for _ in range(4)
+        ]
+        dataset.images_path = self._save_images(tmp_path, arrays)
+
+        serial = dataset.measure_mean_std(multi_processed=False)
+        parallel = dataset.measure_mean_std(multi_processed=True)
+
+        assert np.allclose(serial[0], parallel[0])
+        assert np.allclose(serial[1], parallel[1])
+
+    def test_measures_grayscale_and_rgba_images_on_their_own_channels(
+        self, dataset: LocalDataset, tmp_path: Path
+    ):
+        rng = np.random.default_rng(2)
+        gray = rng.integers(0, 256, size=(4, 5), dtype=np.uint8)
+        rgba = rng.integers(0, 256, size=(4, 5, 4), dtype=np.uint8)
+
+        (tmp_path / "gray").mkdir()
+        dataset.images_path = self._save_images(tmp_path / "gray", [gray])
+        mean, std = dataset.measure_mean_std(multi_processed=False, to_rgb=False)
+        assert mean.shape == (1,)
+        assert np.allclose(mean, gray.mean() / 255.0, atol=1e-6)
+
+        (tmp_path / "rgba").mkdir()
+        dataset.images_path = self._save_images(tmp_path / "rgba", [rgba])
+        mean, std = dataset.measure_mean_std(multi_processed=False, to_rgb=False)
+        assert mean.shape == (4,)
+        assert np.allclose(std, (rgba.reshape(-1, 4) / 255.0).std(axis=0), atol=1e-6)
+
+    def test_raises_if_channels_differ_without_rgb_conversion(
+        self, dataset: LocalDataset, tmp_path: Path
+    ):
+        dataset.images_path = self._save_images(
+            tmp_path,
+            [np.zeros((2, 2), dtype=np.uint8), np.zeros((2, 2, 3), dtype=np.uint8)],
+        )
+
+        with pytest.raises(ValueError):
+            dataset.measure_mean_std(multi_processed=False, to_rgb=False)
+        assert dataset.measure_mean_std(multi_processed=False)[0].shape == (3,)
+
+    def test_sample_is_deterministic_for_a_seed(
+        self, dataset: LocalDataset, tmp_path: Path
+    ):
+        rng = np.random.default_rng(3)
+        arrays = [
+            rng.integers(0, 256, size=(3, 3, 3), dtype=np.uint8) for _ in range(10)
+        ]
+        dataset.images_path = self._save_images(tmp_path, arrays)
+
+        with patch(
+            "darwin.dataset.local_dataset._get_image_moments",
+            wraps=_get_image_moments,
+        ) as mock_moments:
+            first = dataset.measure_mean_std(
+                multi_processed=False, sample_size=4, seed=7
+            )
+        second = dataset.measure_mean_std(multi_processed=False, sample_size=4, seed=7)
+
+        assert mock_moments.call_count == 4
+        assert np.array_equal(first[0], second[0])
+        assert np.array_equal(first[1], second[1])
+
+
+class TestGetImage:
+    @pytest.fixture
+    def dataset(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> Path:
+        return team_extracted_dataset_path / team_slug_darwin_json_v2 / "sl"
+
+    def test_decodes_each_image_once_with_a_cache(self, dataset: Path):
+        ds = LocalDataset(
+            dataset,
+            "tag",
+            release_name="latest",
+            image_cache=DecodedImageCache(10**8),
+        )
+        expected = np.asarray(load_pil_image(ds.images_path[0]))
+
+        with patch(
+            "darwin.dataset.local_dataset.load_pil_image", wraps=load_pil_image
+        ) as mock_load:
+            first = ds.get_image(0)
+            second = ds[0][0]
+
+        mock_load.assert_called_once()
+        assert np.array_equal(np.asarray(first), expected)
+        assert np.array_equal(np.asarray(second), expected)
+
+    def test_draft_size_is_only_available_for_tags(self, dataset: Path):
+        with pytest.raises(ValueError):
+            LocalDataset(
+                dataset, "polygon", release_name="latest", image_draft_size=(8, 8)
+            )
+
+    def test_draft_size_decodes_jpeg_images_at_a_reduced_scale(self, tmp_path: Path):
+        path = tmp_path / "image.jpg"
+        PILImage.fromarray(np.zeros((512, 512, 3), dtype=np.uint8)).save(path)
+
+        assert load_pil_image(path, draft_size=(100, 100)).size == (128, 128)
+        assert load_pil_image(path, draft_size=(300, 300)).size == (512, 512)
+        assert load_pil_image(path).size == (512, 512)
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+from darwin.dataset.pull_manifest import MANIFEST_FILE_NAME, PullManifest
+
+
+@pytest.fixture
+def images_path(tmp_path: Path) -> Path:
+    path = tmp_path / "images"
+    path.mkdir()
+    return path
+
+
+def test_stores_manifest_next_to_images(images_path: Path) -> None:
+    with PullManifest(images_path) as manifest:
+        assert manifest.path == images_path.parent / MANIFEST_FILE_NAME
+    assert (images_path.parent / MANIFEST_FILE_NAME).exists()
+
+
+def test_hash_annotation_depends_on_content(tmp_path: Path) -> None:
+    a = tmp_path / "a.json"
+    b = tmp_path / "b.json"
+    a.write_text('{"a": 1}')
+    b.write_text('{"a": 1}')
+    assert PullManifest.hash_annotation(a) == PullManifest.hash_annotation(b)
+    b.write_text('{"a": 2}')
+    assert PullManifest.hash_annotation(a) != PullManifest.hash_annotation(b)
+
+
+def test_unknown_annotation_is_not_downloaded(images_path: Path) -> None:
+    with PullManifest(images_path) as manifest:
+        assert not manifest.is_downloaded("hash", True)
+
+
+def test_is_downloaded_once_all_files_exist(images_path: Path) -> None:
+    planned = [images_path / "folder" / "a.jpg", images_path / "b.jpg"]
+    with PullManifest(images_path) as manifest:
+        manifest.add("hash", True, "item-id", planned)
+        assert not manifest.is_downloaded("hash", True)
+
+        planned[0].parent.mkdir()
+        for path in planned:
+            path.write_bytes(b"data")
+        assert manifest.is_downloaded("hash", True)
+        assert not manifest.is_downloaded("hash", False)
+
+
+def test_detects_files_that_changed_size(images_path: Path) -> None:
+    path = images_path / "a.jpg"
+    path.write_bytes(b"data")
+    with PullManifest(images_path) as manifest:
+        manifest.add("hash", True, "item-id", [path])
+        assert manifest.is_downloaded("hash", True)
+
+    path.write_bytes(b"truncated data")
+    with PullManifest(images_path) as manifest:
+        assert not manifest.is_downloaded("hash", True)
+
+
+def test_persists_across_instances(images_path: Path) -> None:
+    path = images_path / "a.jpg"
+    path.write_bytes(b"data")
+    with PullManifest(images_path) as manifest:
+        manifest.add("hash", True, "item-id", [path])
+
+    with PullManifest(images_path) as manifest:
+        assert manifest.is_downloaded("hash", True)
+
+
+def test_prune_forgets_annotations_not_seen(images_path: Path) -> None:
+    kept = images_path / "kept.jpg"
+    dropped = images_path / "dropped.jpg"
+    for path in [kept, dropped]:
+        path.write_bytes(b"data")
+    with PullManifest(images_path) as manifest:
+        manifest.add("kept", True, "1", [kept])
+        manifest.add("dropped", True, "2", [dropped])
+
+    with PullManifest(images_path) as manifest:
+        assert manifest.is_downloaded("kept", True)
+        manifest.prune()
+
+    with PullManifest(images_path) as manifest:
+        assert not manifest.is_downloaded("dropped", True)
+
+
+def test_stale_paths_are_the_files_of_annotations_not_seen(images_path: Path) -> None:
+    kept = images_path / "kept.jpg"
+    moved = images_path / "moved.jpg"
+    dropped = images_path / "folder" / "dropped.jpg"
+    with PullManifest(images_path) as manifest:
+        manifest.add("kept", True, "1", [kept])
+        manifest.add("dropped", True, "2", [dropped, moved])
+
+    with PullManifest(images_path) as manifest:
+        manifest.is_downloaded("kept", True)
+        manifest.add("changed", True, "3", [moved])
+        assert manifest.get_stale_paths() == [dropped]
+
+
+def test_count_downloaded_only_counts_files_on_disk(images_path: Path) -> None:
+    on_disk = images_path / "a.jpg"
+    on_disk.write_bytes(b"data")
+    with PullManifest(images_path) as manifest:
+        manifest.add("a", True, "1", [on_disk, images_path / "b.jpg"])
+        manifest.add("c", False, "2", [on_disk])
+        assert manifest.count_downloaded() == 1
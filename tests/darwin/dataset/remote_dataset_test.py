@@ -834,6 +834,16 @@ class TestPull:
         with pytest.raises(ValueError):
             remote_dataset.pull(retry=True, retry_timeout=5, retry_interval=10)
 
+    def test_raises_error_if_engine_is_not_supported(self, remote_dataset):
+        with pytest.raises(ValueError, match="not supported"):
+            remote_dataset.pull(engine="async")
+
+    def test_raises_error_if_max_connections_per_host_is_not_positive(
+        self, remote_dataset
+    ):
+        with pytest.raises(ValueError, match="max_connections_per_host"):
+            remote_dataset.pull(engine="threads", max_connections_per_host=0)
+
 
 class TestPullNamingConvention:
     def _test_pull_naming_convention(
@@ -0,0 +1,94 @@
+import sqlite3
+from pathlib import Path
+from time import time
+from unittest.mock import patch
+
+from darwin.dataset.remote_index import REMOTE_INDEX_FILE_NAME, RemoteItemIndex
+
+LAYOUT = {"type": "simple", "version": 1, "slots": ["0"]}
+
+
+def _remote_file(item_id: str) -> dict:
+    return {"item_id": item_id, "slot_names": ["0"], "layout": LAYOUT}
+
+
+def test_returns_only_indexed_items(tmp_path: Path) -> None:
+    with RemoteItemIndex(tmp_path / REMOTE_INDEX_FILE_NAME, 1) as index:
+        index.update({"/a.jpg": _remote_file("a"), "/b.jpg": _remote_file("b")})
+
+        assert len(index) == 2
+        assert index.get(["/a.jpg", "/missing.jpg"]) == {"/a.jpg": _remote_file("a")}
+
+
+def test_persists_across_runs(tmp_path: Path) -> None:
+    path = tmp_path / "dataset" / REMOTE_INDEX_FILE_NAME
+    with RemoteItemIndex(path, 1) as index:
+        index.update({"/a.jpg": _remote_file("a")})
+
+    with RemoteItemIndex(path, 1) as index:
+        assert index.get(["/a.jpg"]) == {"/a.jpg": _remote_file("a")}
+
+
+def test_is_cleared_for_another_dataset(tmp_path: Path) -> None:
+    path = tmp_path / REMOTE_INDEX_FILE_NAME
+    with RemoteItemIndex(path, 1) as index:
+        index.update({"/a.jpg": _remote_file("a")})
+
+    with RemoteItemIndex(path, 2) as index:
+        assert len(index) == 0
+
+
+def test_looks_up_more_paths_than_a_query_can_bind(tmp_path: Path) -> None:
+    remote_files = {f"/{i}.jpg": _remote_file(str(i)) for i in range(1200)}
+    with RemoteItemIndex(tmp_path / REMOTE_INDEX_FILE_NAME, 1) as index:
+        index.update(remote_files)
+
+        assert index.get(list(remote_files)) == remote_files
+
+
+def test_leaves_out_expired_items(tmp_path: Path) -> None:
+    path = tmp_path / REMOTE_INDEX_FILE_NAME
+    with RemoteItemIndex(path, 1, ttl=60) as index:
+        index.update({"/a.jpg": _remote_file("a")})
+
+    with patch("darwin.dataset.remote_index.time.time", return_value=time() + 61):
+        with RemoteItemIndex(path, 1, ttl=60) as index:
+            assert index.get(["/a.jpg"]) == {}
+            index.update({"/a.jpg": _remote_file("new")})
+            assert index.get(["/a.jpg"]) == {"/a.jpg": _remote_file("new")}
+
+
+def test_ttl_can_be_set_from_the_environment(tmp_path: Path) -> None:
+    with patch.dict("os.environ", {"DARWIN_REMOTE_INDEX_TTL": "0"}):
+        with RemoteItemIndex(tmp_path / REMOTE_INDEX_FILE_NAME, 1) as index:
+            index.update({"/a.jpg": _remote_file("a")})
+
+            assert index.ttl == 0
+            assert index.get(["/a.jpg"]) == {}
+
+
+def test_removes_items(tmp_path: Path) -> None:
+    with RemoteItemIndex(tmp_path / REMOTE_INDEX_FILE_NAME, 1) as index:
+        index.update({"/a.jpg": _remote_file("a"), "/b.jpg": _remote_file("b")})
+        index.remove(["/a.jpg"])
+
+        assert index.get(["/a.jpg", "/b.jpg"]) == {"/b.jpg": _remote_file("b")}
+
+
+def test_rebuilds_an_index_of_an_older_version(tmp_path: Path) -> None:
+    path = tmp_path / REMOTE_INDEX_FILE_NAME
+    connection = sqlite3.connect(str(path))
+    connection.executescript(
+        """
+        CREATE TABLE items (full_path TEXT PRIMARY KEY, item_id TEXT, slot_names TEXT, layout TEXT);
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        INSERT INTO items VALUES ('/a.jpg', 'a', '["0"]', 'null');
+        INSERT INTO meta VALUES ('dataset_id', '1');
+        """
+    )
+    connection.close()
+
+    with RemoteItemIndex(path, 1) as index:
+        assert len(index) == 0
+        index.update({"/a.jpg": _remote_file("a")})
+        assert index.get(["/a.jpg"]) == {"/a.jpg": _remote_file("a")}
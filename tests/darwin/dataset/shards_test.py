@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import orjson as json
+import pytest
+
+from darwin.dataset.shards import iterate_shard, pack_dataset, read_shards_index
+from darwin.dataset.split_manager import split_dataset
+from darwin.utils import attempt_decode
+from tests.fixtures import *
+
+
+@pytest.fixture
+def dataset(team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path) -> Path:
+    return team_extracted_dataset_path / team_slug_darwin_json_v2 / "sl"
+
+
+class TestPackDataset:
+    def test_packs_every_image_with_its_annotation(self, dataset: Path):
+        shards = pack_dataset(dataset, "latest")
+
+        assert shards == [dataset / "releases/latest/shards/all/shard-000000.tar"]
+        samples = list(iterate_shard(shards[0]))
+        annotations = sorted((dataset / "releases/latest/annotations").glob("*.json"))
+        assert len(samples) == len(annotations)
+        for _, members in samples:
+            annotation = json.loads(members["json"])
+            name = annotation["item"]["name"]
+            assert (
+                members[Path(name).suffix[1:]]
+                == (dataset / "images" / name).read_bytes()
+            )
+            assert annotation == attempt_decode(
+                dataset / "releases/latest/annotations" / f"{Path(name).stem}.json"
+            )
+
+    def test_starts_a_new_shard_when_one_is_full(self, dataset: Path, tmp_path: Path):
+        shards = pack_dataset(dataset, "latest", output_dir=tmp_path, shard_size=1)
+
+        index = read_shards_index(tmp_path)
+        assert len(shards) == index["samples"] > 1
+        assert [shard["name"] for shard in index["shards"]] == [s.name for s in shards]
+        assert all(shard["samples"] == 1 for shard in index["shards"])
+        keys = [key for shard in shards for key, _ in iterate_shard(shard)]
+        assert keys == [f"{i:09d}" for i in range(len(shards))]
+
+    def test_is_deterministic(self, dataset: Path, tmp_path: Path):
+        first = pack_dataset(dataset, "latest", output_dir=tmp_path / "a", seed=1)
+        second = pack_dataset(dataset, "latest", output_dir=tmp_path / "b", seed=1)
+
+        assert [p.read_bytes() for p in first] == [p.read_bytes() for p in second]
+
+    def test_packs_a_partition(self, dataset: Path):
+        split_path = split_dataset(
+            dataset, "latest", val_percentage=0.25, test_percentage=0.25, split_seed=0
+        )
+        val_size = len((split_path / "random_val.txt").read_text().splitlines())
+
+        shards = pack_dataset(dataset, "latest", partition="val", split=split_path.name)
+
+        assert shards[0].parent.name == f"{split_path.name}_random_val"
+        assert read_shards_index(shards[0].parent)["samples"] == val_size
+
+    def test_raises_with_an_invalid_shard_size(self, dataset: Path):
+        with pytest.raises(ValueError):
+            pack_dataset(dataset, "latest", shard_size=0)
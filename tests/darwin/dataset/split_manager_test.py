@@ -4,7 +4,11 @@ from pathlib import Path
 import numpy as np
 import pytest
 
-from darwin.dataset.split_manager import split_dataset
+from darwin.dataset.split_manager import (
+    _stratify_samples_iteratively,
+    _water_fill,
+    split_dataset,
+)
 from darwin.utils import SUPPORTED_IMAGE_EXTENSIONS
 from tests.fixtures import *
 
@@ -75,3 +79,85 @@ class TestClassificationDataset:
                 lines_len = len([line for line in f.readlines() if line.strip() != ""])
                 local_size = lines_len / tot_size, size
                 assert np.allclose(local_size, size, atol=1e-3)
+
+
+class TestIterativeStratification:
+    @pytest.fixture
+    def idx_to_classes(self):
+        rng = np.random.default_rng(0)
+        weights = 1 / np.arange(1, 21)
+        return {
+            i: {
+                f"class_{c}"
+                for c in rng.choice(
+                    20, rng.integers(1, 4), replace=False, p=weights / weights.sum()
+                )
+            }
+            for i in range(1000)
+            if i % 10 != 0
+        }
+
+    def test_assigns_every_labelled_image_to_one_partition(self, idx_to_classes):
+        partitions = _stratify_samples_iteratively(idx_to_classes, 0, 700, 100, 200)
+
+        assigned = [i for partition in partitions for i in partition]
+        assert sorted(assigned) == sorted(idx_to_classes)
+
+    def test_preserves_the_label_ratios(self, idx_to_classes):
+        partitions = _stratify_samples_iteratively(idx_to_classes, 0, 700, 100, 200)
+
+        for class_name in {"class_0", "class_5", "class_19"}:
+            counts = np.array(
+                [
+                    sum(class_name in idx_to_classes[i] for i in partition)
+                    for partition in partitions
+                ]
+            )
+            assert np.allclose(counts / counts.sum(), [0.7, 0.1, 0.2], atol=0.05)
+
+    def test_is_deterministic_for_a_seed(self, idx_to_classes):
+        first = _stratify_samples_iteratively(idx_to_classes, 3, 700, 100, 200)
+        second = _stratify_samples_iteratively(idx_to_classes, 3, 700, 100, 200)
+
+        assert first == second
+
+    def test_water_fill_follows_the_highest_desired_count(self):
+        assert _water_fill(np.array([5.0, 1.0, 2.0]), 5).tolist() == [4, 0, 1]
+        assert _water_fill(np.array([-1.0, -2.0, -3.0]), 2).tolist() == [2, 0, 0]
+        assert _water_fill(np.array([1.0, 1.0, 1.0]), 4).tolist() == [2, 1, 1]
+
+    def test_split_dataset_with_iterative_strategy(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ):
+        root = team_extracted_dataset_path / team_slug_darwin_json_v2 / "sl"
+
+        splits = split_dataset(
+            root,
+            release_name="latest",
+            val_percentage=0.2,
+            test_percentage=0.3,
+            strategy="iterative",
+        )
+        first = {
+            path.name: path.read_text() for path in splits.glob("stratified_*.txt")
+        }
+        split_dataset(
+            root,
+            release_name="latest",
+            val_percentage=0.2,
+            test_percentage=0.3,
+            strategy="iterative",
+        )
+
+        assert first
+        assert first == {
+            path.name: path.read_text() for path in splits.glob("stratified_*.txt")
+        }
+
+    def test_raises_for_unknown_strategy(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ):
+        root = team_extracted_dataset_path / team_slug_darwin_json_v2 / "sl"
+
+        with pytest.raises(ValueError):
+            split_dataset(root, release_name="latest", strategy="unknown")
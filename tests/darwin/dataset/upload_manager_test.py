@@ -1,7 +1,10 @@
+import json
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 import responses
 
 from darwin.client import Client
@@ -10,8 +13,12 @@ from darwin.dataset import RemoteDataset
 from darwin.dataset.identifier import DatasetIdentifier
 from darwin.dataset.remote_dataset_v2 import RemoteDatasetV2
 from darwin.dataset.upload_manager import (
+    UPLOAD_JOURNAL_FILE_NAME,
+    ItemPayload,
     LocalFile,
     UploadHandler,
+    UploadHandlerV2,
+    UploadJournal,
     UploadStage,
     _upload_chunk_size,
 )
@@ -404,6 +411,131 @@ def test_upload_files(dataset: RemoteDataset, request_upload_endpoint: str):
     assert upload_handler.error_count == 0
 
 
+@pytest.fixture
+def single_item_upload_endpoints(request_upload_endpoint: str):
+    request_upload_response = {
+        "blocked_items": [],
+        "items": [
+            {
+                "id": "3b241101-e2bb-4255-8caf-4136c566a964",
+                "name": "test.jpg",
+                "path": "/",
+                "slots": [
+                    {
+                        "type": "image",
+                        "file_name": "test.jpg",
+                        "slot_name": "0",
+                        "upload_id": "123e4567-e89b-12d3-a456-426614174000",
+                        "as_frames": False,
+                        "extract_views": False,
+                    }
+                ],
+            }
+        ],
+    }
+    base = "http://localhost/api/v2/teams/v7-darwin-json-v2/items/uploads/123e4567-e89b-12d3-a456-426614174000"
+    endpoints = {
+        "register": request_upload_endpoint,
+        "sign": f"{base}/sign",
+        "upload": "https://darwin-data.s3.eu-west-1.amazonaws.com/test.jpg?X-Amz-Signature=abc",
+        "confirm": f"{base}/confirm",
+    }
+    responses.add(
+        responses.POST, endpoints["register"], json=request_upload_response, status=200
+    )
+    responses.add(
+        responses.GET,
+        endpoints["sign"],
+        json={"upload_url": endpoints["upload"]},
+        status=200,
+    )
+    return endpoints
+
+
+@pytest.mark.usefixtures("file_read_write_test")
+@responses.activate
+def test_upload_retries_dropped_connections_from_the_first_byte(
+    dataset: RemoteDataset, single_item_upload_endpoints, tmp_path: Path
+):
+    endpoints = single_item_upload_endpoints
+    bodies = []
+
+    def flaky_upload(request):
+        body = request.body
+        bodies.append(body.read() if hasattr(body, "read") else body)
+        if len(bodies) == 1:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return 200, {}, ""
+
+    responses.add_callback(responses.PUT, endpoints["upload"], callback=flaky_upload)
+    responses.add(responses.POST, endpoints["confirm"], status=200)
+
+    file_path = tmp_path / "test.jpg"
+    file_path.write_bytes(b"image bytes")
+    upload_handler = UploadHandler.build(dataset, [LocalFile(local_path=file_path)])
+    with patch("darwin.dataset.upload_manager.time.sleep"):
+        upload_handler.upload()
+
+    assert upload_handler.error_count == 0
+    assert bodies == [b"image bytes", b"image bytes"]
+    responses.assert_call_count(endpoints["confirm"], 1)
+
+
+@pytest.mark.usefixtures("file_read_write_test")
+@responses.activate
+def test_resume_skips_registration_of_unconfirmed_uploads(
+    dataset: RemoteDataset, single_item_upload_endpoints, tmp_path: Path
+):
+    endpoints = single_item_upload_endpoints
+    responses.add(responses.PUT, endpoints["upload"], status=500)
+    responses.add(responses.PUT, endpoints["upload"], status=200)
+    responses.add(responses.POST, endpoints["confirm"], status=200)
+
+    file_path = tmp_path / "test.jpg"
+    file_path.write_bytes(b"image bytes")
+
+    interrupted = UploadHandlerV2(dataset, [LocalFile(file_path)], resume=True)
+    interrupted.upload()
+    assert interrupted.error_count == 1
+    assert (dataset.local_path / UPLOAD_JOURNAL_FILE_NAME).exists()
+
+    resumed = UploadHandlerV2(dataset, [LocalFile(file_path)], resume=True)
+    assert resumed.pending_count == 1
+    assert (
+        resumed.pending_items[0].slots[0]["upload_id"]
+        == "123e4567-e89b-12d3-a456-426614174000"
+    )
+    resumed.upload()
+    assert resumed.error_count == 0
+    responses.assert_call_count(endpoints["register"], 1)
+
+    # Confirmed uploads are forgotten, so the next push registers the file again
+    assert (
+        UploadJournal(dataset.local_path / UPLOAD_JOURNAL_FILE_NAME).get(
+            LocalFile(file_path)
+        )
+        is None
+    )
+
+
+def test_journal_ignores_files_modified_since_registration(tmp_path: Path):
+    file_path = tmp_path / "test.jpg"
+    file_path.write_bytes(b"image bytes")
+    local_file = LocalFile(file_path)
+    item = ItemPayload(
+        dataset_item_id="item-id",
+        filename="test.jpg",
+        path="/",
+        slots=[{"upload_id": "upload-id"}],
+    )
+    journal = UploadJournal(tmp_path / "journal.sqlite")
+    journal.add(local_file, item)
+    assert journal.get(local_file).slots[0]["upload_id"] == "upload-id"
+
+    file_path.write_bytes(b"other image bytes")
+    assert journal.get(local_file) is None
+
+
 class TestUploadChunkSize:
     def test_default_value_when_env_var_is_not_set(self):
         assert _upload_chunk_size() == 500
@@ -417,3 +549,130 @@ class TestUploadChunkSize:
     def test_value_specified_by_env_var(self, mock: MagicMock):
         assert _upload_chunk_size() == 123
         mock.assert_called_once_with("DARWIN_UPLOAD_CHUNK_SIZE")
+
+
+def _registered_item(name: str) -> dict:
+    return {
+        "id": f"id-{name}",
+        "name": name,
+        "path": "/",
+        "slots": [
+            {
+                "type": "image",
+                "file_name": name,
+                "slot_name": "0",
+                "upload_id": f"upload-{name}",
+                "as_frames": False,
+                "extract_views": False,
+            }
+        ],
+    }
+
+
+class TestPipelinedUpload:
+    base_url = "http://localhost/api/v2/teams/v7-darwin-json-v2/items/uploads"
+    bucket_url = "https://darwin-data.s3.eu-west-1.amazonaws.com"
+
+    def _add_upload_endpoints(self, name: str, upload_status: int = 200) -> None:
+        responses.add(
+            responses.GET,
+            f"{self.base_url}/upload-{name}/sign",
+            json={"upload_url": f"{self.bucket_url}/{name}"},
+        )
+        responses.add(responses.PUT, f"{self.bucket_url}/{name}", status=upload_status)
+        responses.add(responses.POST, f"{self.base_url}/upload-{name}/confirm")
+
+    @pytest.mark.usefixtures("file_read_write_test")
+    @responses.activate
+    def test_does_not_register_files_on_init(
+        self, dataset: RemoteDataset, request_upload_endpoint: str, tmp_path: Path
+    ):
+        (tmp_path / "a.jpg").write_bytes(b"a")
+        handler = UploadHandlerV2(
+            dataset, [LocalFile(tmp_path / "a.jpg")], pipelined=True
+        )
+        assert handler.pending_count == 0
+        responses.assert_call_count(request_upload_endpoint, 0)
+
+    @pytest.mark.usefixtures("file_read_write_test")
+    @responses.activate
+    def test_uploads_while_registering(
+        self, dataset: RemoteDataset, request_upload_endpoint: str, tmp_path: Path
+    ):
+        first_item_signed = threading.Event()
+        registered = []
+
+        def register(request):
+            name = json.loads(request.body)["items"][0]["name"]
+            if registered:
+                # The second chunk is only registered once the first file is being uploaded
+                assert first_item_signed.wait(timeout=5)
+            registered.append(name)
+            return (
+                200,
+                {},
+                json.dumps({"blocked_items": [], "items": [_registered_item(name)]}),
+            )
+
+        def sign(request):
+            first_item_signed.set()
+            return 200, {}, json.dumps({"upload_url": f"{self.bucket_url}/a.jpg"})
+
+        responses.add_callback(
+            responses.POST, request_upload_endpoint, callback=register
+        )
+        responses.add_callback(
+            responses.GET, f"{self.base_url}/upload-a.jpg/sign", callback=sign
+        )
+        responses.add(responses.PUT, f"{self.bucket_url}/a.jpg")
+        responses.add(responses.POST, f"{self.base_url}/upload-a.jpg/confirm")
+        self._add_upload_endpoints("b.jpg")
+
+        files = []
+        for name in ["a.jpg", "b.jpg"]:
+            (tmp_path / name).write_bytes(name.encode())
+            files.append(LocalFile(tmp_path / name))
+
+        handler = UploadHandlerV2(dataset, files, pipelined=True)
+        progress = []
+        with patch.dict("os.environ", {"DARWIN_UPLOAD_CHUNK_SIZE": "1"}):
+            handler.upload(
+                progress_callback=lambda total, advance: progress.append(advance)
+            )
+
+        assert registered == ["a.jpg", "b.jpg"]
+        assert handler.pending_count == 2
+        assert handler.error_count == 0
+        assert sum(progress) == 2
+        responses.assert_call_count(f"{self.base_url}/upload-a.jpg/confirm", 1)
+        responses.assert_call_count(f"{self.base_url}/upload-b.jpg/confirm", 1)
+
+    @pytest.mark.usefixtures("file_read_write_test")
+    @responses.activate
+    def test_records_errors_per_stage(
+        self, dataset: RemoteDataset, request_upload_endpoint: str, tmp_path: Path
+    ):
+        responses.add(
+            responses.POST,
+            request_upload_endpoint,
+            json={
+                "blocked_items": [],
+                "items": [_registered_item("a.jpg"), _registered_item("b.jpg")],
+            },
+        )
+        self._add_upload_endpoints("a.jpg", upload_status=500)
+        self._add_upload_endpoints("b.jpg")
+
+        files = []
+        for name in ["a.jpg", "b.jpg"]:
+            (tmp_path / name).write_bytes(name.encode())
+            files.append(LocalFile(tmp_path / name))
+
+        handler = UploadHandlerV2(dataset, files, pipelined=True)
+        handler.upload(max_workers=1)
+
+        assert handler.error_count == 1
+        assert handler.errors[0].stage == UploadStage.UPLOAD_TO_S3
+        assert handler.errors[0].file_path == tmp_path / "a.jpg"
+        responses.assert_call_count(f"{self.base_url}/upload-a.jpg/confirm", 0)
+        responses.assert_call_count(f"{self.base_url}/upload-b.jpg/confirm", 1)
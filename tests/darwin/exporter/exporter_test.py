@@ -0,0 +1,105 @@
+import threading
+import time
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from darwin.exporter import export_annotations, get_exporter
+from darwin.exporter.exporter import darwin_to_dt_gen, run_in_threads
+from tests.fixtures import *
+
+
+@pytest.fixture
+def annotation_paths(
+    team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+) -> List[Path]:
+    root = team_extracted_dataset_path / team_slug_darwin_json_v2
+    videos = sorted((root / "nifti/releases/latest/annotations").glob("*.json"))
+    return [
+        root / "sl/releases/latest/annotations",
+        *[path for path in videos if path.name != "image_annotation.json"],
+        root / "coco/releases/latest/annotations",
+    ]
+
+
+class TestDarwinToDtGen:
+    @pytest.mark.parametrize("split_sequences", [True, False])
+    def test_parses_files_in_the_same_order_with_workers(
+        self, annotation_paths: List[Path], split_sequences: bool
+    ):
+        expected = list(darwin_to_dt_gen(annotation_paths, split_sequences))
+
+        with patch("darwin.exporter.exporter._CHUNK_SIZE", 3):
+            parsed = list(
+                darwin_to_dt_gen(annotation_paths, split_sequences, workers=2)
+            )
+
+        assert [(f.path, f.filename, f.seq) for f in parsed] == [
+            (f.path, f.filename, f.seq) for f in expected
+        ]
+        assert [len(f.annotations) for f in parsed] == [
+            len(f.annotations) for f in expected
+        ]
+
+    def test_numbers_the_frames_of_split_videos(self, annotation_paths: List[Path]):
+        videos = annotation_paths[1:-1]
+        parsed = list(darwin_to_dt_gen(videos, True, workers=2))
+
+        seqs = [f.seq for f in parsed]
+        assert len(seqs) > len(videos)
+        assert seqs == sorted(set(seqs))
+
+    def test_stops_the_pool_when_closed_early(self, annotation_paths: List[Path]):
+        with patch("darwin.exporter.exporter._CHUNK_SIZE", 1):
+            files = darwin_to_dt_gen(annotation_paths, True, workers=2)
+            first = next(files)
+            files.close()
+
+        assert first.path == next(darwin_to_dt_gen(annotation_paths, True)).path
+
+
+class TestExportAnnotations:
+    def test_output_does_not_depend_on_workers(
+        self, annotation_paths: List[Path], tmp_path: Path
+    ):
+        exporter = get_exporter("coco")
+        (tmp_path / "serial").mkdir()
+        (tmp_path / "parallel").mkdir()
+        export_annotations(exporter, annotation_paths, tmp_path / "serial")
+        with patch("darwin.exporter.exporter._CHUNK_SIZE", 2):
+            export_annotations(
+                exporter, annotation_paths, tmp_path / "parallel", workers=3
+            )
+
+        serial = sorted((tmp_path / "serial").iterdir())
+        parallel = sorted((tmp_path / "parallel").iterdir())
+        assert [p.name for p in serial] == [p.name for p in parallel]
+        assert [p.read_bytes() for p in serial] == [p.read_bytes() for p in parallel]
+
+
+class TestRunInThreads:
+    def test_items_with_the_same_key_run_in_order_one_at_a_time(self):
+        lock = threading.Lock()
+        running = set()
+        overlaps = []
+        done = []
+
+        def write(item):
+            key, index = item
+            with lock:
+                if key in running:
+                    overlaps.append(item)
+                running.add(key)
+            time.sleep(0.001 * (index % 3))
+            with lock:
+                running.discard(key)
+                done.append(item)
+
+        items = [(i % 2, i) for i in range(30)]
+        run_in_threads(write, iter(items), workers=4, key=lambda item: item[0])
+
+        assert not overlaps
+        for key in [0, 1]:
+            assert [i for k, i in done if k == key] == [i for k, i in items if k == key]
@@ -1,5 +1,8 @@
 from pathlib import Path
+from typing import Optional
+from zlib import crc32
 
+import orjson as json
 import pytest
 
 import darwin.datatypes as dt
@@ -41,3 +44,73 @@ class TestBuildAnnotations:
         assert coco._build_annotation(annotation_file, "test-id", bbox, categories)[
             "extra"
         ] == {"instance_id": 1}
+
+
+class TestExport:
+    @staticmethod
+    def _annotation_file(
+        name: str, seq: Optional[int], *annotations
+    ) -> dt.AnnotationFile:
+        return dt.AnnotationFile(
+            path=Path(f"{name}.json"),
+            filename=f"{name}.jpg",
+            annotation_classes={a.annotation_class for a in annotations},
+            annotations=list(annotations),
+            seq=seq,
+        )
+
+    def test_writes_an_indented_coco_file(self, tmp_path: Path):
+        polygon = dt.make_polygon(
+            "cat", [{"x": 0, "y": 0}, {"x": 2, "y": 0}, {"x": 0, "y": 2}]
+        )
+        bbox = dt.make_bounding_box("dog", 1, 1, 3, 3)
+        tag = dt.make_tag("blurry")
+        annotation_files = [
+            self._annotation_file("b", 2, polygon, tag),
+            self._annotation_file("a", 1, bbox),
+            self._annotation_file("c", 0),
+        ]
+
+        coco.export(iter(annotation_files), tmp_path)
+
+        content = (tmp_path / "output.json").read_bytes()
+        output = json.loads(content)
+        assert content == json.dumps(
+            output, option=json.OPT_INDENT_2 | json.OPT_SERIALIZE_NUMPY
+        )
+        assert list(output) == [
+            "info",
+            "licenses",
+            "images",
+            "annotations",
+            "categories",
+            "tag_categories",
+        ]
+        assert [image["file_name"] for image in output["images"]] == [
+            "c.jpg",
+            "a.jpg",
+            "b.jpg",
+        ]
+        assert output["images"][2]["tag_ids"] == [crc32(b"blurry")]
+        assert [a["id"] for a in output["annotations"]] == [1, 3]
+        assert [a["category_id"] for a in output["annotations"]] == [
+            crc32(b"cat"),
+            crc32(b"dog"),
+        ]
+        assert [c["name"] for c in output["categories"]] == sorted(
+            ["cat", "dog"], key=lambda name: crc32(name.encode())
+        )
+        assert output["tag_categories"] == [{"id": crc32(b"blurry"), "name": "blurry"}]
+        assert list(tmp_path.iterdir()) == [tmp_path / "output.json"]
+
+    def test_writes_an_image_without_seq(self, tmp_path: Path):
+        coco.export(iter([self._annotation_file("a", None)]), tmp_path)
+
+        output = json.loads((tmp_path / "output.json").read_bytes())
+        assert [image["file_name"] for image in output["images"]] == ["a.jpg"]
+
+    def test_writes_empty_lists_without_annotation_files(self, tmp_path: Path):
+        coco.export(iter([]), tmp_path)
+
+        output = json.loads((tmp_path / "output.json").read_bytes())
+        assert output["images"] == output["annotations"] == output["categories"] == []
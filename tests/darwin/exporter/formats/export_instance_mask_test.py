@@ -0,0 +1,266 @@
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import orjson as json
+import pytest
+from numpy.testing import assert_array_equal
+from PIL import Image
+
+import darwin.datatypes as dt
+from darwin.exporter.formats.instance_mask import (
+    cropped_mask_to_rle,
+    encode_rle_counts,
+    export,
+)
+from darwin.importer.formats.coco import decode_binary_rle
+from darwin.utils import convert_polygons_to_mask
+
+
+def _square(x: int, y: int, size: int) -> List[dt.Point]:
+    return [
+        {"x": x, "y": y},
+        {"x": x + size, "y": y},
+        {"x": x + size, "y": y + size},
+        {"x": x, "y": y + size},
+    ]
+
+
+@pytest.fixture
+def annotation_files() -> List[dt.AnnotationFile]:
+    annotations = [
+        dt.make_polygon("cat", _square(1, 1, 3)),
+        dt.make_bounding_box("dog", 0, 0, 2, 2),
+        dt.make_polygon("dog", [_square(5, 0, 2), _square(0, 6, 3)]),
+        dt.make_polygon("cat", _square(3, 3, 4)),
+    ]
+    return [
+        dt.AnnotationFile(
+            path=Path(f"image_{x}.json"),
+            filename=f"image_{x}.jpg",
+            annotation_classes={a.annotation_class for a in annotations},
+            annotations=annotations[x % 2 :],
+            image_height=10,
+            image_width=8,
+        )
+        for x in range(4)
+    ]
+
+
+def _read_csv(output_dir: Path) -> List[List[str]]:
+    content = (output_dir / "instance_mask_annotations.csv").read_text()
+    return [line.split(",") for line in content.splitlines()]
+
+
+def _full_masks(annotation_files: List[dt.AnnotationFile]) -> dict:
+    return {
+        f"{Path(annotation_file.filename).stem}_{i:05}": convert_polygons_to_mask(
+            annotation.data["paths"], height=10, width=8, value=255
+        )
+        for annotation_file in annotation_files
+        for i, annotation in enumerate(
+            a
+            for a in annotation_file.annotations
+            if a.annotation_class.annotation_type == "polygon"
+        )
+    }
+
+
+class TestExport:
+    def test_full_layout_writes_a_full_size_mask_per_polygon(
+        self, annotation_files: List[dt.AnnotationFile], tmp_path: Path
+    ):
+        export(annotation_files, tmp_path)
+
+        rows = _read_csv(tmp_path)
+        assert rows[0] == ["image_id", "mask_id", "class_name"]
+        assert rows[1:4] == [
+            ["image_0", "image_0_00000", "cat"],
+            ["image_0", "image_0_00001", "dog"],
+            ["image_0", "image_0_00002", "cat"],
+        ]
+        masks = _full_masks(annotation_files)
+        assert len(rows) == len(masks) + 1
+        for mask_id, expected in masks.items():
+            mask = np.asarray(Image.open(tmp_path / "masks" / f"{mask_id}.png"))
+            assert_array_equal(mask, expected)
+
+    def test_cropped_layout_writes_masks_cropped_to_their_polygon(
+        self, annotation_files: List[dt.AnnotationFile], tmp_path: Path
+    ):
+        export(annotation_files, tmp_path, "cropped")
+
+        rows = _read_csv(tmp_path)
+        assert rows[0] == ["image_id", "mask_id", "class_name", "x", "y"]
+        assert rows[1] == ["image_0", "image_0_00000", "cat", "1", "1"]
+        for _, mask_id, _, x, y in rows[1:]:
+            crop = np.asarray(Image.open(tmp_path / "masks" / f"{mask_id}.png"))
+            mask = np.zeros((10, 8), dtype=np.uint8)
+            mask[int(y) : int(y) + crop.shape[0], int(x) : int(x) + crop.shape[1]] = (
+                crop
+            )
+            assert_array_equal(mask, _full_masks(annotation_files)[mask_id])
+
+    def test_id_layout_writes_an_instance_id_mask_per_image(
+        self, annotation_files: List[dt.AnnotationFile], tmp_path: Path
+    ):
+        export(annotation_files, tmp_path, "id")
+
+        rows = _read_csv(tmp_path)
+        assert rows[0] == ["image_id", "mask_id", "class_name", "instance_id"]
+        assert sorted(p.name for p in (tmp_path / "masks").iterdir()) == [
+            f"image_{x}.png" for x in range(4)
+        ]
+        masks = _full_masks(annotation_files)
+        for image_id in ["image_1", "image_0"]:
+            instance_ids = np.asarray(
+                Image.open(tmp_path / "masks" / f"{image_id}.png")
+            )
+            assert instance_ids.dtype == np.uint16
+            expected = np.zeros((10, 8), dtype=np.uint16)
+            for row in rows[1:]:
+                if row[0] == image_id:
+                    expected[masks[row[1]] > 0] = int(row[3])
+            assert_array_equal(instance_ids, expected)
+        # The last polygon of the image is drawn over the first one where they overlap
+        assert instance_ids[3, 3] == 3
+
+    def test_rle_layout_writes_the_coco_rle_of_each_mask(
+        self, annotation_files: List[dt.AnnotationFile], tmp_path: Path
+    ):
+        export(annotation_files, tmp_path, "rle")
+
+        rows = _read_csv(tmp_path)
+        assert rows[0] == ["image_id", "mask_id", "class_name"]
+        masks = _full_masks(annotation_files)
+        for image_id, mask_id, _ in rows[1:]:
+            rle = json.loads((tmp_path / "masks" / f"{image_id}.json").read_bytes())[
+                mask_id
+            ]
+            assert rle["size"] == [10, 8]
+            counts = decode_binary_rle(rle["counts"])
+            values = np.arange(len(counts)) % 2
+            mask = np.repeat(values, counts).reshape(8, 10).T
+            assert_array_equal(mask * 255, masks[mask_id])
+
+    @pytest.mark.parametrize("layout", ["full", "id", "rle", "cropped"])
+    def test_output_does_not_depend_on_workers(
+        self, layout: str, annotation_files: List[dt.AnnotationFile], tmp_path: Path
+    ):
+        export(annotation_files, tmp_path / "serial", layout)
+        export(iter(annotation_files), tmp_path / "parallel", layout, workers=2)
+
+        serial = {
+            p.relative_to(tmp_path / "serial"): p.read_bytes()
+            for p in (tmp_path / "serial").rglob("*.*")
+        }
+        parallel = {
+            p.relative_to(tmp_path / "parallel"): p.read_bytes()
+            for p in (tmp_path / "parallel").rglob("*.*")
+        }
+        assert parallel == serial
+
+    @pytest.mark.parametrize("layout", ["id", "rle", "cropped"])
+    def test_items_with_the_same_name_in_different_folders_are_kept_apart(
+        self, layout: str, annotation_files: List[dt.AnnotationFile], tmp_path: Path
+    ):
+        same_named = [
+            dt.AnnotationFile(
+                path=Path(f"image_{x}.json"),
+                filename="image.jpg",
+                annotation_classes=annotation_file.annotation_classes,
+                annotations=annotation_file.annotations,
+                image_height=10,
+                image_width=8,
+                remote_path=f"/folder_{x}",
+            )
+            for x, annotation_file in enumerate(annotation_files)
+        ]
+
+        export(same_named, tmp_path / "serial", layout)
+        export(iter(same_named), tmp_path / "parallel", layout, workers=2)
+
+        rows = _read_csv(tmp_path / "serial")
+        assert {row[0] for row in rows[1:]} == {f"folder_{x}/image" for x in range(4)}
+        assert rows[1][1] == "folder_0/image_00000"
+        for x in range(4):
+            assert (tmp_path / "serial" / "masks" / f"folder_{x}").is_dir()
+        serial = {
+            p.relative_to(tmp_path / "serial"): p.read_bytes()
+            for p in (tmp_path / "serial").rglob("*.*")
+        }
+        parallel = {
+            p.relative_to(tmp_path / "parallel"): p.read_bytes()
+            for p in (tmp_path / "parallel").rglob("*.*")
+        }
+        assert parallel == serial
+
+    def test_full_layout_keeps_filename_based_ids_for_items_in_folders(
+        self, annotation_files: List[dt.AnnotationFile], tmp_path: Path
+    ):
+        same_named = [
+            dt.AnnotationFile(
+                path=Path(f"image_{x}.json"),
+                filename="image.jpg",
+                annotation_classes=annotation_file.annotation_classes,
+                annotations=annotation_file.annotations,
+                image_height=10,
+                image_width=8,
+                remote_path=f"/folder_{x}",
+            )
+            for x, annotation_file in enumerate(annotation_files)
+        ]
+
+        export(same_named, tmp_path / "serial")
+        export(iter(same_named), tmp_path / "parallel", workers=2)
+
+        rows = _read_csv(tmp_path / "serial")
+        assert {row[0] for row in rows[1:]} == {"image"}
+        assert rows[1][1] == "image_00000"
+        # The masks of the last item overwrite those of the previous ones
+        assert sorted(p.name for p in (tmp_path / "serial" / "masks").iterdir()) == [
+            "image_00000.png",
+            "image_00001.png",
+            "image_00002.png",
+        ]
+        assert_array_equal(
+            np.array(Image.open(tmp_path / "serial" / "masks" / "image_00000.png")),
+            _full_masks(same_named[-1:])["image_00000"],
+        )
+        serial = {
+            p.relative_to(tmp_path / "serial"): p.read_bytes()
+            for p in (tmp_path / "serial").rglob("*.*")
+        }
+        parallel = {
+            p.relative_to(tmp_path / "parallel"): p.read_bytes()
+            for p in (tmp_path / "parallel").rglob("*.*")
+        }
+        assert parallel == serial
+
+    def test_raises_on_unknown_layout(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="Unknown instance mask layout"):
+            export([], tmp_path, "unknown")  # type: ignore
+
+
+class TestCroppedMaskToRle:
+    def test_merges_runs_across_columns(self):
+        mask = np.array([[0, 1, 1], [0, 1, 1], [1, 1, 1]], dtype=np.uint8)
+
+        # Column-major: 0 0 1 | 1 1 1 | 1 1 1
+        assert cropped_mask_to_rle(mask, 0, 0, height=3, width=3) == [2, 7]
+
+    def test_offsets_the_crop_in_the_full_size_mask(self):
+        mask = np.array([[1, 1], [0, 1]], dtype=np.uint8)
+
+        # Column-major: 0 0 0 0 | 0 1 0 0 | 0 1 1 0
+        assert cropped_mask_to_rle(mask, 1, 1, height=4, width=3) == [5, 1, 3, 2, 1]
+
+    def test_starts_with_an_empty_run_of_background(self):
+        counts = cropped_mask_to_rle(np.ones((1, 1)), 0, 0, height=2, width=1)
+
+        assert counts == [0, 1, 1]
+
+    def test_encoded_counts_are_decoded_by_the_coco_importer(self):
+        counts = [0, 3, 40, 1000, 2, 31, 70000, 5]
+
+        assert decode_binary_rle(encode_rle_counts(counts)) == counts
@@ -221,6 +221,17 @@ def test_rle_decoder() -> None:
         rle_decode(odd_number_of_integers, label_colours)
 
 
+def test_rle_decoder_as_array() -> None:
+    label_colours = {1: 1, 3: 2, 5: 3}
+    decoded = rle_decode([5, 1, 1, 2, 3, 0, 5, 2], label_colours, as_array=True)
+
+    assert isinstance(decoded, np.ndarray)
+    assert_array_equal(decoded, [3, 1, 1, 3, 3])
+
+    with pytest.raises(KeyError):
+        rle_decode([1, 2, 4, 2], label_colours, as_array=True)
+
+
 def test_beyond_polygon_beyond_window() -> None:
     mask = np.zeros((5, 5), dtype=np.uint8)
     colours: dt.MaskTypes.ColoursDict = {}
@@ -850,5 +861,122 @@ def test_class_mappings_preserved_on_large_export(tmpdir) -> None:
             assert counts[index] == sizes[inverse_mapping[tuple(colour)]]
 
 
+def _square_annotation_files(count: int, num_classes: int) -> List[dt.AnnotationFile]:
+    # One 1x1 square per class, on its own row of pixels
+    annotations = [
+        dt.make_polygon(
+            f"class_{index:02d}",
+            [
+                {"x": index, "y": index},
+                {"x": index + 1, "y": index},
+                {"x": index + 1, "y": index + 1},
+                {"x": index, "y": index + 1},
+            ],
+        )
+        for index in range(num_classes)
+    ]
+    return [
+        dt.AnnotationFile(
+            Path(f"test{x}.json"),
+            f"test{x}.jpg",
+            annotation_classes={a.annotation_class for a in annotations},
+            annotations=annotations[x % 2 :: 2] if num_classes > 1 else annotations,
+            image_height=num_classes + 1,
+            image_width=num_classes + 1,
+        )
+        for x in range(count)
+    ]
+
+
+def test_grey_export_keeps_every_class_apart(tmp_path: Path) -> None:
+    annotation_files = _square_annotation_files(2, 20)
+
+    export(annotation_files, tmp_path, "grey")
+
+    palette = get_palette(
+        "grey", ["__background__"] + [f"class_{i:02d}" for i in range(20)]
+    )
+    for annotation_file in annotation_files:
+        mask = np.asarray(
+            Image.open(
+                tmp_path / "masks" / f"{Path(annotation_file.filename).stem}.png"
+            )
+        )
+        for annotation in annotation_file.annotations:
+            index = int(annotation.annotation_class.name[-2:])
+            assert mask[index, index] == palette[annotation.annotation_class.name]
+
+
+@pytest.mark.parametrize("mode", ["rgb", "grey", "index"])
+def test_export_with_workers_matches_serial_export(mode: str, tmp_path: Path) -> None:
+    annotation_files = _square_annotation_files(40, 5)
+    serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+
+    export(annotation_files, serial, mode)
+    export(iter(annotation_files), parallel, mode, workers=2)
+
+    assert (parallel / "class_mapping.csv").read_text() == (
+        serial / "class_mapping.csv"
+    ).read_text()
+    expected = sorted(p.name for p in (serial / "masks").iterdir())
+    assert sorted(p.name for p in (parallel / "masks").iterdir()) == expected
+    for name in expected:
+        assert_array_equal(
+            np.asarray(Image.open(parallel / "masks" / name)),
+            np.asarray(Image.open(serial / "masks" / name)),
+        )
+
+
+def test_export_with_workers_matches_serial_export_with_unlisted_classes(
+    tmp_path: Path,
+) -> None:
+    # Classes missing from ``annotation_classes`` are met first in different chunks of the pool.
+    # Only the rgb mode has a colour for classes missing from the palette
+    annotation_files = _square_annotation_files(8, 4)
+    for annotation_file in annotation_files:
+        annotation_file.annotation_classes = set()
+    serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+
+    export(annotation_files, serial, "rgb")
+    with patch("darwin.exporter.exporter._CHUNK_SIZE", 1):
+        export(iter(annotation_files), parallel, "rgb", workers=2)
+
+    assert (parallel / "class_mapping.csv").read_text() == (
+        serial / "class_mapping.csv"
+    ).read_text()
+    for path in (serial / "masks").iterdir():
+        assert_array_equal(
+            np.asarray(Image.open(parallel / "masks" / path.name)),
+            np.asarray(Image.open(path)),
+        )
+
+
+@pytest.mark.parametrize("level", ["fast", "10"])
+def test_export_rejects_an_invalid_png_compress_level(
+    level: str, tmp_path: Path
+) -> None:
+    with patch.dict("os.environ", {"DARWIN_MASK_PNG_COMPRESS_LEVEL": level}):
+        with pytest.raises(ValueError, match="DARWIN_MASK_PNG_COMPRESS_LEVEL"):
+            export(_square_annotation_files(1, 3), tmp_path, "index")
+
+    assert not (tmp_path / "masks").exists()
+
+
+def test_export_uses_the_png_compress_level(tmp_path: Path) -> None:
+    annotation_files = _square_annotation_files(1, 3)
+
+    with patch("darwin.exporter.formats.mask.Image.Image.save") as save:
+        with patch.dict("os.environ", {"DARWIN_MASK_PNG_COMPRESS_LEVEL": "1"}):
+            export(annotation_files, tmp_path / "env", "index")
+        export(annotation_files, tmp_path / "arg", "index", compress_level=9)
+        export(annotation_files, tmp_path / "default", "index")
+
+    assert [c.kwargs for c in save.call_args_list] == [
+        {"compress_level": 1},
+        {"compress_level": 9},
+        {},
+    ]
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -1,5 +1,6 @@
 import shutil
 from pathlib import Path
+from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
 
 import pytest
@@ -41,6 +42,25 @@ class TestExport:
         export([annotation_file], folder_path)
         assert folder_path.exists()
 
+    def test_it_writes_files_on_several_threads(self, folder_path: Path):
+        annotation_files = [
+            AnnotationFile(
+                path=Path(f"/annotation_{i}.json"),
+                filename=f"annotation_{i}.jpg",
+                annotation_classes=set(),
+                annotations=[],
+                image_height=1080,
+                image_width=1920,
+            )
+            for i in range(10)
+        ]
+
+        export(iter(annotation_files), folder_path, workers=3)
+
+        assert sorted(p.name for p in folder_path.iterdir()) == sorted(
+            f"annotation_{i}.xml" for i in range(10)
+        )
+
 
 class TestBuildXml:
     def test_xml_has_bounding_boxes_of_polygons(self):
@@ -179,3 +199,24 @@ def assert_xml_element_text(parent: Element, key: str, val: str) -> None:
     obj = parent.find(key)
     assert isinstance(obj, Element)
     assert obj.text == val
+
+    def test_same_named_items_are_written_in_order(self, folder_path: Path):
+        # Items of different folders with the same name share their output file
+        annotation_files = [
+            AnnotationFile(
+                path=Path(f"/folder_{i}/annotation.json"),
+                filename="annotation.jpg",
+                annotation_classes=set(),
+                annotations=[],
+                image_height=1080,
+                image_width=i,
+                remote_path=f"/folder_{i}",
+            )
+            for i in range(50)
+        ]
+
+        export(iter(annotation_files), folder_path, workers=3)
+
+        assert [p.name for p in folder_path.iterdir()] == ["annotation.xml"]
+        size = ElementTree.parse(folder_path / "annotation.xml").find("size")
+        assert size is not None and size.findtext("width") == "49"
@@ -1,9 +1,16 @@
 import shutil
 from pathlib import Path
+from zipfile import ZipFile
 
 import pytest
 
 from darwin.datatypes import Annotation, AnnotationClass, AnnotationFile
+from darwin.exporter.exporter import darwin_to_dt_gen, export_annotations
+from darwin.exporter.formats import yolo_segmented
+from darwin.exporter.formats.helpers.yolo_class_builder import (
+    build_class_index,
+    scan_class_index,
+)
 from darwin.exporter.formats.yolo import export
 
 
@@ -56,3 +63,39 @@ class TestExport:
 
         yolo_classes = (folder_path / "darknet.labels").read_text().split("\n")
         assert yolo_classes[0] == "car"
+
+
+class TestStreamingExport:
+    @pytest.fixture
+    def annotations_dir(self, tmp_path: Path) -> Path:
+        with ZipFile("tests/model_training_data.zip") as zfile:
+            zfile.extractall(tmp_path)
+        return (
+            tmp_path
+            / "model_training_data"
+            / "object-detection-test"
+            / "releases"
+            / "complete"
+            / "annotations"
+        )
+
+    def test_scanned_class_index_matches_the_parsed_one(self, annotations_dir: Path):
+        expected = build_class_index(darwin_to_dt_gen([annotations_dir], True))
+
+        assert len(expected) > 1
+        assert scan_class_index([annotations_dir]) == expected
+        assert scan_class_index([annotations_dir], workers=2) == expected
+
+    @pytest.mark.parametrize("exporter", [export, yolo_segmented.export])
+    def test_streamed_output_matches_the_buffered_one(
+        self, exporter, annotations_dir: Path, tmp_path: Path
+    ):
+        buffered, streamed = tmp_path / "buffered", tmp_path / "streamed"
+        buffered.mkdir()
+        exporter(darwin_to_dt_gen([annotations_dir], True), buffered)
+        export_annotations(exporter, [annotations_dir], streamed, workers=3)
+
+        expected = sorted(p.relative_to(buffered) for p in buffered.rglob("*"))
+        assert sorted(p.relative_to(streamed) for p in streamed.rglob("*")) == expected
+        for path in expected:
+            assert (streamed / path).read_bytes() == (buffered / path).read_bytes()
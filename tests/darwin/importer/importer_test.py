@@ -10,18 +10,25 @@ import pytest
 from darwin import datatypes as dt
 from darwin.importer import get_importer
 from darwin.importer.importer import (
+    _batch_import_requests,
+    _ImportMetrics,
     _build_attribute_lookup,
+    _build_import_payload,
     _build_main_annotations_lookup_table,
     _display_slot_warnings_and_errors,
     _find_and_parse,
+    _fetch_remote_files_by_name,
     _get_annotation_format,
+    _get_indexed_remote_files,
     _get_remote_files,
     _get_slot_names,
-    _import_annotations,
+    _import_annotations_in_batches,
     _is_skeleton_class,
     _overwrite_warning,
     _parse_empty_masks,
     _resolve_annotation_classes,
+    _run_bounded,
+    _send_import_request,
     _verify_slot_annotation_alignment,
 )
 
@@ -121,6 +128,96 @@ def test__get_remote_files() -> None:
         assert mock_get_slot_names.call_count == 2
 
 
+def _remote_item(full_path: str) -> Mock:
+    return Mock(
+        full_path=full_path,
+        id=f"{full_path}_id",
+        layout={"type": "simple", "version": 1, "slots": ["0"]},
+        slots=[{"slot_name": "0"}],
+    )
+
+
+def test__get_remote_files_fetches_chunks_concurrently() -> None:
+    mock_dataset = Mock()
+    mock_dataset.fetch_remote_files.side_effect = lambda filters: [
+        _remote_item(f"/{name}") for name in filters["item_names"]
+    ]
+    filenames = [f"file{i}" for i in range(10)] + ["file0"]
+
+    result = _get_remote_files(mock_dataset, filenames, chunk_size=3, max_workers=4)
+
+    assert mock_dataset.fetch_remote_files.call_count == 4
+    assert sorted(result) == sorted(f"/file{i}" for i in range(10))
+    assert result["/file7"]["item_id"] == "/file7_id"
+
+
+def test__fetch_remote_files_by_name_halves_chunks_too_large_for_the_url() -> None:
+    from darwin.exceptions import RequestEntitySizeExceeded
+
+    mock_dataset = Mock()
+
+    def fetch_remote_files(filters):
+        if len(filters["item_names"]) > 2:
+            raise RequestEntitySizeExceeded("url")
+        return [_remote_item(f"/{name}") for name in filters["item_names"]]
+
+    mock_dataset.fetch_remote_files.side_effect = fetch_remote_files
+
+    with patch.dict("os.environ", {"DARWIN_IMPORT_LOOKUP_CHUNK_SIZE": "8"}):
+        result = _fetch_remote_files_by_name(mock_dataset, ["a", "b", "c", "d", "e"])
+
+    assert sorted(result) == ["/a", "/b", "/c", "/d", "/e"]
+
+
+def test__get_indexed_remote_files_reuses_the_index(tmp_path: Path) -> None:
+    mock_dataset = Mock(local_path=tmp_path, dataset_id=1)
+    mock_dataset.fetch_remote_files.return_value = [_remote_item("/a.jpg")]
+    parsed_file = dt.AnnotationFile(
+        path=Path("a.json"),
+        filename="a.jpg",
+        annotation_classes=set(),
+        annotations=[],
+        remote_path="/",
+    )
+
+    first = _get_indexed_remote_files(mock_dataset, [parsed_file])
+    second = _get_indexed_remote_files(mock_dataset, [parsed_file])
+
+    assert first == second
+    assert second["/a.jpg"]["item_id"] == "/a.jpg_id"
+    assert second["/a.jpg"]["slot_names"] == ["0"]
+    mock_dataset.fetch_remote_files.assert_called_once_with(
+        {"types": "image,playback_video,video_frame"}
+    )
+
+
+def test__get_indexed_remote_files_fetches_items_missing_from_the_index(
+    tmp_path: Path,
+) -> None:
+    mock_dataset = Mock(local_path=tmp_path, dataset_id=1)
+    mock_dataset.fetch_remote_files.side_effect = [
+        [_remote_item("/a.jpg")],
+        [_remote_item("/b.jpg")],
+    ]
+    parsed_files = [
+        dt.AnnotationFile(
+            path=Path(f"{name}.json"),
+            filename=f"{name}.jpg",
+            annotation_classes=set(),
+            annotations=[],
+            remote_path="/",
+        )
+        for name in ["a", "b"]
+    ]
+
+    result = _get_indexed_remote_files(mock_dataset, parsed_files)
+
+    assert sorted(result) == ["/a.jpg", "/b.jpg"]
+    assert mock_dataset.fetch_remote_files.call_args_list[1][0][0]["item_names"] == [
+        "b.jpg"
+    ]
+
+
 def test__get_slot_names() -> None:
     mock_remote_file_with_slots_v1 = Mock()
     mock_remote_file_with_slots_v1.layout = {"version": 1}
@@ -171,7 +268,7 @@ def test__resolve_annotation_classes() -> None:
     assert not_in_team == expected_not_in_team
 
 
-def test_import_annotations() -> None:
+def test__send_import_request_sends_the_built_payload() -> None:
     mock_client = Mock()
     mock_dataset = Mock()
     mock_dataset.version = 2
@@ -191,7 +288,6 @@ def test_import_annotations() -> None:
     ]
     default_slot_name = "test_slot"
     append = False
-    delete_for_empty = False
     import_annotators = True
     import_reviewers = True
     metadata_path = False
@@ -215,22 +311,24 @@ def test_import_annotations() -> None:
         mock_ip.return_value = {}
         mock_gov.return_value = "test_append_out"
 
-        errors, success = _import_annotations(
+        payload = _build_import_payload(
             mock_client,
-            "test_id",
             remote_classes,
             attributes,
             annotations,
             default_slot_name,
             mock_dataset,
             append,
-            delete_for_empty,
             import_annotators,
             import_reviewers,
             metadata_path,
         )
+        parsed_file = Mock()
+        result, errors = _send_import_request(
+            mock_dataset, (parsed_file, "test_id", payload)
+        )
 
-        assert success == dt.Success.SUCCESS
+        assert result is parsed_file
         assert not errors
         assert mock_dataset.import_annotation.call_count == 1
 
@@ -697,7 +795,7 @@ def test__parse_empty_masks_video(raster_layer_video_annotations) -> None:
     }
 
 
-def test__import_annotations() -> None:
+def test__build_import_payload() -> None:
     with patch_factory("_format_polygon_for_import") as mock_hcp, patch_factory(
         "_handle_reviewers"
     ) as mock_hr, patch_factory("_handle_annotators") as mock_ha, patch_factory(
@@ -711,7 +809,6 @@ def test__import_annotations() -> None:
     ) as mock_ip:
         from darwin.client import Client
         from darwin.dataset import RemoteDataset
-        from darwin.importer.importer import _import_annotations
 
         mock_client = Mock(Client)
         mock_dataset = Mock(RemoteDataset)
@@ -740,20 +837,19 @@ def test__import_annotations() -> None:
             dt.AnnotationClass("test_class", "bbox"), {"paths": [1, 2, 3, 4, 5]}, [], []
         )
 
-        _import_annotations(
+        payload = _build_import_payload(
             mock_client,
-            "test_id",
             {"bbox": {"test_class": "1337"}},
             {},
             [annotation],
             "test_slot",
             mock_dataset,
             "test_append_in",  # type: ignore
-            False,
             "test_import_annotators",  # type: ignore
             "test_import_reviewers",  # type: ignore
             False,
         )
+        _send_import_request(mock_dataset, (Mock(), "test_id", payload))
 
         assert mock_dataset.import_annotation.call_count == 1
         # ! Removed, so this test is now co-dependent on function previously mocked. See IO-841 for future action.
@@ -807,6 +903,128 @@ def test__import_annotations() -> None:
         assert output["overwrite"] == assertion["overwrite"]
 
 
+def _import_request(name: str, payload_size: int = 1):
+    parsed_file = dt.AnnotationFile(
+        path=Path(f"/{name}.json"),
+        filename=name,
+        annotation_classes=set(),
+        annotations=[],
+    )
+    return parsed_file, f"id_{name}", {"annotations": ["x" * payload_size]}
+
+
+def test__send_import_request_returns_the_error_of_the_item() -> None:
+    dataset = Mock()
+    error = ValueError("Rejected")
+    dataset.import_annotation.side_effect = error
+    metrics = _ImportMetrics()
+
+    parsed_file, errors = _send_import_request(dataset, _import_request("0"), metrics)
+
+    assert parsed_file.filename == "0"
+    assert errors == [error]
+    dataset.import_annotation.assert_called_once_with(
+        "id_0", payload={"annotations": ["x"]}
+    )
+    assert metrics.counts == {"http": 1}
+
+
+def test__batch_import_requests_respects_item_budget() -> None:
+    requests = [_import_request(str(i)) for i in range(5)]
+
+    batches = list(_batch_import_requests(requests, 2, 1024))
+
+    assert [[r[1] for r in batch] for batch in batches] == [
+        ["id_0", "id_1"],
+        ["id_2", "id_3"],
+        ["id_4"],
+    ]
+
+
+def test__batch_import_requests_respects_byte_budget() -> None:
+    requests = [_import_request("small", 10), _import_request("big", 100)]
+    requests.append(_import_request("last", 10))
+
+    batches = list(_batch_import_requests(requests, 10, 50))
+
+    assert [[r[1] for r in batch] for batch in batches] == [
+        ["id_small"],
+        ["id_big"],
+        ["id_last"],
+    ]
+
+
+def test__import_annotations_in_batches_reports_failures_per_item() -> None:
+    dataset = Mock()
+    error = ValueError("Rejected")
+
+    def import_annotation(item_id, payload):
+        if item_id == "id_1":
+            raise error
+
+    dataset.import_annotation.side_effect = import_annotation
+    requests = [_import_request(str(i)) for i in range(4)]
+
+    results = list(_import_annotations_in_batches(dataset, iter(requests), 3, 2))
+
+    assert dataset.import_annotation.call_count == 4
+    errors = {parsed_file.filename: errors for parsed_file, errors in results}
+    assert errors == {"0": [], "1": [error], "2": [], "3": []}
+
+
+def test_import_annotations_rejects_empty_batches() -> None:
+    from darwin.importer.importer import import_annotations
+
+    with pytest.raises(ValueError):
+        import_annotations(MagicMock(), MagicMock(), [], False, batch_size=0)
+
+
+def test__run_bounded_limits_workers_and_pending_items() -> None:
+    import threading
+    import time
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+    consumed = 0
+
+    def items():
+        nonlocal consumed
+        for i in range(20):
+            consumed += 1
+            yield i
+
+    def work(item: int) -> int:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.005)
+        with lock:
+            running -= 1
+        return item * 2
+
+    generator = _run_bounded(work, items(), 3)
+    first = next(generator)
+    assert consumed <= 7
+    results = [first, *generator]
+
+    assert sorted(results) == [i * 2 for i in range(20)]
+    assert max_running <= 3
+
+
+def test__import_metrics_adds_up_stages() -> None:
+    metrics = _ImportMetrics()
+    metrics.add("parse", 1.5, 10)
+    with metrics.measure("http"):
+        pass
+    with metrics.measure("http"):
+        pass
+
+    assert metrics.counts == {"parse": 10, "http": 2}
+    assert metrics.summary().startswith("parse: 10 in 1.50s, http: 2 in ")
+
+
 def test_overwrite_warning_proceeds_with_import():
     annotations: List[dt.AnnotationLike] = [
         dt.Annotation(
@@ -4,6 +4,7 @@ from typing import Any
 from unittest.mock import patch
 
 import numpy as np
+import pytest
 import torch
 
 from darwin.config import Config
@@ -88,6 +89,135 @@ class TestObjectDetectionDataset:
             assert torch.all(bbox[1::2] < img.shape[-2])
 
 
+class TestMeasureWeights:
+    def test_weights_match_the_labels_of_every_target(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> None:
+        root = team_extracted_dataset_path / team_slug_darwin_json_v2 / "coco"
+        instance = InstanceSegmentationDataset(dataset_path=root, release_name="latest")
+        semantic = SemanticSegmentationDataset(dataset_path=root, release_name="latest")
+        detection = ObjectDetectionDataset(dataset_path=root, release_name="latest")
+
+        instance_labels = [
+            a["category_id"]
+            for i in range(len(instance))
+            for a in instance.get_target(i)["annotations"]
+        ]
+        semantic_labels = [0] + [
+            a["category_id"]
+            for i in range(len(semantic))
+            for a in semantic.get_target(i)["annotations"]
+        ]
+        detection_labels = [
+            label
+            for i in range(len(detection))
+            for label in detection.get_target(i)["labels"].tolist()
+        ]
+
+        assert np.allclose(
+            instance.measure_weights(), instance._compute_weights(instance_labels)
+        )
+        assert np.allclose(
+            semantic.measure_weights(), semantic._compute_weights(semantic_labels)
+        )
+        assert np.allclose(
+            detection.measure_weights(), detection._compute_weights(detection_labels)
+        )
+
+    def test_classification_weights_match_the_labels_of_every_target(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> None:
+        for name in ["sl", "ml"]:
+            root = team_extracted_dataset_path / team_slug_darwin_json_v2 / name
+            ds = ClassificationDataset(dataset_path=root, release_name="latest")
+
+            labels = []
+            for i in range(len(ds)):
+                target = ds.get_target(i)
+                if ds.is_multi_label:
+                    labels.extend(torch.where(target == 1)[0].tolist())
+                else:
+                    labels.append(target.item())
+
+            assert np.allclose(ds.measure_weights(), ds._compute_weights(labels))
+
+
+class TestCompiledTargets:
+    def test_classification_targets_match_parsed_targets(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> None:
+        for name in ["sl", "ml"]:
+            root = team_extracted_dataset_path / team_slug_darwin_json_v2 / name
+            parsed = ClassificationDataset(dataset_path=root, release_name="latest")
+            compiled = ClassificationDataset(
+                dataset_path=root, release_name="latest", compile_targets=True
+            )
+
+            assert compiled.is_multi_label == parsed.is_multi_label
+            for i in range(len(parsed)):
+                assert torch.equal(compiled.get_target(i), parsed.get_target(i))
+
+    def test_instance_segmentation_targets_match_parsed_targets(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> None:
+        root = team_extracted_dataset_path / team_slug_darwin_json_v2 / "coco"
+        parsed = InstanceSegmentationDataset(dataset_path=root, release_name="latest")
+        compiled = InstanceSegmentationDataset(
+            dataset_path=root, release_name="latest", compile_targets=True
+        )
+
+        for i in range(len(parsed)):
+            expected = parsed.get_target(i)
+            target = compiled.get_target(i)
+            assert target["height"] == expected["height"]
+            assert target["width"] == expected["width"]
+            assert len(target["annotations"]) == len(expected["annotations"])
+            for annotation, expected_annotation in zip(
+                target["annotations"], expected["annotations"]
+            ):
+                assert annotation["category_id"] == expected_annotation["category_id"]
+                assert np.allclose(annotation["bbox"], expected_annotation["bbox"])
+                assert np.isclose(annotation["area"], expected_annotation["area"])
+                assert annotation["segmentation"] == expected_annotation["segmentation"]
+
+    @pytest.mark.parametrize("dataset_name", ["coco", "bb"])
+    def test_object_detection_targets_match_parsed_targets(
+        self,
+        dataset_name: str,
+        team_slug_darwin_json_v2: str,
+        team_extracted_dataset_path: Path,
+    ) -> None:
+        root = team_extracted_dataset_path / team_slug_darwin_json_v2 / dataset_name
+        parsed = ObjectDetectionDataset(dataset_path=root, release_name="latest")
+        compiled = ObjectDetectionDataset(
+            dataset_path=root, release_name="latest", compile_targets=True
+        )
+
+        for i in range(len(parsed)):
+            expected = parsed.get_target(i)
+            target = compiled.get_target(i)
+            assert target["boxes"].dtype == torch.float32
+            for key in ["boxes", "area", "labels", "image_id", "iscrowd"]:
+                assert target[key].dtype == expected[key].dtype
+                assert torch.equal(target[key], expected[key])
+
+    def test_compiled_targets_are_reused(
+        self, team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path
+    ) -> None:
+        root = team_extracted_dataset_path / team_slug_darwin_json_v2 / "coco"
+        ObjectDetectionDataset(
+            dataset_path=root, release_name="latest", compile_targets=True
+        )
+
+        with patch.object(ObjectDetectionDataset, "_compile_targets") as mock_compile:
+            ds = ObjectDetectionDataset(
+                dataset_path=root, release_name="latest", compile_targets=True
+            )
+
+        mock_compile.assert_not_called()
+        assert ds.compiled_targets.path.parent.name == ".compiled_targets"
+
+
 class TestGetDataset:
     def test_exits_when_dataset_not_supported(
         self, team_slug_darwin_json_v2: str, local_config_file: Config
@@ -0,0 +1,71 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import patch
+
+import pytest
+from PIL import Image as PILImage
+
+from darwin.dataset.shards import pack_dataset
+from darwin.torch.shards import ShardDataset
+from tests.fixtures import *
+
+
+@pytest.fixture
+def shards(
+    team_slug_darwin_json_v2: str, team_extracted_dataset_path: Path, tmp_path: Path
+) -> List[Path]:
+    dataset = team_extracted_dataset_path / team_slug_darwin_json_v2 / "sl"
+    return pack_dataset(dataset, "latest", output_dir=tmp_path, shard_size=1)
+
+
+def _names(dataset: ShardDataset) -> List[str]:
+    return [annotation["item"]["name"] for _, annotation in dataset]
+
+
+class TestShardDataset:
+    def test_yields_every_sample_once(self, shards: List[Path]):
+        dataset = ShardDataset(shards[0].parent)
+        samples = list(dataset)
+
+        assert len(samples) == len(shards)
+        assert all(isinstance(image, PILImage.Image) for image, _ in samples)
+        assert all(image.mode == "RGB" for image, _ in samples)
+        assert len(set(_names(dataset))) == len(shards)
+
+    def test_shuffles_samples_with_every_epoch(self, shards: List[Path]):
+        dataset = ShardDataset(shards)
+        first = _names(dataset)
+        assert _names(dataset) == first
+
+        dataset.set_epoch(1)
+        second = _names(dataset)
+        assert second != first
+        assert sorted(second) == sorted(first)
+
+    def test_keeps_the_order_without_shuffle(self, shards: List[Path]):
+        unshuffled = ShardDataset(shards, shuffle=False)
+        unshuffled.set_epoch(1)
+
+        assert unshuffled.get_shards() == shards
+
+    def test_splits_shards_between_ranks_and_workers(self, shards: List[Path]):
+        names = []
+        for rank in range(2):
+            for worker_id in range(3):
+                worker_info = SimpleNamespace(id=worker_id, num_workers=3)
+                with patch(
+                    "darwin.torch.shards.get_worker_info", return_value=worker_info
+                ):
+                    names += _names(ShardDataset(shards, rank=rank, world_size=2))
+
+        assert sorted(names) == sorted(_names(ShardDataset(shards)))
+
+    def test_applies_the_transform(self, shards: List[Path]):
+        dataset = ShardDataset(shards, transform=lambda image, annotation: image.size)
+
+        assert all(isinstance(size, tuple) for size in dataset)
+
+    def test_raises_without_shards(self, tmp_path: Path):
+        with pytest.raises(ValueError):
+            ShardDataset(tmp_path)
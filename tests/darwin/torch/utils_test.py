@@ -4,7 +4,12 @@ import numpy as np
 import pytest
 import torch
 
-from darwin.torch.utils import clamp_bbox_to_image_size, flatten_masks_by_category
+from darwin.torch.utils import (
+    clamp_bbox_to_image_size,
+    convert_segmentation_to_label_image,
+    convert_segmentation_to_mask,
+    flatten_masks_by_category,
+)
 from tests.fixtures import *
 
 
@@ -76,6 +81,57 @@ class TestFlattenMasks:
         assert torch.equal(counts, expected_counts)
 
 
+class TestConvertSegmentation:
+    @pytest.fixture
+    def segmentations(self) -> List:
+        return [
+            [[0, 0, 6, 0, 6, 6, 0, 6]],
+            [[3, 3, 9, 3, 9, 9, 3, 9]],
+            [[1, 7, 4, 7, 4, 9, 1, 9], [5, 0, 9, 0, 9, 2, 5, 2]],
+        ]
+
+    def test_masks_are_drawn_into_a_single_array(self, segmentations: List):
+        masks = convert_segmentation_to_mask(segmentations, 10, 12)
+
+        assert masks.shape == (3, 10, 12)
+        assert masks.dtype == torch.uint8
+        assert masks[0, 0, 0] == 1 and masks[0, 8, 8] == 0
+        assert masks[2, 8, 2] == 1 and masks[2, 1, 7] == 1
+
+    def test_no_segmentation_gives_no_mask(self):
+        assert convert_segmentation_to_mask([], 4, 5).shape == (0, 4, 5)
+
+    def test_label_image_matches_flattened_masks(self, segmentations: List):
+        cats = [1, 2, 1]
+        masks = convert_segmentation_to_mask(segmentations, 10, 12)
+
+        label_image = convert_segmentation_to_label_image(segmentations, cats, 10, 12)
+
+        assert torch.equal(label_image, flatten_masks_by_category(masks, cats))
+
+    def test_label_image_keeps_values_above_255(self, segmentations: List):
+        label_image = convert_segmentation_to_label_image(
+            segmentations, [1, 300, 2], 10, 12
+        )
+
+        assert label_image.dtype == torch.int32
+        assert label_image[5, 5] == 300
+
+    def test_label_image_without_segmentation_is_background(self):
+        label_image = convert_segmentation_to_label_image([], [], 4, 5)
+
+        assert torch.equal(label_image, torch.zeros((4, 5), dtype=torch.uint8))
+
+    def test_flatten_handles_more_than_255_masks(self):
+        masks = torch.ones((300, 2, 2), dtype=torch.uint8)
+        cats = [1] * 299 + [7]
+
+        assert torch.equal(
+            flatten_masks_by_category(masks, cats),
+            torch.full((2, 2), 7, dtype=torch.uint8),
+        )
+
+
 class TestClampBboxToImageSize:
     def test_clamp_bbox_xyxy(self):
         annotations = {
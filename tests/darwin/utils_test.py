@@ -6,6 +6,7 @@ from requests import Response
 import darwin.datatypes as dt
 import darwin.exceptions as de
 from darwin.utils import (
+    get_darwin_annotation_type,
     get_response_content,
     has_json_content_type,
     is_file_extension_allowed,
@@ -1150,6 +1151,23 @@ class TestParseDarwinJson:
         assert "hello" == get_response_content(response)
 
 
+class TestGetDarwinAnnotationType:
+    @pytest.mark.parametrize(
+        "annotation, expected",
+        [
+            ({"polygon": {"paths": []}, "bounding_box": {}}, "polygon"),
+            ({"polygon": {"path": []}}, "polygon"),
+            ({"polygon": {}, "bounding_box": {}}, "bounding_box"),
+            ({"polygon": {}}, None),
+            ({"tag": {}}, "tag"),
+            ({"raster_layer": {}}, "raster_layer"),
+            ({"name": "unsupported"}, None),
+        ],
+    )
+    def test_matches_the_type_parsed(self, annotation: dict, expected):
+        assert get_darwin_annotation_type(annotation) == expected
+
+
 class TestParseDarwinRasterAnnotation:
     @pytest.fixture
     def good_raster_annotation(self) -> dt.JSONFreeForm: